@@ -1,14 +1,15 @@
 """Keyword management endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List
 
 from ...schemas.keyword import (
     KeywordCandidateResponse,
+    KeywordCandidateListAdapter,
     ApprovalResponse
 )
-from ...models.keyword import KeywordCandidate, ApprovalRequest, KeywordStatus
+from ...models.keyword import KeywordCandidate, ApprovalRequest, KeywordStatus, KEYWORD_STATUS_VALUES
 from ...services.keyword_service import KeywordService
 from ...services.google_ads_service import GoogleAdsService
 from ...services.slack_service import SlackService
@@ -56,20 +57,18 @@ async def list_keywords(
         db: Database session
 
     Returns:
-        List of KeywordCandidateResponse
+        JSON list of KeywordCandidateResponse
     """
     query = db.query(KeywordCandidate).filter(KeywordCandidate.tenant_id == tenant_id)
 
     # Apply status filter if provided
     if status_filter:
-        try:
-            status_enum = KeywordStatus(status_filter)
-            query = query.filter(KeywordCandidate.status == status_enum)
-        except ValueError:
+        if status_filter not in KEYWORD_STATUS_VALUES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status: {status_filter}. Must be one of: pending, approved, rejected, expired"
             )
+        query = query.filter(KeywordCandidate.status == KeywordStatus(status_filter))
 
     keywords = (
         query
@@ -79,19 +78,13 @@ async def list_keywords(
         .all()
     )
 
-    return [
-        KeywordCandidateResponse(
-            id=kw.id,
-            search_term=kw.search_term,
-            campaign_name=kw.campaign_name,
-            cost=kw.cost,
-            clicks=kw.clicks,
-            conversions=kw.conversions,
-            status=kw.status,
-            detected_at=kw.detected_at
-        )
-        for kw in keywords
-    ]
+    # Validate and serialize the whole list in one pass; returning a Response
+    # skips FastAPI's per-item re-validation against response_model.
+    candidates = KeywordCandidateListAdapter.validate_python(keywords)
+    return Response(
+        content=KeywordCandidateListAdapter.dump_json(candidates),
+        media_type="application/json"
+    )
 
 
 @router.get("/keywords/{keyword_id}", response_model=KeywordCandidateResponse)
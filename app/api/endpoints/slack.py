@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Request, HTTPException, Depends
 from sqlalchemy.orm import Session
+import asyncio
 import json
 import logging
 from typing import TYPE_CHECKING
 
+from ...core.executor import run_io
 from ...core.security import verify_slack_signature, decrypt_token
 from ...api.deps import get_db
 from ...config import settings
@@ -79,7 +81,7 @@ async def handle_message_event(event: dict, db: Session):
 
         # Ignore message_changed and message_deleted events
         if event.get("subtype") in ["message_changed", "message_deleted"]:
-            logger.debug(f"Ignoring message subtype: {event.get('subtype')}")
+            logger.debug("Ignoring message subtype: %s", event.get('subtype'))
             return
 
         # Extract event data
@@ -93,13 +95,13 @@ async def handle_message_event(event: dict, db: Session):
             logger.warning("Missing required fields in message event")
             return
 
-        logger.info(f"Processing message from user {user_id} in channel {channel_id}")
+        logger.info("Processing message from user %s in channel %s", user_id, channel_id)
 
         # Get or create tenant from team_id
         from ...models.tenant import Tenant
         tenant = db.query(Tenant).filter_by(workspace_id=team_id).first()
         if not tenant:
-            logger.info(f"Creating new tenant for workspace {team_id}")
+            logger.info("Creating new tenant for workspace %s", team_id)
             tenant = Tenant(
                 workspace_id=team_id,
                 workspace_name=team_id,
@@ -127,13 +129,38 @@ async def handle_message_event(event: dict, db: Session):
         report_service = ReportService(db, google_ads_service, gemini_service, slack_service)
         keyword_service = KeywordService(db, google_ads_service, slack_service)
 
+        # Reply posted on the first streamed chunk, then edited in place
+        reply_ts = None
+
+        async def stream_partial(partial_text: str):
+            nonlocal reply_ts
+            try:
+                if reply_ts is None:
+                    posted = await run_io(
+                        slack_service.client.chat_postMessage,
+                        channel=channel_id,
+                        text=partial_text,
+                        thread_ts=thread_ts
+                    )
+                    reply_ts = posted["ts"]
+                else:
+                    await run_io(
+                        slack_service.client.chat_update,
+                        channel=channel_id,
+                        ts=reply_ts,
+                        text=partial_text
+                    )
+            except Exception as e:
+                logger.warning("Failed to stream partial response: %s", e)
+
         # Initialize action router with all required services
         action_router = ActionRouter(
             db=db,
             report_service=report_service,
             keyword_service=keyword_service,
             google_ads_service=google_ads_service,
-            gemini_service=gemini_service
+            gemini_service=gemini_service,
+            on_partial=stream_partial
         )
 
         # Get or create conversation
@@ -145,14 +172,14 @@ async def handle_message_event(event: dict, db: Session):
         )
 
         # Get conversation history for context (last 5 messages)
-        history = conversation_service.get_conversation_history(
+        history = await conversation_service.get_cached_history(
             conversation_id=conversation.id,
             limit=5
         )
 
         # Parse intent from message
         intent_result = intent_service.parse_intent(text, history)
-        logger.info(f"Parsed intent: {intent_result['intent']}")
+        logger.info("Parsed intent: %s", intent_result['intent'])
 
         # Add original message text to entities for general chat handler
         intent_result['entities']['original_message'] = text
@@ -174,18 +201,26 @@ async def handle_message_event(event: dict, db: Session):
             entities=intent_result['entities'],
             bot_response=response_text
         )
+        await conversation_service.append_to_cached_history(conversation.id, text, response_text)
 
-        # Send response to Slack in thread
-        slack_service.client.chat_postMessage(
-            channel=channel_id,
-            text=response_text,
-            thread_ts=thread_ts
-        )
+        # Send response to Slack in thread (replace the streamed draft if there is one)
+        if reply_ts:
+            slack_service.client.chat_update(
+                channel=channel_id,
+                ts=reply_ts,
+                text=response_text
+            )
+        else:
+            slack_service.client.chat_postMessage(
+                channel=channel_id,
+                text=response_text,
+                thread_ts=thread_ts
+            )
 
         logger.info("Successfully processed message and sent response")
 
     except Exception as e:
-        logger.error(f"Error handling message event: {str(e)}", exc_info=True)
+        logger.error("Error handling message event: %s", e, exc_info=True)
         # Try to send user-friendly error message
         try:
             error_slack_service = SlackService(bot_token=tenant.bot_token or settings.slack_bot_token)
@@ -850,7 +885,7 @@ async def _generate_report_async(
 
         for i, campaign_id in enumerate(campaigns_to_process):
             override = [campaign_id] if campaign_id else None
-            result = await asyncio.to_thread(
+            result = await run_io(
                 report_service.generate_weekly_report,
                 tenant_id,
                 notify_channel=notify_channel,
@@ -867,7 +902,7 @@ async def _generate_report_async(
 
         # GSC 리포트 생성 (Search Console 연동된 경우 자동으로 추가)
         logger.info(f"[Report] Step 3: Generating GSC report for tenant {tenant_id}, site={gsc_site_url}")
-        gsc_result = await asyncio.to_thread(
+        gsc_result = await run_io(
             report_service.generate_gsc_report,
             tenant_id,
             notify_channel=notify_channel,
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=20)
     database_max_overflow: int = Field(default=10)
 
+    # Worker threads for blocking SDK/database calls made from async handlers
+    io_max_workers: int = Field(default=16)
+
     # Redis
     redis_url: str = Field(...)
 
@@ -67,6 +70,7 @@ class Settings(BaseSettings):
     # Monitoring
     sentry_dsn: Optional[str] = Field(default=None)
     log_level: str = Field(default="INFO")
+    log_format: str = Field(default="text")  # text | json
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -84,6 +88,14 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid log level: {v}")
         return v_upper
 
+    @field_validator("log_format")
+    @classmethod
+    def validate_log_format(cls, v: str) -> str:
+        v_lower = v.lower()
+        if v_lower not in {"text", "json"}:
+            raise ValueError(f"Invalid log format: {v}")
+        return v_lower
+
     def __init__(self, **data):
         super().__init__(**data)
         # Set Celery URLs to Redis URL if not explicitly provided
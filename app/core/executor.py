@@ -0,0 +1,28 @@
+"""Shared thread pool for blocking SDK and database calls made from async code."""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# One bounded pool of warm threads for Ads/GSC/Gemini/Slack SDK calls and
+# sync database work, instead of the loop's default executor. Idle workers
+# are joined by concurrent.futures at interpreter exit.
+io_executor = ThreadPoolExecutor(max_workers=settings.io_max_workers, thread_name_prefix="sem-io")
+
+
+async def run_io(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on io_executor and await its result.
+
+    Drop-in for asyncio.to_thread: context variables are propagated to the
+    worker thread the same way.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(io_executor, call)
@@ -0,0 +1,26 @@
+"""Structured JSON log formatting."""
+
+import logging
+
+import orjson
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    Structured context passed as ``extra={"extra_fields": {...}}`` is merged
+    into the top level of the object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update(getattr(record, "extra_fields", None) or {})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
@@ -0,0 +1,78 @@
+"""Monthly RANGE partition management for append-only history tables (PostgreSQL)."""
+
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Tables partitioned by RANGE (created_at), one partition per calendar month
+PARTITIONED_TABLES = ("report_history", "conversation_messages")
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Return the first day of the month `months` after value's month."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: date) -> str:
+    """Partition naming scheme, e.g. report_history_y2024m11."""
+    return f"{table}_y{start.year:04d}m{start.month:02d}"
+
+
+def create_month_partition(conn: Connection, table: str, start: date) -> str:
+    """
+    Create the partition of table covering the month starting at start.
+
+    Args:
+        conn: Connection to a PostgreSQL database
+        table: Partitioned parent table name
+        start: First day of the month
+
+    Returns:
+        Partition table name
+    """
+    start = month_start(start)
+    name = partition_name(table, start)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+    ))
+    return name
+
+
+def ensure_month_partitions(conn: Connection, today: date, months_ahead: int = 1) -> List[str]:
+    """
+    Make sure partitions exist for the current month and the next months_ahead months.
+
+    Tables that are not partitioned (e.g. non-PostgreSQL databases) are skipped.
+
+    Args:
+        conn: Database connection
+        today: Reference date
+        months_ahead: Number of future months to pre-create
+
+    Returns:
+        Names of partitions ensured
+    """
+    if conn.dialect.name != "postgresql":
+        return []
+
+    partitioned = set(conn.execute(text(
+        "SELECT c.relname FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid"
+    )).scalars())
+
+    ensured = []
+    for table in PARTITIONED_TABLES:
+        if table not in partitioned:
+            continue
+        for offset in range(months_ahead + 1):
+            ensured.append(create_month_partition(conn, table, add_months(today, offset)))
+    return ensured
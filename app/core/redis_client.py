@@ -1,7 +1,7 @@
 """Redis client for state management."""
 
 import redis
-from typing import Optional
+from typing import List, Optional, Sequence, Union
 from ..config import settings
 
 
@@ -15,7 +15,7 @@ class RedisClient:
             encoding="utf-8"
         )
 
-    async def setex(self, key: str, seconds: int, value: str) -> bool:
+    async def setex(self, key: str, seconds: int, value: Union[str, bytes]) -> bool:
         """Set key with expiration time."""
         return self._client.setex(key, seconds, value)
 
@@ -27,6 +27,30 @@ class RedisClient:
         """Delete key."""
         return self._client.delete(key)
 
+    async def lrange(self, key: str, start: int, end: int) -> List[str]:
+        """Get a range of list elements."""
+        return self._client.lrange(key, start, end)
+
+    async def replace_list(self, key: str, seconds: int, values: Sequence[Union[str, bytes]]) -> None:
+        """Atomically replace a list with values and set its expiration time."""
+        with self._client.pipeline() as pipe:
+            pipe.delete(key)
+            if values:
+                pipe.rpush(key, *values)
+                pipe.expire(key, seconds)
+            pipe.execute()
+
+    async def append_capped(self, key: str, seconds: int, value: Union[str, bytes], max_len: int) -> None:
+        """Atomically append to an existing list, keep its last max_len elements and refresh expiration.
+
+        A missing key is left missing, so a partial list is never created.
+        """
+        with self._client.pipeline() as pipe:
+            pipe.rpushx(key, value)
+            pipe.ltrim(key, -max_len, -1)
+            pipe.expire(key, seconds)
+            pipe.execute()
+
     def close(self):
         """Close Redis connection."""
         self._client.close()
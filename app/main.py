@@ -11,12 +11,18 @@ from .models import Base
 from .core.database import engine
 from .core.middleware import RateLimitMiddleware, TenantContextMiddleware, RequestLoggingMiddleware
 from .core.exceptions import register_exception_handlers
+from .core.log_formatter import OrjsonFormatter
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+if settings.log_format == "json":
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(OrjsonFormatter())
+    logging.basicConfig(level=getattr(logging, settings.log_level), handlers=[_log_handler])
+else:
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -5,7 +5,13 @@ from .tenant import Tenant, User
 from .oauth import OAuthToken, OAuthProvider
 from .google_ads import GoogleAdsAccount, PerformanceThreshold, SearchConsoleAccount
 from .report import ReportSchedule, ReportHistory, ReportFrequency
-from .keyword import KeywordCandidate, ApprovalRequest, KeywordStatus, ApprovalAction
+from .keyword import (
+    KeywordCandidate,
+    ApprovalRequest,
+    KeywordStatus,
+    ApprovalAction,
+    KEYWORD_STATUS_VALUES,
+)
 from .conversation import Conversation, ConversationMessage
 
 __all__ = [
@@ -24,6 +30,7 @@ __all__ = [
     "ApprovalRequest",
     "KeywordStatus",
     "ApprovalAction",
+    "KEYWORD_STATUS_VALUES",
     "Conversation",
     "ConversationMessage",
 ]
@@ -30,7 +30,12 @@ class Conversation(Base):
 
 
 class ConversationMessage(Base):
-    """Individual message within a conversation."""
+    """
+    Individual message within a conversation.
+
+    On PostgreSQL the table is RANGE-partitioned by month on created_at
+    (primary key (id, created_at)); see app.core.partitions.
+    """
 
     __tablename__ = "conversation_messages"
 
@@ -1,6 +1,6 @@
 """Google Ads account models."""
 
-from sqlalchemy import String, Integer, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import Optional
@@ -29,6 +29,15 @@ class GoogleAdsAccount(Base):
         return f"<GoogleAdsAccount(id={self.id}, customer_id={self.customer_id})>"
 
 
+# Backs the per-tenant "active account" lookup; inactive rows stay out of it
+Index(
+    "ix_gads_tenant_active",
+    GoogleAdsAccount.tenant_id,
+    postgresql_where=GoogleAdsAccount.is_active,
+    sqlite_where=GoogleAdsAccount.is_active,
+)
+
+
 class PerformanceThreshold(Base):
     """Performance thresholds for keyword detection."""
 
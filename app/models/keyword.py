@@ -1,8 +1,9 @@
 """Keyword candidate and approval models."""
 
-from sqlalchemy import String, Integer, DateTime, Float, Enum as SQLEnum, ForeignKey
+from sqlalchemy import String, Integer, SmallInteger, Numeric, DateTime, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 import enum
 
@@ -24,6 +25,14 @@ class ApprovalAction(str, enum.Enum):
     EXPIRED = "expired"
 
 
+# Valid raw values, for O(1) validation of user-provided strings
+KEYWORD_STATUS_VALUES = frozenset(m.value for m in KeywordStatus)
+
+# Upper bound of the SmallInteger clicks/conversions columns; larger counts
+# are stored capped rather than failing the insert
+SMALLINT_MAX = 32_767
+
+
 class KeywordCandidate(Base):
     """Search terms detected as inefficient."""
 
@@ -34,9 +43,9 @@ class KeywordCandidate(Base):
     campaign_id: Mapped[str] = mapped_column(String(50))
     campaign_name: Mapped[str] = mapped_column(String(255))
     search_term: Mapped[str] = mapped_column(String(255))
-    cost: Mapped[float] = mapped_column(Float)
-    clicks: Mapped[int] = mapped_column(Integer)
-    conversions: Mapped[int] = mapped_column(Integer, default=0)
+    cost: Mapped[Decimal] = mapped_column(Numeric(12, 2))
+    clicks: Mapped[int] = mapped_column(SmallInteger)
+    conversions: Mapped[int] = mapped_column(SmallInteger, default=0)
     detected_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     status: Mapped[str] = mapped_column(SQLEnum(KeywordStatus), default=KeywordStatus.PENDING)
 
@@ -59,10 +68,20 @@ class ApprovalRequest(Base):
     responded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     approved_by: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # slack_user_id
     action: Mapped[Optional[str]] = mapped_column(SQLEnum(ApprovalAction), nullable=True)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
 
     # Relationships
     keyword_candidate = relationship("KeywordCandidate", back_populates="approval_request")
 
     def __repr__(self) -> str:
         return f"<ApprovalRequest(id={self.id}, action={self.action})>"
+
+
+# Partial index for the expiry sweeper (action IS NULL AND expires_at < now);
+# answered approvals never enter it.
+Index(
+    "idx_approval_requests_pending_expiry",
+    ApprovalRequest.expires_at,
+    postgresql_where=ApprovalRequest.action.is_(None),
+    sqlite_where=ApprovalRequest.action.is_(None),
+)
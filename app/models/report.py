@@ -1,7 +1,8 @@
 """Report scheduling and history models."""
 
 from sqlalchemy import String, Integer, DateTime, Boolean, JSON, Enum as SQLEnum, Time, ForeignKey, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, mapped_column, Session
 from datetime import datetime, time
 from typing import Optional
 import enum
@@ -35,12 +36,60 @@ class ReportSchedule(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @classmethod
+    def upsert(
+        cls,
+        db: Session,
+        tenant_id: int,
+        frequency: ReportFrequency,
+        day_of_week: Optional[int],
+        time_of_day: time
+    ) -> None:
+        """
+        Create or update a tenant's schedule in one INSERT ... ON CONFLICT statement.
+
+        Commits the session.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID (unique per schedule)
+            frequency: Report frequency
+            day_of_week: 0=Monday, 6=Sunday
+            time_of_day: Local send time
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        now = datetime.utcnow()
+        stmt = dialect.insert(cls).values(
+            tenant_id=tenant_id,
+            frequency=frequency,
+            day_of_week=day_of_week,
+            time_of_day=time_of_day,
+            created_at=now,
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.tenant_id],
+            set_={
+                "frequency": stmt.excluded.frequency,
+                "day_of_week": stmt.excluded.day_of_week,
+                "time_of_day": stmt.excluded.time_of_day,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+
     def __repr__(self) -> str:
         return f"<ReportSchedule(tenant_id={self.tenant_id}, frequency={self.frequency})>"
 
 
 class ReportHistory(Base):
-    """History of generated reports."""
+    """
+    History of generated reports.
+
+    On PostgreSQL the table is RANGE-partitioned by month on created_at
+    (primary key (id, created_at)); see app.core.partitions.
+    """
 
     __tablename__ = "report_history"
 
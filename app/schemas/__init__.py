@@ -1,6 +1,6 @@
 from .slack import SlackEvent, SlackCommand, SlackInteraction
 from .report import ReportRequest, ReportResponse
-from .keyword import KeywordCandidateResponse, ApprovalRequest, ApprovalResponse
+from .keyword import KeywordCandidateResponse, KeywordCandidateListAdapter, ApprovalRequest, ApprovalResponse
 
 __all__ = [
     "SlackEvent",
@@ -9,6 +9,7 @@ __all__ = [
     "ReportRequest",
     "ReportResponse",
     "KeywordCandidateResponse",
+    "KeywordCandidateListAdapter",
     "ApprovalRequest",
     "ApprovalResponse",
 ]
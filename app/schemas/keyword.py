@@ -1,19 +1,30 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, PlainSerializer, TypeAdapter
+from typing import Annotated, List, Optional
 from datetime import datetime
+from decimal import Decimal
+
+
+# Money stays exact in Python but is emitted as a JSON number, not a string
+Money = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
 
 
 class KeywordCandidateResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     search_term: str
     campaign_name: str
-    cost: float
+    cost: Money
     clicks: int
     conversions: int
     status: str
     detected_at: datetime
 
 
+# Validates/serializes a whole list of ORM rows in one pass
+KeywordCandidateListAdapter = TypeAdapter(List[KeywordCandidateResponse])
+
+
 class ApprovalRequest(BaseModel):
     keyword_candidate_id: int
 
@@ -4,20 +4,223 @@ Action Router Service
 Routes parsed intents to appropriate service actions and formats responses.
 """
 
+import asyncio
+import itertools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import re
+import string
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+
+import orjson
+from cachetools import TLRUCache, TTLCache
+from typing import Awaitable, Callable, Dict, List, Any, Optional
 from sqlalchemy.orm import Session
 
+from app.core.exceptions import GeminiError
+from app.core.executor import run_io
 from app.services.report_service import ReportService
 from app.services.keyword_service import KeywordService
 from app.services.google_ads_service import GoogleAdsService
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import (
+    GeminiService, RateLimiter, FALLBACK_MESSAGES, FACTUAL_TEMPERATURE, GENERATION_ERROR_MESSAGE,
+    RATE_LIMITED_MESSAGE
+)
+from app.services import tenant_cache
+from app.services.semantic_cache import response_cache, select_context_turns
+from app.services.intent_service import (
+    GENERATE_REPORT,
+    CHANGE_SCHEDULE,
+    ANSWER_QUESTION,
+    KEYWORD_SUGGESTION,
+    QUERY_GSC_DATA,
+    GENERAL_CHAT,
+)
 from app.models.report import ReportSchedule, ReportFrequency
-from app.models.google_ads import GoogleAdsAccount, SearchConsoleAccount
 
 logger = logging.getLogger(__name__)
 
+# Intents whose handlers also take the conversation history
+HISTORY_AWARE_INTENTS = frozenset({ANSWER_QUESTION, GENERAL_CHAT})
+
+# Intents that call Gemini and/or Google APIs, limited per tenant
+RATE_LIMITED_INTENTS = frozenset({
+    GENERATE_REPORT, ANSWER_QUESTION, KEYWORD_SUGGESTION, QUERY_GSC_DATA, GENERAL_CHAT
+})
+TENANT_REQUESTS_PER_MINUTE = 10
+
+# tenant_id -> RateLimiter (idle tenants age out)
+_tenant_limiters: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+
+def _limiter_for(tenant_id: int) -> RateLimiter:
+    limiter = _tenant_limiters.get(tenant_id)
+    if limiter is None:
+        limiter = _tenant_limiters[tenant_id] = RateLimiter(max_requests=TENANT_REQUESTS_PER_MINUTE)
+    return limiter
+
+
+_REPORT_TEMPLATE = (
+    "*Weekly Report Summary* ({period})\n\n"
+    "*Total Spend:* ${cost:,.2f}\n"
+    "*Impressions:* {impressions:,}\n"
+    "*Clicks:* {clicks:,}\n"
+    "*Conversions:* {conversions}\n"
+    "*ROAS:* {roas:.2f}\n\n"
+    "_Report has been sent to your Slack channel!_"
+)
+_REPORT_DEFAULTS = MappingProxyType({"cost": 0, "impressions": 0, "clicks": 0, "conversions": 0, "roas": 0})
+
+_KEYWORD_IDEAS_HEADER = "🔑 *키워드 아이디어* (시드: {seeds})\n"
+_KEYWORD_IDEAS_FOOTER = "\n_캠페인에 추가하고 싶은 키워드가 있으면 알려주세요!_"
+_KW_STOPWORDS = frozenset({'키워드', '추천', '알려줘', '보여줘', '뭐야', '관련', '해줘'})
+_COMPETITION_LABELS = MappingProxyType({"HIGH": "높음", "MEDIUM": "보통", "LOW": "낮음", "UNKNOWN": "-"})
+
+# Bound format methods: the templates are parsed once, not per row
+_LINE_FMT = "{rank}. `{keyword}` — 월 검색 {searches} · 경쟁도 {competition} · 입찰가 {bid}".format
+_BID_FMT = "₩{:,}~{:,}".format
+
+
+def _format_keyword_idea(rank: int, idea: Dict[str, Any]) -> str:
+    """Render one Keyword Planner idea as a numbered Slack line."""
+    competition = idea['competition']
+    high_bid = idea['high_bid_krw']
+    return _LINE_FMT(
+        rank=rank,
+        keyword=idea['keyword'],
+        searches=idea['avg_monthly_searches'],
+        competition=_COMPETITION_LABELS.get(competition, competition),
+        bid=_BID_FMT(idea['low_bid_krw'], high_bid) if high_bid > 0 else "N/A"
+    )
+
+
+_ANSWER_PROMPT = string.Template(
+    "Based on this Google Ads data, answer the user's question naturally:\n\n"
+    "Data: $data\n"
+    "Date Range: $start to $end\n"
+    "Conversation History: $history\n\n"
+    "Format the response in a friendly, conversational way with key metrics highlighted."
+)
+
+_KEYWORD_FALLBACK_PROMPT = string.Template(
+    "한국 Google Ads 전문가로서 다음 시드 키워드 기반으로 10개 키워드를 추천해줘: $seeds\n"
+    "각 키워드별로 예상 검색량(높음/중간/낮음), 경쟁도, 추천 입찰가를 포함해서 한국어로 답변해줘."
+)
+
+_GSC_SUMMARY_PROMPT = string.Template(
+    "다음 Google Search Console 데이터를 보고 자연스럽게 한국어로 요약해줘:\n\n"
+    "$data_summary\n\n"
+    "사용자 질문 맥락: $question\n\n"
+    "2~3문장으로 핵심만 간결하게 답변해줘."
+)
+
+# Top queries/pages included in the GSC overview summary
+GSC_OVERVIEW_TOP_N = 3
+
+# History passed to data-question prompts: last N turns, each truncated
+HISTORY_SUMMARY_TURNS = 3
+HISTORY_SUMMARY_CHARS = 200
+
+# general_chat: turns considered for context and per-turn prompt budget
+CHAT_HISTORY_TURNS = 5
+CHAT_HISTORY_CHARS = 280
+_CHAT_PREAMBLE = "You are a helpful Google Ads assistant. Be friendly and conversational.\n\n"
+
+_CODE_BLOCK_RE = re.compile(r"```.*?```", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _trim_message(content: str, max_chars: int) -> str:
+    """Shrink a history turn for a prompt: drop code blocks, collapse whitespace, cap length."""
+    text = _WHITESPACE_RE.sub(" ", _CODE_BLOCK_RE.sub(" [code] ", content)).strip()
+    if len(text) > max_chars:
+        text = text[:max_chars - 1] + "…"
+    return text
+
+
+_HELP_TEXT = (
+    "I'm not sure how to help with that. Try asking me to:\n"
+    "• Generate a report\n"
+    "• Change your report schedule\n"
+    "• Answer questions about your campaigns\n"
+    "• Suggest keywords"
+)
+
+# Minimum seconds between partial-response callbacks while streaming
+STREAM_UPDATE_INTERVAL = 0.5
+
+# Day name -> day_of_week (0=Monday, 6=Sunday)
+_DAY_MAP = MappingProxyType({
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+})
+
+# "H:MM" / "HH:MM" schedule times
+_TIME_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
+
+# Raw frequency string -> ReportFrequency
+_FREQUENCY_MAP = MappingProxyType({f.value: f for f in ReportFrequency})
+
+ONE_DAY = timedelta(days=1)
+ONE_WEEK = timedelta(days=7)
+THIRTY_DAYS = timedelta(days=30)
+
+# time_period -> (today at midnight) -> (start_date, end_date)
+_PERIOD_HANDLERS = MappingProxyType({
+    'yesterday': lambda d: (d - ONE_DAY, d - ONE_DAY),
+    'last_day': lambda d: (d - ONE_DAY, d - ONE_DAY),
+    'last_week': lambda d: (d - ONE_WEEK, d - ONE_DAY),
+    'past_week': lambda d: (d - ONE_WEEK, d - ONE_DAY),
+    # Week starts on Monday
+    'this_week': lambda d: (d - timedelta(days=d.weekday()), d),
+    'current_week': lambda d: (d - timedelta(days=d.weekday()), d),
+    'last_month': lambda d: (d - THIRTY_DAYS, d - ONE_DAY),
+    'past_month': lambda d: (d - THIRTY_DAYS, d - ONE_DAY),
+    'this_month': lambda d: (d.replace(day=1), d),
+    'current_month': lambda d: (d.replace(day=1), d),
+    'last_7_days': lambda d: (d - ONE_WEEK, d),
+    'past_7_days': lambda d: (d - ONE_WEEK, d),
+    'last_30_days': lambda d: (d - THIRTY_DAYS, d),
+    'past_30_days': lambda d: (d - THIRTY_DAYS, d),
+})
+
+
+def _metrics_ttu(key, value, now):
+    """Ranges that include today are still changing; past ranges are final."""
+    date_to = key[2]
+    return now + (60 if date_to >= datetime.combine(date.today(), time.min) else 3600)
+
+
+# (customer_id, date_from, date_to, metrics) -> get_campaign_metrics result
+_campaign_metrics_cache = TLRUCache(maxsize=2048, ttu=_metrics_ttu)
+
+# Same key -> in-flight upstream call, shared by concurrent askers
+_inflight_metrics: Dict[tuple, asyncio.Future] = {}
+
+# Keyword Planner ideas per request (cached by GoogleAdsService)
+KEYWORD_IDEAS_LIMIT = 10
+
+
+def _seed_key(seed_keywords: List[str]) -> tuple:
+    """Canonical, order- and case-insensitive form of a seed set."""
+    return tuple(sorted({seed.strip().casefold() for seed in seed_keywords}))
+
+
+def _as_datetime(value: Any) -> datetime:
+    """Coerce an explicit range bound (datetime, date or ISO string from the LLM) to a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return datetime.fromisoformat(str(value).strip())
+
+
+@lru_cache(maxsize=64)
+def _date_range_for(period: str, today_date: date) -> tuple[datetime, datetime]:
+    """Resolve a known time period relative to today_date (cached per day)."""
+    return _PERIOD_HANDLERS[period](datetime.combine(today_date, time.min))
+
 
 class ActionRouter:
     """Routes user intents to appropriate service actions."""
@@ -28,7 +231,8 @@ class ActionRouter:
         report_service: ReportService,
         keyword_service: KeywordService,
         google_ads_service: GoogleAdsService,
-        gemini_service: GeminiService
+        gemini_service: GeminiService,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None
     ):
         """
         Initialize ActionRouter with required services.
@@ -39,12 +243,25 @@ class ActionRouter:
             keyword_service: Service for keyword operations
             google_ads_service: Service for Google Ads API
             gemini_service: Service for Gemini AI
+            on_partial: Optional callback receiving the accumulated text while a
+                Gemini answer is streaming (e.g. to update a Slack message)
         """
         self.db = db
         self.report_service = report_service
         self.keyword_service = keyword_service
         self.google_ads_service = google_ads_service
         self.gemini_service = gemini_service
+        self.on_partial = on_partial
+
+        # Intent → handler dispatch table (built once per router)
+        self._handlers = {
+            GENERATE_REPORT: self._handle_generate_report,
+            CHANGE_SCHEDULE: self._handle_change_schedule,
+            ANSWER_QUESTION: self._handle_answer_question,
+            KEYWORD_SUGGESTION: self._handle_keyword_suggestion,
+            QUERY_GSC_DATA: self._handle_query_gsc_data,
+            GENERAL_CHAT: self._handle_general_chat,
+        }
 
     async def route_action(
         self,
@@ -66,45 +283,43 @@ class ActionRouter:
             Formatted response string ready for Slack
         """
         try:
-            logger.info(f"Routing action: intent={intent}, entities={entities}, tenant_id={tenant_id}")
-
-            if intent == "generate_report":
-                return await self._handle_generate_report(entities, tenant_id)
-
-            elif intent == "change_schedule":
-                return await self._handle_change_schedule(entities, tenant_id)
-
-            elif intent == "answer_question":
-                return await self._handle_answer_question(entities, tenant_id, conversation_history)
-
-            elif intent == "keyword_suggestion":
-                return await self._handle_keyword_suggestion(entities, tenant_id)
+            logger.info(
+                "Routing action: intent=%s, entities=%r, tenant_id=%s", intent, entities, tenant_id,
+                extra={"extra_fields": {"intent": intent, "entities": entities, "tenant_id": tenant_id}}
+            )
 
-            elif intent == "query_gsc_data":
-                return await self._handle_query_gsc_data(entities, tenant_id)
+            handler = self._handlers.get(intent)
+            if handler is None:
+                logger.warning("Unknown intent: %s", intent, extra={"extra_fields": {"intent": intent}})
+                return _HELP_TEXT
 
-            elif intent == "general_chat":
-                return await self._handle_general_chat(entities, tenant_id, conversation_history)
+            if intent in RATE_LIMITED_INTENTS:
+                limiter = _limiter_for(tenant_id)
+                if not limiter.try_acquire():
+                    logger.warning(
+                        "Tenant %s over rate limit for %s", tenant_id, intent,
+                        extra={"extra_fields": {"intent": intent, "tenant_id": tenant_id}}
+                    )
+                    return RATE_LIMITED_MESSAGE
 
-            else:
-                logger.warning(f"Unknown intent: {intent}")
-                return "I'm not sure how to help with that. Try asking me to:\n" \
-                       "• Generate a report\n" \
-                       "• Change your report schedule\n" \
-                       "• Answer questions about your campaigns\n" \
-                       "• Suggest keywords"
+            if intent in HISTORY_AWARE_INTENTS:
+                return await handler(entities, tenant_id, conversation_history)
+            return await handler(entities, tenant_id)
 
         except Exception as e:
-            logger.error(f"Error routing action: {e}", exc_info=True)
+            logger.error("Error routing action: %s", e, exc_info=True)
             return f"Sorry, I encountered an error: {str(e)}. Please try again or contact support."
 
     async def _handle_generate_report(self, entities: Dict[str, Any], tenant_id: int) -> str:
         """Handle report generation request."""
         try:
-            logger.info(f"Generating report for tenant {tenant_id}")
+            logger.info(
+                "Generating report for tenant %s", tenant_id,
+                extra={"extra_fields": {"intent": GENERATE_REPORT, "tenant_id": tenant_id}}
+            )
 
             # Generate report (service method only takes tenant_id)
-            report = self.report_service.generate_weekly_report(tenant_id=tenant_id)
+            report = await run_io(self.report_service.generate_weekly_report, tenant_id=tenant_id)
 
             # Check report status
             if report.get('status') == 'error':
@@ -114,77 +329,48 @@ class ActionRouter:
             metrics = report.get('metrics', {})
             period = report.get('period', 'Last week')
 
-            response = f"*Weekly Report Summary* ({period})\n\n"
-            response += f"*Total Spend:* ${metrics.get('cost', 0):,.2f}\n"
-            response += f"*Impressions:* {metrics.get('impressions', 0):,}\n"
-            response += f"*Clicks:* {metrics.get('clicks', 0):,}\n"
-            response += f"*Conversions:* {metrics.get('conversions', 0)}\n"
-            response += f"*ROAS:* {metrics.get('roas', 0):.2f}\n\n"
-
-            response += "_Report has been sent to your Slack channel!_"
-
-            return response
+            return _REPORT_TEMPLATE.format_map({**_REPORT_DEFAULTS, **metrics, "period": period})
 
         except Exception as e:
-            logger.error(f"Error generating report: {e}", exc_info=True)
+            logger.error("Error generating report: %s", e, exc_info=True)
             return f"Sorry, I couldn't generate the report: {str(e)}"
 
     async def _handle_change_schedule(self, entities: Dict[str, Any], tenant_id: int) -> str:
         """Handle report schedule change request."""
         try:
-            frequency = entities.get('frequency', 'weekly')
+            frequency = entities.get('frequency', 'weekly').lower()
+            report_frequency = _FREQUENCY_MAP.get(frequency)
+            if report_frequency is None:
+                return f"Sorry, `{frequency}` isn't a supported frequency. " \
+                       "Use daily, weekly, monthly or disabled."
+
             day = entities.get('day', 'Monday')
             time_str = entities.get('time', '09:00')
 
-            logger.info(f"Changing schedule for tenant {tenant_id}: {frequency}, {day}, {time_str}")
+            logger.info(
+                "Changing schedule for tenant %s: %s, %s, %s", tenant_id, frequency, day, time_str,
+                extra={"extra_fields": {"intent": CHANGE_SCHEDULE, "tenant_id": tenant_id, "frequency": frequency}}
+            )
 
-            # Map day name to day_of_week integer (0=Monday, 6=Sunday)
-            day_map = {
-                'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-                'friday': 4, 'saturday': 5, 'sunday': 6
-            }
-            day_of_week = day_map.get(day.lower(), 0)
+            day_of_week = _DAY_MAP.get(day.lower(), 0)
 
             # Parse time string to time object
-            from datetime import time as time_obj
-            hour, minute = map(int, time_str.split(':'))
-            time_of_day = time_obj(hour, minute)
-
-            # Map frequency string to ReportFrequency enum
-            frequency_map = {
-                'daily': ReportFrequency.DAILY,
-                'weekly': ReportFrequency.WEEKLY,
-                'monthly': ReportFrequency.MONTHLY,
-                'disabled': ReportFrequency.DISABLED
-            }
-            report_frequency = frequency_map.get(frequency.lower(), ReportFrequency.WEEKLY)
-
-            # Update ReportSchedule directly in database
-            schedule = self.db.query(ReportSchedule).filter_by(tenant_id=tenant_id).first()
-
-            if schedule:
-                schedule.frequency = report_frequency
-                schedule.day_of_week = day_of_week
-                schedule.time_of_day = time_of_day
-                schedule.updated_at = datetime.utcnow()
-            else:
-                # Create new schedule if it doesn't exist
-                schedule = ReportSchedule(
-                    tenant_id=tenant_id,
-                    frequency=report_frequency,
-                    day_of_week=day_of_week,
-                    time_of_day=time_of_day
-                )
-                self.db.add(schedule)
-
-            self.db.commit()
+            match = _TIME_RE.match(time_str.strip())
+            if not match or int(match[1]) > 23 or int(match[2]) > 59:
+                return f"Sorry, `{time_str}` isn't a valid time. Use HH:MM, e.g. 09:00."
+            time_of_day = time(int(match[1]), int(match[2]))
+
+            # Single INSERT ... ON CONFLICT instead of SELECT + UPDATE/INSERT, off the event loop
+            await run_io(
+                ReportSchedule.upsert, self.db, tenant_id, report_frequency, day_of_week, time_of_day
+            )
 
             return f"✅ Report schedule updated!\n" \
                    f"You'll now receive {frequency} reports on *{day}* at *{time_str}*."
 
         except Exception as e:
-            logger.error(f"Error changing schedule: {e}", exc_info=True)
-            self.db.rollback()
+            logger.error("Error changing schedule: %s", e, exc_info=True)
+            await run_io(self.db.rollback)
             return f"Sorry, I couldn't update the schedule: {str(e)}"
 
     async def _handle_answer_question(
@@ -196,11 +382,12 @@ class ActionRouter:
         """Handle data question by querying Google Ads."""
         try:
             # Get customer_id from tenant_id
-            account = self.db.query(GoogleAdsAccount).filter_by(
-                tenant_id=tenant_id, is_active=True
-            ).first()
-            if not account:
-                logger.error(f"No active Google Ads account for tenant {tenant_id}")
+            customer_id = await self._get_customer_id(tenant_id)
+            if not customer_id:
+                logger.error(
+                    "No active Google Ads account for tenant %s", tenant_id,
+                    extra={"extra_fields": {"intent": ANSWER_QUESTION, "tenant_id": tenant_id}}
+                )
                 return "Sorry, I couldn't find an active Google Ads account for your organization. Please set up your Google Ads account first."
 
             # Parse date range
@@ -209,31 +396,28 @@ class ActionRouter:
             # Extract metrics of interest
             metrics = entities.get('metrics', ['clicks', 'impressions', 'cost', 'conversions'])
 
-            logger.info(f"Answering question for tenant {tenant_id}: metrics={metrics}")
-
-            # Query Google Ads data
-            data = await self.google_ads_service.get_campaign_metrics(
-                customer_id=account.customer_id,
-                date_from=start_date,
-                date_to=end_date,
-                metrics=metrics
+            logger.info(
+                "Answering question for tenant %s: metrics=%s", tenant_id, metrics,
+                extra={"extra_fields": {"intent": ANSWER_QUESTION, "tenant_id": tenant_id, "metrics": metrics}}
             )
 
-            # Use Gemini to format natural language response
-            prompt = f"""Based on this Google Ads data, answer the user's question naturally:
-
-Data: {data}
-Date Range: {start_date} to {end_date}
-Conversation History: {conversation_history or 'None'}
+            # Query Google Ads data (cached and coalesced per customer/range/metrics)
+            data = await self._fetch_campaign_metrics(customer_id, start_date, end_date, metrics)
 
-Format the response in a friendly, conversational way with key metrics highlighted."""
+            # Use Gemini to format natural language response
+            prompt = _ANSWER_PROMPT.substitute(
+                data=orjson.dumps(data, default=str).decode(),
+                start=start_date.date().isoformat(),
+                end=end_date.date().isoformat(),
+                history=self._summarize_history(conversation_history)
+            )
 
-            response = await self.gemini_service.generate_text(prompt)
+            response = await self._generate(prompt, temperature=FACTUAL_TEMPERATURE)
 
             return response
 
         except Exception as e:
-            logger.error(f"Error answering question: {e}", exc_info=True)
+            logger.error("Error answering question: %s", e, exc_info=True)
             return f"Sorry, I couldn't fetch that data: {str(e)}"
 
     async def _handle_keyword_suggestion(self, entities: Dict[str, Any], tenant_id: int) -> str:
@@ -243,87 +427,71 @@ Format the response in a friendly, conversational way with key metrics highlight
             if not seed_keywords:
                 # 원본 메시지에서 키워드 추출 시도
                 original = entities.get('original_message', '')
-                seed_keywords = [w for w in original.split() if len(w) > 1 and w not in
-                                 ['키워드', '추천', '알려줘', '보여줘', '뭐야', '관련', '해줘']][:3]
+                seed_keywords = list(itertools.islice(
+                    (w for w in original.split() if len(w) > 1 and w not in _KW_STOPWORDS), 3
+                ))
 
             if not seed_keywords:
                 return "키워드 추천을 위해 시드 키워드를 알려주세요.\n예: `@봇 \"러닝화\" 키워드 추천해줘`"
 
-            account = self.db.query(GoogleAdsAccount).filter_by(
-                tenant_id=tenant_id, is_active=True
-            ).first()
-            if not account:
+            customer_id = await self._get_customer_id(tenant_id)
+            if not customer_id:
                 return "❌ Google Ads 계정이 연동되어 있지 않습니다."
 
-            logger.info(f"Keyword Planner request: seeds={seed_keywords}, tenant={tenant_id}")
+            logger.info(
+                "Keyword Planner request: seeds=%s, tenant=%s", seed_keywords, tenant_id,
+                extra={"extra_fields": {"intent": KEYWORD_SUGGESTION, "tenant_id": tenant_id, "seeds": seed_keywords}}
+            )
 
-            import asyncio
-            ideas = await asyncio.to_thread(
+            ideas = await run_io(
                 self.google_ads_service.generate_keyword_ideas,
-                account.customer_id,
+                customer_id,
                 seed_keywords,
-                limit=10
+                limit=KEYWORD_IDEAS_LIMIT
             )
 
             if not ideas:
                 # Keyword Planner 실패 시 Gemini 폴백
                 logger.warning("Keyword Planner returned no results, falling back to Gemini")
-                prompt = f"""한국 Google Ads 전문가로서 다음 시드 키워드 기반으로 10개 키워드를 추천해줘: {', '.join(seed_keywords)}
-각 키워드별로 예상 검색량(높음/중간/낮음), 경쟁도, 추천 입찰가를 포함해서 한국어로 답변해줘."""
-                return await self.gemini_service.generate_text(prompt)
-
-            comp_map = {"HIGH": "높음", "MEDIUM": "보통", "LOW": "낮음", "UNKNOWN": "-"}
-            lines = [f"🔑 *키워드 아이디어* (시드: {', '.join(seed_keywords)})"]
-            lines.append("")
-            for i, idea in enumerate(ideas, 1):
-                comp = comp_map.get(idea['competition'], idea['competition'])
-                searches = idea['avg_monthly_searches']
-                bid = f"₩{idea['low_bid_krw']:,}~{idea['high_bid_krw']:,}" if idea['high_bid_krw'] > 0 else "N/A"
-                lines.append(
-                    f"{i}. `{idea['keyword']}` — 월 검색 {searches} · 경쟁도 {comp} · 입찰가 {bid}"
+                prompt = _KEYWORD_FALLBACK_PROMPT.substitute(seeds=', '.join(seed_keywords))
+                return await self._cached_generate(
+                    response_cache.fingerprint(KEYWORD_SUGGESTION, list(_seed_key(seed_keywords)) + [str(KEYWORD_IDEAS_LIMIT)]),
+                    prompt
                 )
-            lines.append("")
-            lines.append("_캠페인에 추가하고 싶은 키워드가 있으면 알려주세요!_")
-            return "\n".join(lines)
+
+            return "\n".join((
+                _KEYWORD_IDEAS_HEADER.format(seeds=', '.join(seed_keywords)),
+                *map(_format_keyword_idea, itertools.count(1), ideas),
+                _KEYWORD_IDEAS_FOOTER,
+            ))
 
         except Exception as e:
-            logger.error(f"Error suggesting keywords: {e}", exc_info=True)
+            logger.error("Error suggesting keywords: %s", e, exc_info=True)
             return f"키워드 추천 중 오류가 발생했습니다: {str(e)}"
 
     async def _handle_query_gsc_data(self, entities: Dict[str, Any], tenant_id: int) -> str:
         """Handle Google Search Console data query."""
         try:
-            from app.services.search_console_service import SearchConsoleService
-            from app.core.security import decrypt_token
-            from app.config import settings
-
-            gsc_account = self.db.query(SearchConsoleAccount).filter_by(
-                tenant_id=tenant_id, is_active=True
-            ).first()
+            gsc_account = tenant_cache.cached_gsc_account(tenant_id)
+            if gsc_account is None:
+                gsc_account = await run_io(tenant_cache.get_gsc_account, self.db, tenant_id)
             if not gsc_account or not gsc_account.refresh_token:
                 return "❌ Search Console이 연동되어 있지 않습니다. `/sem-connect` 에서 연동해주세요."
 
-            refresh_token = decrypt_token(gsc_account.refresh_token)
-            gsc_service = SearchConsoleService(
-                client_id=settings.google_client_id,
-                client_secret=settings.google_client_secret,
-                refresh_token=refresh_token
-            )
+            gsc_service = tenant_cache.get_gsc_client(tenant_id, gsc_account)
 
             start_date, end_date = self._parse_date_range(entities)
             data_type = entities.get("gsc_data_type", "overview")
             limit = int(entities.get("limit", 5))
             target_url = entities.get("target_url")
 
-            from datetime import date as date_type
-            start = start_date.date() if hasattr(start_date, "date") else start_date
-            end = end_date.date() if hasattr(end_date, "date") else end_date
+            start, end = start_date.date(), end_date.date()
 
             period_str = f"{start} ~ {end}"
             data_summary = f"사이트: {gsc_account.site_url}\n기간: {period_str}\n"
 
             if data_type == "queries":
-                rows = gsc_service.get_top_queries(gsc_account.site_url, start, end, limit)
+                rows = await run_io(gsc_service.get_top_queries, gsc_account.site_url, start, end, limit)
                 if not rows:
                     return f"📊 해당 기간({period_str}) 검색어 데이터가 없습니다."
                 lines = [f"🔎 *인기 검색어 Top {len(rows)}* ({period_str})"]
@@ -332,7 +500,7 @@ Format the response in a friendly, conversational way with key metrics highlight
                 return "\n".join(lines)
 
             elif data_type == "pages":
-                rows = gsc_service.get_top_pages(gsc_account.site_url, start, end, limit)
+                rows = await run_io(gsc_service.get_top_pages, gsc_account.site_url, start, end, limit)
                 if not rows:
                     return f"📄 해당 기간({period_str}) 페이지 데이터가 없습니다."
                 lines = [f"📄 *인기 콘텐츠 Top {len(rows)}* ({period_str})"]
@@ -342,25 +510,35 @@ Format the response in a friendly, conversational way with key metrics highlight
                 return "\n".join(lines)
 
             else:  # overview
-                metrics = gsc_service.get_search_analytics(gsc_account.site_url, start, end)
+                # Totals, top queries and top pages are independent requests: overlap them
+                metrics, top_queries, top_pages = await asyncio.gather(
+                    run_io(gsc_service.get_search_analytics, gsc_account.site_url, start, end),
+                    run_io(gsc_service.get_top_queries, gsc_account.site_url, start, end, GSC_OVERVIEW_TOP_N),
+                    run_io(gsc_service.get_top_pages, gsc_account.site_url, start, end, GSC_OVERVIEW_TOP_N),
+                )
                 data_summary += (
                     f"클릭: {metrics.get('clicks', 0):,}회\n"
                     f"노출: {metrics.get('impressions', 0):,}회\n"
                     f"CTR: {metrics.get('ctr', 0):.1f}%\n"
                     f"평균 순위: {metrics.get('position', 0):.1f}위"
                 )
-
-                prompt = f"""다음 Google Search Console 데이터를 보고 자연스럽게 한국어로 요약해줘:
-
-{data_summary}
-
-사용자 질문 맥락: {entities.get('original_message', '')}
-
-2~3문장으로 핵심만 간결하게 답변해줘."""
-                return await self.gemini_service.generate_text(prompt)
+                if top_queries:
+                    data_summary += "\n인기 검색어: " + ", ".join(
+                        f"{r['query']}({r['clicks']}클릭)" for r in top_queries
+                    )
+                if top_pages:
+                    data_summary += "\n인기 페이지: " + ", ".join(
+                        f"{r.get('path', r.get('url', '-'))}({r['clicks']}클릭)" for r in top_pages
+                    )
+
+                prompt = _GSC_SUMMARY_PROMPT.substitute(
+                    data_summary=data_summary,
+                    question=entities.get('original_message', '')
+                )
+                return await self._generate(prompt, temperature=FACTUAL_TEMPERATURE)
 
         except Exception as e:
-            logger.error(f"Error querying GSC data: {e}", exc_info=True)
+            logger.error("Error querying GSC data: %s", e, exc_info=True)
             return f"Search Console 데이터 조회 중 오류가 발생했습니다: {str(e)}"
 
     async def _handle_general_chat(
@@ -371,27 +549,126 @@ Format the response in a friendly, conversational way with key metrics highlight
     ) -> str:
         """Handle general chat using Gemini."""
         try:
-            # Build context from conversation history
-            context = "You are a helpful Google Ads assistant. Be friendly and conversational.\n\n"
+            user_message = entities.get('original_message', '')
+            turns = select_context_turns((conversation_history or [])[-CHAT_HISTORY_TURNS:], user_message)
 
-            if conversation_history:
-                context += "Previous conversation:\n"
-                for msg in conversation_history[-5:]:  # Last 5 messages for context
-                    role = msg.get('role', 'user')
-                    content = msg.get('content', '')
-                    context += f"{role}: {content}\n"
+            # Context from the recent turns most relevant to the message, each trimmed
+            lines = [
+                f"{msg.get('role', 'user')}: {_trim_message(msg.get('content', ''), CHAT_HISTORY_CHARS)}"
+                for msg in turns
+            ]
+            context = _CHAT_PREAMBLE
+            if lines:
+                context += "Previous conversation:\n" + "\n".join(lines) + "\n"
+            context += f"\nUser message: {user_message}"
 
-            context += f"\nUser message: {entities.get('original_message', '')}"
+            # Same selected turns + same message (modulo case/punctuation) reuse the answer
+            cache_key = response_cache.fingerprint(GENERAL_CHAT, lines + [user_message])
 
-            # Generate response with Gemini
-            response = await self.gemini_service.generate_text(context)
-
-            return response
+            return await self._cached_generate(cache_key, context)
 
         except Exception as e:
-            logger.error(f"Error in general chat: {e}", exc_info=True)
+            logger.error("Error in general chat: %s", e, exc_info=True)
             return "Sorry, I didn't catch that. Could you rephrase?"
 
+    async def _get_customer_id(self, tenant_id: int) -> Optional[str]:
+        """Resolve the tenant's customer_id; concurrent cache misses share one batched query."""
+        return await tenant_cache.customer_id_loader.load(tenant_id)
+
+    async def _fetch_campaign_metrics(
+        self,
+        customer_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Get campaign metrics, reusing a cached result or an identical in-flight request.
+
+        Concurrent questions for the same (customer, range, metrics) share one
+        Google Ads call; the result is then cached by _campaign_metrics_cache.
+        The dates are the datetimes normalized by _parse_date_range.
+        """
+        cache_key = (customer_id, start_date, end_date, tuple(sorted(metrics)))
+        data = _campaign_metrics_cache.get(cache_key)
+        if data is not None:
+            return data
+
+        pending = _inflight_metrics.get(cache_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight_metrics[cache_key] = future
+        try:
+            data = await self.google_ads_service.get_campaign_metrics(
+                customer_id=customer_id,
+                date_from=start_date,
+                date_to=end_date,
+                metrics=metrics
+            )
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters (if any) still get it raised
+            raise
+        else:
+            _campaign_metrics_cache[cache_key] = data
+            future.set_result(data)
+            return data
+        finally:
+            _inflight_metrics.pop(cache_key, None)
+
+    async def _generate(self, prompt: str, temperature: float = 0.7) -> str:
+        """
+        Generate a Gemini answer, streaming partial text to on_partial when set.
+
+        Partial updates are throttled to one per STREAM_UPDATE_INTERVAL seconds;
+        the full text is returned for the caller to post/save as the final answer.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Gemini prompt (%d chars): %s", len(prompt), prompt)
+
+        if self.on_partial is None:
+            return await self.gemini_service.generate_text(prompt, temperature=temperature)
+
+        loop = asyncio.get_running_loop()
+        chunks: List[str] = []
+        last_update = loop.time()
+        try:
+            async for chunk in self.gemini_service.generate_text_stream(prompt, temperature=temperature):
+                chunks.append(chunk)
+                now = loop.time()
+                if now - last_update >= STREAM_UPDATE_INTERVAL:
+                    last_update = now
+                    await self.on_partial("".join(chunks))
+        except GeminiError:
+            # Stream broke mid-answer: replace the partial text with the
+            # fallback, which _cached_generate never caches
+            return GENERATION_ERROR_MESSAGE
+        return "".join(chunks)
+
+    async def _cached_generate(self, cache_key: bytes, prompt: str) -> str:
+        """Return a cached Gemini completion for cache_key, generating it on a miss."""
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Response cache hit: %s", cache_key.hex())
+            return cached
+
+        response = await self._generate(prompt)
+        if response and response not in FALLBACK_MESSAGES:
+            response_cache.set(cache_key, response)
+        return response
+
+    @staticmethod
+    def _summarize_history(conversation_history: Optional[List[Dict[str, str]]]) -> str:
+        """Render the last few turns compactly for a prompt ('None' when empty)."""
+        if not conversation_history:
+            return 'None'
+        return "\n".join(
+            f"{msg.get('role', 'user')}: {_trim_message(msg.get('content', ''), HISTORY_SUMMARY_CHARS)}"
+            for msg in conversation_history[-HISTORY_SUMMARY_TURNS:]
+        )
+
     def _parse_date_range(self, entities: Dict[str, Any]) -> tuple[datetime, datetime]:
         """
         Parse date range from entities.
@@ -402,51 +679,23 @@ Format the response in a friendly, conversational way with key metrics highlight
             entities: Extracted entities containing date information
 
         Returns:
-            Tuple of (start_date, end_date)
+            Tuple of (start_date, end_date) as datetimes
         """
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # Check for explicit dates
+        # Check for explicit dates (ISO strings when they come from the LLM)
         if 'start_date' in entities and 'end_date' in entities:
-            return entities['start_date'], entities['end_date']
+            try:
+                return _as_datetime(entities['start_date']), _as_datetime(entities['end_date'])
+            except ValueError:
+                logger.warning(
+                    "Invalid explicit date range %r ~ %r, using time_period",
+                    entities['start_date'], entities['end_date']
+                )
 
         # Parse natural language date ranges
         time_period = entities.get('time_period', 'last_week').lower()
-
-        if time_period in ['yesterday', 'last_day']:
-            start_date = today - timedelta(days=1)
-            end_date = today - timedelta(days=1)
-
-        elif time_period in ['last_week', 'past_week']:
-            start_date = today - timedelta(days=7)
-            end_date = today - timedelta(days=1)
-
-        elif time_period in ['this_week', 'current_week']:
-            # Start from Monday
-            days_since_monday = today.weekday()
-            start_date = today - timedelta(days=days_since_monday)
-            end_date = today
-
-        elif time_period in ['last_month', 'past_month']:
-            start_date = today - timedelta(days=30)
-            end_date = today - timedelta(days=1)
-
-        elif time_period in ['this_month', 'current_month']:
-            start_date = today.replace(day=1)
-            end_date = today
-
-        elif time_period in ['last_7_days', 'past_7_days']:
-            start_date = today - timedelta(days=7)
-            end_date = today
-
-        elif time_period in ['last_30_days', 'past_30_days']:
-            start_date = today - timedelta(days=30)
-            end_date = today
-
-        else:
+        if time_period not in _PERIOD_HANDLERS:
             # Default to last week
-            logger.warning(f"Unknown time period: {time_period}, defaulting to last week")
-            start_date = today - timedelta(days=7)
-            end_date = today - timedelta(days=1)
+            logger.warning("Unknown time period: %s, defaulting to last week", time_period)
+            time_period = 'last_week'
 
-        return start_date, end_date
+        return _date_range_for(time_period, date.today())
@@ -1,7 +1,10 @@
 """Conversation management service."""
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -10,6 +13,27 @@ from app.core.redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
 
+# Redis list of each thread's latest messages (one JSON row per element), kept
+# current by append_to_cached_history so repeated turns skip the database
+HISTORY_CACHE_TTL = 3600
+HISTORY_CACHE_ROWS = 10
+
+
+def _history_cache_key(conversation_id: int) -> str:
+    return f"conversation_history_list:{conversation_id}"
+
+
+def _to_chat_turns(rows: Sequence[Tuple[str, Optional[str]]]) -> List[Dict]:
+    """Expand (message_text, bot_response) rows into chat turns, oldest first."""
+    return [
+        turn
+        for message_text, bot_response in rows
+        for turn in (
+            ({"role": "user", "content": message_text},)
+            + (({"role": "assistant", "content": bot_response},) if bot_response else ())
+        )
+    ]
+
 
 class ConversationService:
     """Service for managing conversation context and history."""
@@ -48,7 +72,7 @@ class ConversationService:
         ).first()
 
         if conversation:
-            logger.debug(f"Found existing conversation: {conversation.id}")
+            logger.debug("Found existing conversation: %s", conversation.id)
             return conversation
 
         # Create new conversation
@@ -62,7 +86,7 @@ class ConversationService:
         self.db.commit()
         self.db.refresh(conversation)
 
-        logger.info(f"Created new conversation: {conversation.id}")
+        logger.info("Created new conversation: %s", conversation.id)
         return conversation
 
     def get_conversation_history(
@@ -79,28 +103,85 @@ class ConversationService:
         Returns:
             List of message dicts with role and content
         """
-        messages = self.db.query(ConversationMessage).filter_by(
-            conversation_id=conversation_id
-        ).order_by(
-            ConversationMessage.created_at.desc()
-        ).limit(limit).all()
-
-        # Convert to chat format (reverse to chronological order)
-        history = []
-        for msg in reversed(messages):
-            # Add user message
-            history.append({
-                "role": "user",
-                "content": msg.message_text
-            })
-            # Add bot response if exists
-            if msg.bot_response:
-                history.append({
-                    "role": "assistant",
-                    "content": msg.bot_response
-                })
-
-        return history
+        return _to_chat_turns(self._latest_messages(conversation_id, limit))
+
+    def _latest_messages(self, conversation_id: int, limit: int) -> List[Tuple[str, Optional[str]]]:
+        """Return the newest `limit` (message_text, bot_response) rows, oldest first."""
+        # Newest rows in the subquery, re-sorted oldest-first by the database
+        latest = (
+            select(ConversationMessage.message_text, ConversationMessage.bot_response, ConversationMessage.created_at)
+            .where(ConversationMessage.conversation_id == conversation_id)
+            .order_by(ConversationMessage.created_at.desc())
+            .limit(limit)
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(latest.c.message_text, latest.c.bot_response).order_by(latest.c.created_at.asc())
+        ).all()
+        return [tuple(row) for row in rows]
+
+    async def get_cached_history(self, conversation_id: int, limit: int = 10) -> List[Dict]:
+        """Get conversation history, served from Redis when the thread is cached.
+
+        On a miss the latest HISTORY_CACHE_ROWS messages are loaded from the
+        database and written back. Redis errors fall back to the database.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to return (at most HISTORY_CACHE_ROWS)
+
+        Returns:
+            List of message dicts with role and content
+        """
+        if limit > HISTORY_CACHE_ROWS:
+            return self.get_conversation_history(conversation_id, limit)
+
+        key = _history_cache_key(conversation_id)
+        try:
+            cached = await self.redis.lrange(key, 0, -1)
+        except Exception as e:
+            logger.warning("History cache read failed for conversation %s: %s", conversation_id, e)
+            return self.get_conversation_history(conversation_id, limit)
+
+        if cached:
+            rows = [orjson.loads(row) for row in cached]
+        else:
+            rows = self._latest_messages(conversation_id, HISTORY_CACHE_ROWS)
+            try:
+                await self.redis.replace_list(key, HISTORY_CACHE_TTL, [orjson.dumps(row) for row in rows])
+            except Exception as e:
+                logger.warning("History cache write failed for conversation %s: %s", conversation_id, e)
+
+        return _to_chat_turns(rows[-limit:])
+
+    async def append_to_cached_history(
+        self,
+        conversation_id: int,
+        message_text: str,
+        bot_response: Optional[str]
+    ):
+        """Add a just-saved message to the thread's cached history, if cached.
+
+        The append, trim and TTL refresh run as one Redis transaction, so
+        concurrent posts to the same thread don't overwrite each other.
+
+        Args:
+            conversation_id: Conversation ID
+            message_text: The user's message
+            bot_response: Bot's response (optional)
+        """
+        key = _history_cache_key(conversation_id)
+        try:
+            # No-op when the thread isn't cached; the next read backfills from the database
+            await self.redis.append_capped(
+                key, HISTORY_CACHE_TTL, orjson.dumps((message_text, bot_response)), HISTORY_CACHE_ROWS
+            )
+        except Exception as e:
+            logger.warning("History cache update failed for conversation %s: %s", conversation_id, e)
+            try:
+                await self.redis.delete(key)
+            except Exception:
+                pass
 
     def save_message(
         self,
@@ -134,17 +215,16 @@ class ConversationService:
         )
         self.db.add(message)
 
-        # Update conversation updated_at timestamp
-        conversation = self.db.query(Conversation).filter_by(
-            id=conversation_id
-        ).first()
-        if conversation:
-            conversation.updated_at = datetime.utcnow()
-
+        # Touch updated_at in place: one UPDATE, no SELECT of the conversation.
+        # Committed together with the insert; message attributes reload lazily.
+        self.db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(updated_at=datetime.utcnow())
+        )
         self.db.commit()
-        self.db.refresh(message)
 
-        logger.debug(f"Saved message to conversation {conversation_id}")
+        logger.debug("Saved message to conversation %s", conversation_id)
         return message
 
     async def get_context_from_cache(self, thread_ts: str) -> Optional[Dict]:
@@ -156,13 +236,11 @@ class ConversationService:
         Returns:
             Cached context dict or None
         """
-        import json
-
         cache_key = f"conversation_context:{thread_ts}"
         cached = await self.redis.get(cache_key)
 
         if cached:
-            return json.loads(cached)
+            return orjson.loads(cached)
         return None
 
     async def save_context_to_cache(
@@ -178,11 +256,9 @@ class ConversationService:
             context: Context dict to cache
             ttl: Time to live in seconds (default 1 hour)
         """
-        import json
-
         cache_key = f"conversation_context:{thread_ts}"
         await self.redis.setex(
             cache_key,
             ttl,
-            json.dumps(context)
+            orjson.dumps(context)
         )
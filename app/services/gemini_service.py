@@ -1,30 +1,213 @@
 """Gemini AI service for generating insights."""
 
 from google import genai
-from typing import Dict, Optional
+from google.genai import types
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import hashlib
 import logging
+import threading
 import time
-from collections import deque
+from types import MappingProxyType
+
+from cachetools import TTLCache
+
+from app.core.exceptions import GeminiError
+from app.core.executor import run_io
 
 logger = logging.getLogger(__name__)
 
+# User-facing texts generate_text returns instead of a completion
+RATE_LIMITED_MESSAGE = "죄송합니다. 잠시 후 다시 시도해주세요."
+GENERATION_ERROR_MESSAGE = "응답을 생성하는 중 오류가 발생했습니다."
+FALLBACK_MESSAGES = frozenset({RATE_LIMITED_MESSAGE, GENERATION_ERROR_MESSAGE})
+
+# Longest a request waits for a free Gemini slot before giving up
+RATE_LIMIT_MAX_WAIT = 20.0
+
+# Insight prompts, filled with str.format_map over the metrics dict so the
+# template text is built once at import rather than on every call
+_REPORT_INSIGHT_PROMPT = """당신은 10년 경력의 B2B 검색광고(SEM) 전문가입니다.
+아래 주간 Google Ads 성과를 분석하여 담당자가 바로 실무에 활용할 수 있는 한국어 코멘트를 작성하세요.
+
+[이번 주 성과]
+- 비용: ₩{cost:,.0f}
+- 노출: {impressions:,}회
+- 클릭: {clicks:,}회
+- 전환: {conversions:.0f}건
+- CPC: ₩{cpc:,.0f}
+- CPA: {cpa_display}
+
+[전주 대비 증감]
+{change_summary}
+{trend_section}
+[지표 해석 기준]
+- CPC 감소 = 클릭 효율 개선 (긍정)
+- CPA 감소 = 리드 획득 비용 절감 (긍정)
+- 비용 증가 + 전환 증가 = 정상 확장 (긍정)
+- 비용 증가 + 전환 감소/정체 = 효율 저하 (주의)
+- 전환 0건 = 키워드·랜딩페이지 즉시 점검 필요
+
+[작성 규칙]
+- 정확히 3문장으로 작성
+- 첫 문장: 이번 주 전체 성과를 수치와 함께 한 줄로 평가 (긍정/부정 방향 명확히)
+- 둘째 문장: 가장 주목할 지표 변화와 그 의미를 수치 포함하여 설명
+- 셋째 문장: 4주 트렌드 흐름을 바탕으로 다음 주 집중해야 할 구체적인 액션 1가지 제안
+- ROAS는 절대 언급하지 말 것 (B2B 계정 특성상 해당 없음)
+- "분석했습니다" 같은 무의미한 마무리 금지
+"""
+_REPORT_INSIGHT_DEFAULTS = MappingProxyType({"cost": 0, "impressions": 0, "clicks": 0, "conversions": 0, "cpc": 0})
+
+_GSC_INSIGHT_PROMPT = """당신은 10년 경력의 SEO 전문가입니다.
+아래 Google Search Console 주간 성과를 분석하여 담당자가 바로 실무에 활용할 수 있는 한국어 코멘트를 작성하세요.
+
+[이번 주 성과]
+- 클릭수: {clicks:,}회
+- 노출수: {impressions:,}회
+- CTR: {ctr:.1f}%
+- 평균 순위: {position:.1f}위
+
+[인기 검색어 Top 5]
+| 검색어 | 클릭 | 노출 | CTR | 순위 |
+|--------|------|------|-----|------|
+{queries_text}
+{trend_section}
+[지표 해석 기준]
+- CTR 상승 = 검색 결과에서 클릭 유도력 개선 (긍정)
+- 평균 순위 하락(숫자 감소) = SEO 순위 개선 (긍정)
+- 노출 증가 + 클릭 감소 = 메타 설명·제목 최적화 필요
+- 평균 순위 10 이하 = 1페이지 노출 중 (중요)
+
+[작성 규칙]
+- 정확히 3문장으로 작성
+- 첫 문장: 이번 주 전체 SEO 성과를 수치와 함께 한 줄로 평가 (긍정/부정 방향 명확히)
+- 둘째 문장: 가장 주목할 지표 또는 인기 검색어 변화와 그 의미를 수치 포함하여 설명
+- 셋째 문장: 4주 트렌드 흐름을 바탕으로 다음 주 집중해야 할 구체적인 SEO 액션 1가지 제안
+- "분석했습니다" 같은 무의미한 마무리 금지
+"""
+_GSC_INSIGHT_DEFAULTS = MappingProxyType({"clicks": 0, "impressions": 0, "ctr": 0, "position": 0})
+
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """
+    Token-bucket rate limiter for API calls.
+
+    Holds up to `max_requests` tokens, refilled continuously at
+    max_requests / time_window per second; each request spends one token.
+    State is two floats, updated under a lock so threads sharing a limiter
+    cannot both spend the last token.
+    """
 
     def __init__(self, max_requests: int, time_window: int = 60):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = deque()
+        self.capacity = float(max_requests)
+        self.rate = max_requests / time_window
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
 
     def can_proceed(self) -> bool:
-        now = time.time()
-        while self.requests and self.requests[0] < now - self.time_window:
-            self.requests.popleft()
-        return len(self.requests) < self.max_requests
+        with self._lock:
+            self._refill()
+            return self.tokens >= 1
 
     def add_request(self):
-        self.requests.append(time.time())
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+
+    def try_acquire(self) -> bool:
+        """Spend a token if one is available; check and spend are atomic."""
+        with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def _time_until_token(self) -> float:
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self.tokens) / self.rate)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait for a token and spend it.
+
+        Waiting coroutines are admitted in arrival order.
+
+        Args:
+            max_wait: Give up instead of waiting longer than this many seconds
+
+        Returns:
+            True once a token is spent, False if the wait would exceed max_wait
+        """
+        async with self._waiters:
+            while not self.try_acquire():
+                wait = self._time_until_token()
+                if max_wait is not None and wait > max_wait:
+                    return False
+                await asyncio.sleep(wait)
+            return True
+
+
+# Completions of deterministic prompts, keyed by _prompt_key; a short TTL
+# collapses repeated report/overview requests without serving stale numbers.
+# Insight generation runs on worker threads, so access goes through the lock.
+_completion_cache: TTLCache = TTLCache(maxsize=2048, ttl=300)
+_completion_cache_lock = threading.Lock()
+
+# generate_text only caches at or below this temperature
+CACHEABLE_TEMPERATURE = 0.3
+
+# Temperature for answers restating fetched data (metrics, GSC summaries)
+FACTUAL_TEMPERATURE = 0.2
+
+
+def _cached_completion(cache_key: bytes) -> Optional[str]:
+    with _completion_cache_lock:
+        return _completion_cache.get(cache_key)
+
+
+def _store_completion(cache_key: bytes, text: str) -> str:
+    with _completion_cache_lock:
+        _completion_cache[cache_key] = text
+    return text
+
+
+def _prompt_key(model_name: str, prompt: str) -> bytes:
+    digest = hashlib.blake2b(model_name.encode(), digest_size=16)
+    digest.update(b"\x1f")
+    digest.update(prompt.encode())
+    return digest.digest()
+
+
+# Process-wide limiter per model: services are created per request,
+# so a per-instance limiter would never see more than a handful of calls.
+_model_limiters: Dict[str, RateLimiter] = {}
+
+# One genai.Client per API key, for the same reason: each client owns its
+# HTTP transport, so reusing it keeps connections to the Gemini API warm.
+_clients: Dict[str, genai.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(api_key: str) -> genai.Client:
+    """Return the shared genai.Client for api_key, creating it once."""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = genai.Client(api_key=api_key)
+    return client
 
 
 class GeminiService:
@@ -38,7 +221,7 @@ class GeminiService:
             model_name: Model to use (default: gemini-2.0-flash)
         """
         try:
-            self.client = genai.Client(api_key=api_key)
+            self.client = _get_client(api_key)
             self.model_name = model_name
             logger.info(f"GeminiService initialized with model: {model_name}")
         except Exception as e:
@@ -46,7 +229,9 @@ class GeminiService:
             raise
 
         rpm = 60 if "flash" in model_name else 10
-        self.rate_limiter = RateLimiter(max_requests=rpm)
+        if model_name not in _model_limiters:
+            _model_limiters[model_name] = RateLimiter(max_requests=rpm)
+        self.rate_limiter = _model_limiters[model_name]
 
     def generate_report_insight(
         self,
@@ -83,35 +268,18 @@ class GeminiService:
                 f"{rows_text}\n"
             )
 
-        prompt = f"""당신은 10년 경력의 B2B 검색광고(SEM) 전문가입니다.
-아래 주간 Google Ads 성과를 분석하여 담당자가 바로 실무에 활용할 수 있는 한국어 코멘트를 작성하세요.
-
-[이번 주 성과]
-- 비용: ₩{metrics.get('cost', 0):,.0f}
-- 노출: {metrics.get('impressions', 0):,}회
-- 클릭: {metrics.get('clicks', 0):,}회
-- 전환: {metrics.get('conversions', 0):.0f}건
-- CPC: ₩{metrics.get('cpc', 0):,.0f}
-- CPA: {cpa_display}
-
-[전주 대비 증감]
-{change_summary}
-{trend_section}
-[지표 해석 기준]
-- CPC 감소 = 클릭 효율 개선 (긍정)
-- CPA 감소 = 리드 획득 비용 절감 (긍정)
-- 비용 증가 + 전환 증가 = 정상 확장 (긍정)
-- 비용 증가 + 전환 감소/정체 = 효율 저하 (주의)
-- 전환 0건 = 키워드·랜딩페이지 즉시 점검 필요
+        prompt = _REPORT_INSIGHT_PROMPT.format_map({
+            **_REPORT_INSIGHT_DEFAULTS,
+            **metrics,
+            "cpa_display": cpa_display,
+            "change_summary": change_summary,
+            "trend_section": trend_section,
+        })
+        cache_key = _prompt_key(self.model_name, prompt)
+        cached = _cached_completion(cache_key)
+        if cached is not None:
+            return cached
 
-[작성 규칙]
-- 정확히 3문장으로 작성
-- 첫 문장: 이번 주 전체 성과를 수치와 함께 한 줄로 평가 (긍정/부정 방향 명확히)
-- 둘째 문장: 가장 주목할 지표 변화와 그 의미를 수치 포함하여 설명
-- 셋째 문장: 4주 트렌드 흐름을 바탕으로 다음 주 집중해야 할 구체적인 액션 1가지 제안
-- ROAS는 절대 언급하지 말 것 (B2B 계정 특성상 해당 없음)
-- "분석했습니다" 같은 무의미한 마무리 금지
-"""
         try:
             response = self.client.models.generate_content(
                 model=self.model_name,
@@ -121,7 +289,8 @@ class GeminiService:
             if not text or not text.strip():
                 logger.warning("Gemini returned empty response")
                 return "성과 데이터를 분석했습니다."
-            return text.strip()
+            text = _store_completion(cache_key, text.strip())
+            return text
         except Exception as e:
             logger.error(f"Gemini API error [{type(e).__name__}]: {e}", exc_info=True)
             return "성과 데이터를 분석했습니다."
@@ -155,33 +324,17 @@ class GeminiService:
                 + "\n".join(rows) + "\n"
             )
 
-        prompt = f"""당신은 10년 경력의 SEO 전문가입니다.
-아래 Google Search Console 주간 성과를 분석하여 담당자가 바로 실무에 활용할 수 있는 한국어 코멘트를 작성하세요.
-
-[이번 주 성과]
-- 클릭수: {metrics.get('clicks', 0):,}회
-- 노출수: {metrics.get('impressions', 0):,}회
-- CTR: {metrics.get('ctr', 0):.1f}%
-- 평균 순위: {metrics.get('position', 0):.1f}위
-
-[인기 검색어 Top 5]
-| 검색어 | 클릭 | 노출 | CTR | 순위 |
-|--------|------|------|-----|------|
-{queries_text}
-{trend_section}
-[지표 해석 기준]
-- CTR 상승 = 검색 결과에서 클릭 유도력 개선 (긍정)
-- 평균 순위 하락(숫자 감소) = SEO 순위 개선 (긍정)
-- 노출 증가 + 클릭 감소 = 메타 설명·제목 최적화 필요
-- 평균 순위 10 이하 = 1페이지 노출 중 (중요)
+        prompt = _GSC_INSIGHT_PROMPT.format_map({
+            **_GSC_INSIGHT_DEFAULTS,
+            **metrics,
+            "queries_text": queries_text,
+            "trend_section": trend_section,
+        })
+        cache_key = _prompt_key(self.model_name, prompt)
+        cached = _cached_completion(cache_key)
+        if cached is not None:
+            return cached
 
-[작성 규칙]
-- 정확히 3문장으로 작성
-- 첫 문장: 이번 주 전체 SEO 성과를 수치와 함께 한 줄로 평가 (긍정/부정 방향 명확히)
-- 둘째 문장: 가장 주목할 지표 또는 인기 검색어 변화와 그 의미를 수치 포함하여 설명
-- 셋째 문장: 4주 트렌드 흐름을 바탕으로 다음 주 집중해야 할 구체적인 SEO 액션 1가지 제안
-- "분석했습니다" 같은 무의미한 마무리 금지
-"""
         try:
             response = self.client.models.generate_content(
                 model=self.model_name,
@@ -191,24 +344,81 @@ class GeminiService:
             if not text or not text.strip():
                 logger.warning("Gemini returned empty GSC response")
                 return "SEO 데이터를 분석했습니다."
-            return text.strip()
+            text = _store_completion(cache_key, text.strip())
+            return text
         except Exception as e:
             logger.error(f"Gemini GSC insight error [{type(e).__name__}]: {e}", exc_info=True)
             return "SEO 데이터를 분석했습니다."
 
     async def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
-        """Generate general text response using Gemini."""
-        if not self.rate_limiter.can_proceed():
+        """Generate general text response using Gemini.
+
+        Low-temperature prompts (<= CACHEABLE_TEMPERATURE) are answered from
+        the completion cache when the same prompt was seen recently.
+        """
+        cache_key = None
+        if temperature <= CACHEABLE_TEMPERATURE:
+            cache_key = _prompt_key(self.model_name, prompt)
+            cached = _cached_completion(cache_key)
+            if cached is not None:
+                return cached
+
+        if not await self.rate_limiter.acquire(max_wait=RATE_LIMIT_MAX_WAIT):
             logger.warning("Rate limit exceeded for Gemini API")
-            return "죄송합니다. 잠시 후 다시 시도해주세요."
+            return RATE_LIMITED_MESSAGE
 
         try:
-            self.rate_limiter.add_request()
-            response = self.client.models.generate_content(
+            response = await run_io(
+                self.client.models.generate_content,
                 model=self.model_name,
-                contents=prompt
+                contents=prompt,
+                config=types.GenerateContentConfig(temperature=temperature)
             )
+            if cache_key is not None and response.text:
+                _store_completion(cache_key, response.text)
             return response.text
         except Exception as e:
             logger.error(f"Gemini API error: {e}")
-            return "응답을 생성하는 중 오류가 발생했습니다."
+            return GENERATION_ERROR_MESSAGE
+
+    async def generate_text_stream(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Generate general text response, yielding chunks as Gemini produces them.
+
+        A failure before any text yields GENERATION_ERROR_MESSAGE; a failure
+        after partial output raises GeminiError, so the truncated text is never
+        mistaken for a complete answer. Low-temperature prompts share
+        generate_text's completion cache; a cached answer is yielded whole.
+        """
+        cache_key = None
+        if temperature <= CACHEABLE_TEMPERATURE:
+            cache_key = _prompt_key(self.model_name, prompt)
+            cached = _cached_completion(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        if not await self.rate_limiter.acquire(max_wait=RATE_LIMIT_MAX_WAIT):
+            logger.warning("Rate limit exceeded for Gemini API")
+            yield RATE_LIMITED_MESSAGE
+            return
+
+        chunks = []
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config=types.GenerateContentConfig(temperature=temperature)
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Gemini streaming error: {e}")
+            if chunks:
+                raise GeminiError(str(e)) from e
+            yield GENERATION_ERROR_MESSAGE
+            return
+
+        if cache_key is not None and chunks:
+            _store_completion(cache_key, "".join(chunks))
@@ -1,14 +1,252 @@
 """Google Ads API service - REST API implementation."""
 
+import asyncio
+import functools
+import itertools
+import re
 import requests
 from datetime import date
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ijson
+import orjson
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
+from app.core.executor import run_io
 
 logger = logging.getLogger(__name__)
 
 
+FANOUT_WORKERS = 8
+
+
+# Operations per mutate request; the API rejects requests above 10,000
+MUTATE_MAX_OPERATIONS = 5000
+
+# Statuses Google returns for throttling (429) and transient backend errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _build_http_session(retry: Retry, pool_maxsize: int) -> requests.Session:
+    """Pooled HTTPS session shared by every GoogleAdsService instance.
+
+    Services are created per request, so the pool lives at module level to
+    keep TLS connections to googleads/oauth2 warm between calls. urllib3
+    discards connections returned to a full pool, so an undersized pool
+    pays a fresh TCP+TLS handshake on every burst of parallel queries.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+# Read-only calls (searchStream, keyword ideas, token refresh): retried on
+# throttling and 5xx with exponential backoff, honouring Retry-After. The
+# pool covers every thread that can query at once (I/O executor + fan-out).
+_http = _build_http_session(
+    Retry(
+        total=5,
+        connect=3,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    ),
+    pool_maxsize=settings.io_max_workers + FANOUT_WORKERS
+)
+
+# Mutates are not idempotent: a 5xx may have been applied, so only
+# connection failures and 429 (rejected before processing) are retried.
+_mutate_http = _build_http_session(
+    Retry(
+        total=3,
+        connect=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=frozenset({429}),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    ),
+    pool_maxsize=4
+)
+
+# Fan-out pool for independent Ads queries issued from one sync call. Kept
+# apart from app.core.executor so a caller already running on that pool
+# never waits on work queued behind itself.
+_FANOUT_THREAD_PREFIX = "gads-fanout"
+_fanout = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix=_FANOUT_THREAD_PREFIX)
+
+# Campaign IDs per GAQL IN (...) filter
+CAMPAIGN_ID_CHUNK = 50
+
+# Account and campaign lists change on a scale of hours; entries are also
+# dropped when the tenant's GoogleAdsAccount row changes (see tenant_cache)
+ACCOUNT_LIST_TTL = 3600
+
+# (login_customer_id, refresh_token) -> list_accessible_accounts result
+_accessible_accounts_cache: TTLCache = TTLCache(maxsize=512, ttl=ACCOUNT_LIST_TTL)
+
+# (customer_id, login_customer_id, refresh_token) -> list_campaigns result
+_campaigns_cache: TTLCache = TTLCache(maxsize=512, ttl=ACCOUNT_LIST_TTL)
+
+# Keyword Planner volumes/bids are monthly averages, so an hour-old result is
+# as good as a fresh one. This is the only keyword ideas cache.
+KEYWORD_IDEAS_TTL = 3600
+
+# (canonical seeds, language_id, geo_target_id, limit) -> keyword ideas. Planner
+# results don't depend on the calling account, so tenants share entries.
+_ideas_cache: TTLCache = TTLCache(maxsize=1024, ttl=KEYWORD_IDEAS_TTL)
+
+_CLIENT_ACCOUNTS_QUERY = """
+    SELECT
+        customer_client.id,
+        customer_client.descriptive_name,
+        customer_client.currency_code,
+        customer_client.time_zone
+    FROM customer_client
+    WHERE customer_client.manager = FALSE
+"""
+
+_OWN_ACCOUNT_QUERY = """
+    SELECT
+        customer.id,
+        customer.descriptive_name,
+        customer.currency_code,
+        customer.time_zone
+    FROM customer
+"""
+
+_CAMPAIGNS_QUERY = """
+    SELECT
+        campaign.id,
+        campaign.name,
+        campaign.status
+    FROM campaign
+    WHERE campaign.status IN ('ENABLED', 'PAUSED')
+"""
+
+# segments.date only filters (it is not selected), so the API returns
+# metrics already summed over the range. FROM customer sums across
+# campaigns too and comes back as a single row.
+_ACCOUNT_METRICS_QUERY = """
+    SELECT
+        metrics.cost_micros,
+        metrics.conversions,
+        metrics.conversions_value,
+        metrics.clicks,
+        metrics.impressions
+    FROM customer
+    WHERE segments.date BETWEEN '{date_from}' AND '{date_to}'
+"""
+
+_CAMPAIGN_METRICS_QUERY = """
+    SELECT
+        metrics.cost_micros,
+        metrics.conversions,
+        metrics.conversions_value,
+        metrics.clicks,
+        metrics.impressions
+    FROM campaign
+    WHERE segments.date BETWEEN '{date_from}' AND '{date_to}'
+        AND campaign.id IN ({campaign_ids})
+"""
+
+_SEARCH_TERMS_QUERY = """
+    SELECT
+        search_term_view.search_term,
+        campaign.id,
+        campaign.name,
+        metrics.cost_micros,
+        metrics.clicks,
+        metrics.conversions
+    FROM search_term_view
+    WHERE segments.date BETWEEN '{date_from}' AND '{date_to}'
+        AND metrics.cost_micros >= {min_cost_micros}
+"""
+# Field order of the tuples returned by get_search_terms(return_dicts=False)
+SEARCH_TERM_FIELDS = ("search_term", "campaign_id", "campaign_name", "cost", "clicks", "conversions")
+
+_SEARCH_TERMS_MIN_CLICKS = "    AND metrics.clicks >= {min_clicks}\n"
+_SEARCH_TERMS_NO_CONVERSIONS = "    AND metrics.conversions = 0\n"
+_SEARCH_TERMS_TOP_N = "ORDER BY metrics.cost_micros DESC\nLIMIT {limit}\n"
+
+_NON_DIGITS_SUB = re.compile(r"[^0-9]").sub
+_NUMERIC_ID_RE = re.compile(r"\d+")
+
+
+@functools.lru_cache(maxsize=1024)
+def _clean_id(value: str) -> str:
+    """Strip a customer ID down to its digits ("123-456-7890" -> "1234567890").
+
+    The result is the only form interpolated into URLs and GAQL.
+    """
+    return _NON_DIGITS_SUB("", value)
+
+
+def _validate_campaign_ids(campaign_ids: List[str]) -> None:
+    """Reject campaign IDs that are not plain digits before they reach GAQL."""
+    for campaign_id in campaign_ids:
+        if not _NUMERIC_ID_RE.fullmatch(str(campaign_id)):
+            raise ValueError(f"Invalid campaign ID: {campaign_id!r}")
+
+
+def _gaql_date(value: date) -> str:
+    """Format a date as the YYYY-MM-DD literal GAQL expects.
+
+    date.isoformat is called unbound so datetimes (which callers also
+    pass) drop their time part, and it skips strftime's format parsing.
+    """
+    return date.isoformat(value)
+
+
+# The REST API omits zero-valued metrics from a row, so rows are merged
+# over these defaults once and then read with plain indexing.
+_METRIC_DEFAULTS = {
+    "costMicros": 0,
+    "conversions": 0,
+    "conversionsValue": 0,
+    "clicks": 0,
+    "impressions": 0,
+}
+_EMPTY: Dict = {}
+
+
+def invalidate_customer(customer_id: str) -> None:
+    """Drop cached campaign lists for a customer."""
+    customer_id_clean = _clean_id(customer_id)
+    for key in [k for k in list(_campaigns_cache) if k[0] == customer_id_clean]:
+        _campaigns_cache.pop(key, None)
+
+
+# Refresh access tokens this many seconds before they expire
+TOKEN_REFRESH_SKEW = 120
+
+# (client_id, refresh_token) -> (access_token, expiry). Shared process-wide
+# for the same reason as _http; one lock per credential pair lets a single
+# thread refresh while the others wait for its result.
+_token_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+_refresh_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_refresh_locks_guard = threading.Lock()
+
+
+def _refresh_lock_for(key: Tuple[str, str]) -> threading.Lock:
+    with _refresh_locks_guard:
+        lock = _refresh_locks.get(key)
+        if lock is None:
+            lock = _refresh_locks[key] = threading.Lock()
+        return lock
+
+
 class GoogleAdsService:
     """Service for Google Ads API integration using REST API."""
 
@@ -16,17 +254,14 @@ class GoogleAdsService:
     API_VERSION = "v21"
     BASE_URL = f"https://googleads.googleapis.com/{API_VERSION}"
 
-    # Access token 캐시
-    _access_token: Optional[str] = None
-    _token_expiry: float = 0
-
     def __init__(
         self,
         developer_token: str,
         client_id: str,
         client_secret: str,
         refresh_token: str,
-        login_customer_id: str = None
+        login_customer_id: str = None,
+        refresh_skew: int = TOKEN_REFRESH_SKEW
     ):
         """Initialize Google Ads service with OAuth credentials.
 
@@ -36,12 +271,24 @@ class GoogleAdsService:
             client_secret: OAuth Client Secret
             refresh_token: OAuth Refresh Token
             login_customer_id: Manager account ID (optional)
+            refresh_skew: Seconds before expiry at which the access token is refreshed
         """
         self.developer_token = developer_token
         self.client_id = client_id
         self.client_secret = client_secret
         self.refresh_token = refresh_token
         self.login_customer_id = login_customer_id
+        self._login_customer_id_clean = _clean_id(str(login_customer_id)) if login_customer_id else None
+        self.refresh_skew = refresh_skew
+
+        # Access token 캐시 (인스턴스 + 프로세스 공유)
+        self._access_token: Optional[str] = None
+        self._token_expiry: float = 0.0
+        self._token_key = (client_id, refresh_token)
+
+        # Request headers, rebuilt only when the access token changes
+        self._headers: Optional[Dict[str, str]] = None
+        self._headers_token: Optional[str] = None
 
     def _get_access_token(self) -> str:
         """Get access token (cached or refresh).
@@ -50,42 +297,63 @@ class GoogleAdsService:
             Access token string
         """
         # 캐시된 토큰이 유효하면 재사용
-        if self._access_token and time.time() < self._token_expiry - 60:
+        if self._access_token and time.time() < self._token_expiry - self.refresh_skew:
+            return self._access_token
+        if self._use_shared_token():
             return self._access_token
 
-        logger.info("Refreshing access token")
+        with _refresh_lock_for(self._token_key):
+            # Another thread may have refreshed while we waited for the lock
+            if self._use_shared_token():
+                return self._access_token
 
-        token_url = "https://oauth2.googleapis.com/token"
-        payload = {
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "refresh_token": self.refresh_token,
-            "grant_type": "refresh_token",
-        }
+            logger.info("Refreshing access token")
 
-        try:
-            response = requests.post(token_url, data=payload, timeout=10)
-            response.raise_for_status()
+            token_url = "https://oauth2.googleapis.com/token"
+            payload = {
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": self.refresh_token,
+                "grant_type": "refresh_token",
+            }
 
-            token_data = response.json()
-            self._access_token = token_data["access_token"]
-            expires_in = token_data.get("expires_in", 3600)
-            self._token_expiry = time.time() + expires_in
+            try:
+                response = _http.post(token_url, data=payload, timeout=10)
+                response.raise_for_status()
 
-            logger.info("Access token refreshed successfully")
-            return self._access_token
+                token_data = response.json()
+                self._access_token = token_data["access_token"]
+                expires_in = token_data.get("expires_in", 3600)
+                self._token_expiry = time.time() + expires_in
+                _token_cache[self._token_key] = (self._access_token, self._token_expiry)
 
-        except Exception as e:
-            logger.error(f"Failed to refresh access token: {e}")
-            raise
+                logger.info("Access token refreshed successfully")
+                return self._access_token
+
+            except Exception as e:
+                logger.error("Failed to refresh access token: %s", e)
+                raise
+
+    def _use_shared_token(self) -> bool:
+        """Adopt a still-valid token another instance cached for these credentials."""
+        cached = _token_cache.get(self._token_key)
+        if cached is None or time.time() >= cached[1] - self.refresh_skew:
+            return False
+        self._access_token, self._token_expiry = cached
+        return True
 
     def _build_headers(self) -> Dict[str, str]:
         """Build headers for Google Ads API requests.
 
+        The dict is reused until the access token changes; callers must not
+        mutate it.
+
         Returns:
             Headers dictionary
         """
         access_token = self._get_access_token()
+        if self._headers is not None and access_token == self._headers_token:
+            return self._headers
 
         headers = {
             "Authorization": f"Bearer {access_token}",
@@ -94,57 +362,80 @@ class GoogleAdsService:
         }
 
         # Manager account로 접근하는 경우
-        if self.login_customer_id:
-            headers["login-customer-id"] = str(self.login_customer_id).replace("-", "")
+        if self._login_customer_id_clean:
+            headers["login-customer-id"] = self._login_customer_id_clean
 
+        self._headers, self._headers_token = headers, access_token
         return headers
 
     def _call_search_stream(
         self,
         customer_id: str,
         query: str
-    ) -> List[Dict]:
+    ) -> Iterator[Dict]:
         """Call Google Ads searchStream API.
 
+        The response body is parsed incrementally as it arrives, yielding
+        each result row of every streamed chunk; the full JSON document is
+        never held in memory. Consume the iterator to perform the request.
+
         Args:
             customer_id: Google Ads customer ID
             query: GAQL query string
 
-        Returns:
-            List of result rows
+        Yields:
+            Result rows
         """
-        customer_id_clean = customer_id.replace("-", "")
+        customer_id_clean = _clean_id(customer_id)
         endpoint = f"{self.BASE_URL}/customers/{customer_id_clean}/googleAds:searchStream"
 
         headers = self._build_headers()
         payload = {"query": query}
 
         try:
-            logger.debug(f"Calling searchStream for customer {customer_id_clean}")
-            logger.debug(f"Query: {query.strip()}")
+            logger.debug("Calling searchStream for customer %s", customer_id_clean)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Query: %s", query.strip())
 
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
+            with _http.post(endpoint, headers=headers, data=orjson.dumps(payload), timeout=30, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error("API error (%s): %s", response.status_code, response.text)
+                    response.raise_for_status()
 
-            if response.status_code != 200:
-                logger.error(f"API error ({response.status_code}): {response.text}")
-                response.raise_for_status()
+                # searchStream returns an array of chunks, each with a results array
+                response.raw.decode_content = True
+                count = 0
+                for row in ijson.items(response.raw, "item.results.item", use_float=True):
+                    count += 1
+                    yield row
 
-            # searchStream returns array of chunks
-            data = response.json()
-            results = []
-
-            if isinstance(data, list):
-                for chunk in data:
-                    chunk_results = chunk.get("results", [])
-                    results.extend(chunk_results)
-
-            logger.debug(f"Received {len(results)} results")
-            return results
+            logger.debug("Received %s results", count)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to call searchStream: {e}")
+            logger.error("Failed to call searchStream: %s", e)
             raise
 
+    def _search_all(self, customer_id: str, query: str) -> List[Dict]:
+        """Run a searchStream query to completion (for use on worker threads)."""
+        return list(self._call_search_stream(customer_id, query))
+
+    def _search_many(self, customer_id: str, queries: List[str]) -> Iterator[Dict]:
+        """Stream the rows of several queries, fanning out when there are many.
+
+        A single query streams directly. Several run on the fan-out pool,
+        unless the caller is already one of its workers; nesting
+        submissions there could leave every worker waiting on queued work.
+        """
+        if len(queries) == 1:
+            return self._call_search_stream(customer_id, queries[0])
+        if threading.current_thread().name.startswith(_FANOUT_THREAD_PREFIX):
+            return itertools.chain.from_iterable(
+                self._call_search_stream(customer_id, query) for query in queries
+            )
+        return itertools.chain.from_iterable(
+            _fanout.map(lambda query: self._search_all(customer_id, query), queries)
+        )
+
     def get_performance_metrics(
         self,
         customer_id: str,
@@ -163,49 +454,52 @@ class GoogleAdsService:
         Returns:
             Dict with aggregated metrics
         """
-        logger.info(f"Fetching metrics for {customer_id} from {date_from} to {date_to}")
+        logger.info("Fetching metrics for %s from %s to %s", customer_id, date_from, date_to)
         if campaign_ids:
-            logger.info(f"Filtering by {len(campaign_ids)} campaigns: {campaign_ids}")
+            logger.info("Filtering by %s campaigns: %s", len(campaign_ids), campaign_ids)
+            _validate_campaign_ids(campaign_ids)
 
         try:
-            # GAQL query for campaign metrics
-            query = f"""
-                SELECT
-                    metrics.cost_micros,
-                    metrics.conversions,
-                    metrics.conversions_value,
-                    metrics.clicks,
-                    metrics.impressions
-                FROM campaign
-                WHERE segments.date BETWEEN '{date_from.strftime('%Y-%m-%d')}'
-                    AND '{date_to.strftime('%Y-%m-%d')}'
-            """
-
-            # Add campaign filter if campaign_ids provided
+            date_range = {
+                "date_from": _gaql_date(date_from),
+                "date_to": _gaql_date(date_to),
+            }
             if campaign_ids:
-                campaign_id_list = ', '.join(campaign_ids)
-                query += f" AND campaign.id IN ({campaign_id_list})"
+                # Long IN lists are split so each query stays well inside
+                # GAQL size limits; the chunks run concurrently
+                queries = [
+                    _CAMPAIGN_METRICS_QUERY.format(
+                        campaign_ids=', '.join(campaign_ids[i:i + CAMPAIGN_ID_CHUNK]), **date_range
+                    )
+                    for i in range(0, len(campaign_ids), CAMPAIGN_ID_CHUNK)
+                ]
+            else:
+                queries = [_ACCOUNT_METRICS_QUERY.format(**date_range)]
 
-            # Execute search request
-            results = self._call_search_stream(customer_id, query)
+            # Execute search request(s)
+            results = self._search_many(customer_id, queries)
 
-            # Aggregate metrics
+            # Aggregate metrics. Fractional conversions are summed as integer
+            # micros and converted once, so the totals don't drift with row count.
             total_cost_micros = 0
-            total_conversions = 0.0
-            total_conversion_value = 0.0
+            total_conversions_micros = 0
+            total_conversion_value_micros = 0
             total_clicks = 0
             total_impressions = 0
 
+            _int, _float, _round, defaults = int, float, round, _METRIC_DEFAULTS
             for row in results:
-                metrics = row.get("metrics", {})
-                total_cost_micros += int(metrics.get("costMicros", 0))
-                total_conversions += float(metrics.get("conversions", 0))
-                total_conversion_value += float(metrics.get("conversionsValue", 0))
-                total_clicks += int(metrics.get("clicks", 0))
-                total_impressions += int(metrics.get("impressions", 0))
-
-            # Convert micros to actual currency
+                metrics = {**defaults, **(row.get("metrics") or _EMPTY)}
+                total_cost_micros += _int(metrics["costMicros"])
+                total_conversions_micros += _round(_float(metrics["conversions"]) * 1_000_000)
+                total_conversion_value_micros += _round(_float(metrics["conversionsValue"]) * 1_000_000)
+                total_clicks += _int(metrics["clicks"])
+                total_impressions += _int(metrics["impressions"])
+
+            # Convert micros to actual units
             cost = total_cost_micros / 1_000_000
+            total_conversions = total_conversions_micros / 1_000_000
+            total_conversion_value = total_conversion_value_micros / 1_000_000
 
             # Calculate derived metrics (avoid division by zero)
             cpc = (cost / total_clicks) if total_clicks > 0 else 0.0
@@ -222,9 +516,113 @@ class GoogleAdsService:
             }
 
         except Exception as e:
-            logger.error(f"Failed to fetch performance metrics: {e}")
+            logger.error("Failed to fetch performance metrics: %s", e)
             raise
 
+    def get_performance_metrics_many(
+        self,
+        customer_id: str,
+        periods: List[Tuple[date, date]],
+        campaign_ids: List[str] = None
+    ) -> List[Dict]:
+        """Fetch performance metrics for several date ranges concurrently.
+
+        Synchronous counterpart of get_performance_metrics_batch for callers
+        already running on a worker thread (Celery tasks, report generation).
+
+        Args:
+            customer_id: Google Ads customer ID
+            periods: List of (date_from, date_to) tuples
+            campaign_ids: Optional list of campaign IDs to filter by
+
+        Returns:
+            List of metric dicts in the same order as periods
+        """
+        return list(_fanout.map(
+            lambda period: self.get_performance_metrics(
+                customer_id, period[0], period[1], campaign_ids
+            ),
+            periods
+        ))
+
+    def get_metrics_for_customers(
+        self,
+        customer_ids: List[str],
+        date_from: date,
+        date_to: date
+    ) -> Dict[str, Dict]:
+        """Fetch performance metrics for several accounts concurrently.
+
+        Runs on the fan-out pool, whose worker count bounds the number of
+        in-flight Ads queries. An account that fails is reported as an
+        error entry instead of failing the whole batch.
+
+        Args:
+            customer_ids: Google Ads customer IDs
+            date_from: Start date
+            date_to: End date
+
+        Returns:
+            Dict mapping customer_id to its metrics dict
+        """
+        futures = {
+            customer_id: _fanout.submit(self.get_performance_metrics, customer_id, date_from, date_to)
+            for customer_id in customer_ids
+        }
+        results = {}
+        for customer_id, future in futures.items():
+            try:
+                results[customer_id] = future.result()
+            except Exception as e:
+                logger.warning("Metrics fetch failed for customer %s: %s", customer_id, e)
+                results[customer_id] = {"status": "error", "message": str(e)}
+        return results
+
+    async def gather_metrics(
+        self,
+        customer_ids: List[str],
+        date_from: date,
+        date_to: date
+    ) -> Dict[str, Dict]:
+        """Async form of get_metrics_for_customers.
+
+        The fan-out itself runs on the Ads fan-out pool; only the waiting
+        happens on the shared I/O executor, so the event loop never blocks.
+
+        Args:
+            customer_ids: Google Ads customer IDs
+            date_from: Start date
+            date_to: End date
+
+        Returns:
+            Dict mapping customer_id to its metrics dict
+        """
+        return await run_io(self.get_metrics_for_customers, customer_ids, date_from, date_to)
+
+    async def get_performance_metrics_batch(
+        self,
+        customer_id: str,
+        periods: List[Tuple[date, date]],
+        campaign_ids: List[str] = None
+    ) -> List[Dict]:
+        """Async fan-out of get_performance_metrics over several date ranges.
+
+        Each period is one searchStream round-trip; running them together
+        makes a current + previous comparison cost one round-trip of latency.
+
+        Args:
+            customer_id: Google Ads customer ID
+            periods: List of (date_from, date_to) tuples
+            campaign_ids: Optional list of campaign IDs to filter by
+
+        Returns:
+            List of metric dicts in the same order as periods
+        """
+        return list(await asyncio.gather(*(
+            run_io(self.get_performance_metrics, customer_id, date_from, date_to, campaign_ids)
+            for date_from, date_to in periods
+        )))
+
     async def get_campaign_metrics(
         self,
         customer_id: str,
@@ -247,8 +645,11 @@ class GoogleAdsService:
             metrics = ["cost", "impressions", "clicks", "conversions", "ctr"]
 
         try:
-            # Call sync method (get_performance_metrics is synchronous)
-            result = self.get_performance_metrics(customer_id, date_from, date_to)
+            # get_performance_metrics is synchronous; run it in a worker thread
+            # so concurrent handlers can overlap their Ads API round-trips
+            result = await run_io(
+                self.get_performance_metrics, customer_id, date_from, date_to
+            )
 
             # Add CTR calculation
             impressions = result.get("impressions", 0)
@@ -258,7 +659,7 @@ class GoogleAdsService:
             return result
 
         except Exception as e:
-            logger.error(f"Failed to fetch campaign metrics: {e}")
+            logger.error("Failed to fetch campaign metrics: %s", e)
             raise
 
     def get_search_terms(
@@ -266,67 +667,89 @@ class GoogleAdsService:
         customer_id: str,
         date_from: date,
         date_to: date,
-        min_cost: float = 0
-    ) -> List[Dict]:
+        min_cost: float = 0,
+        min_clicks: int = 0,
+        without_conversions: bool = False,
+        limit: Optional[int] = None,
+        return_dicts: bool = True
+    ) -> List:
         """Get search terms with performance data.
 
+        All filters are applied in the GAQL query, so rows that would be
+        discarded never cross the wire.
+
         Args:
             customer_id: Google Ads customer ID
             date_from: Start date
             date_to: End date
             min_cost: Minimum cost filter (in currency units)
+            min_clicks: Minimum clicks filter
+            without_conversions: Only return search terms with zero conversions
+            limit: Return only the top N search terms by cost
+            return_dicts: When False, return plain tuples ordered as
+                SEARCH_TERM_FIELDS, which are cheaper to build for large reports
 
         Returns:
-            List of search term dicts
+            List of search term dicts (or tuples, see return_dicts)
         """
-        logger.info(f"Fetching search terms for {customer_id} from {date_from} to {date_to}")
+        logger.info("Fetching search terms for %s from %s to %s", customer_id, date_from, date_to)
 
         try:
-            # GAQL query for search term report
-            query = f"""
-                SELECT
-                    search_term_view.search_term,
-                    campaign.id,
-                    campaign.name,
-                    metrics.cost_micros,
-                    metrics.clicks,
-                    metrics.conversions
-                FROM search_term_view
-                WHERE segments.date BETWEEN '{date_from.strftime('%Y-%m-%d')}'
-                    AND '{date_to.strftime('%Y-%m-%d')}'
-                    AND metrics.cost_micros >= {int(min_cost * 1_000_000)}
-            """
+            query = _SEARCH_TERMS_QUERY.format(
+                date_from=_gaql_date(date_from),
+                date_to=_gaql_date(date_to),
+                min_cost_micros=int(min_cost * 1_000_000)
+            )
+            if min_clicks:
+                query += _SEARCH_TERMS_MIN_CLICKS.format(min_clicks=int(min_clicks))
+            if without_conversions:
+                query += _SEARCH_TERMS_NO_CONVERSIONS
+            if limit:
+                query += _SEARCH_TERMS_TOP_N.format(limit=int(limit))
 
             # Execute search request
             results = self._call_search_stream(customer_id, query)
 
-            # Build result list
+            # Build result list. searchTermView and campaign.id are always
+            # present for this query shape; metrics may be omitted when zero.
             search_terms = []
+            append = search_terms.append
+            _int, _float, _str, defaults = int, float, str, _METRIC_DEFAULTS
             for row in results:
-                search_term_view = row.get("searchTermView", {})
-                campaign = row.get("campaign", {})
-                metrics = row.get("metrics", {})
-
-                search_terms.append({
-                    "search_term": search_term_view.get("searchTerm", ""),
-                    "campaign_id": str(campaign.get("id", "")),
-                    "campaign_name": campaign.get("name", ""),
-                    "cost": int(metrics.get("costMicros", 0)) / 1_000_000,
-                    "clicks": int(metrics.get("clicks", 0)),
-                    "conversions": float(metrics.get("conversions", 0))
-                })
+                campaign = row["campaign"]
+                metrics = {**defaults, **(row.get("metrics") or _EMPTY)}
+                search_term = row["searchTermView"]["searchTerm"]
+                campaign_id = _str(campaign["id"])
+                campaign_name = campaign.get("name", "")
+                cost = _int(metrics["costMicros"]) / 1_000_000
+                clicks = _int(metrics["clicks"])
+                conversions = _float(metrics["conversions"])
+                if return_dicts:
+                    append({
+                        "search_term": search_term,
+                        "campaign_id": campaign_id,
+                        "campaign_name": campaign_name,
+                        "cost": cost,
+                        "clicks": clicks,
+                        "conversions": conversions
+                    })
+                else:
+                    append((search_term, campaign_id, campaign_name, cost, clicks, conversions))
 
-            logger.info(f"Found {len(search_terms)} search terms")
+            logger.info("Found %s search terms", len(search_terms))
             return search_terms
 
         except Exception as e:
-            logger.error(f"Failed to fetch search terms: {e}")
+            logger.error("Failed to fetch search terms: %s", e)
             raise
 
     def list_accessible_accounts(self) -> List[Dict]:
         """List all Google Ads accounts accessible to the authenticated user.
 
-        Handles both single accounts and manager accounts (MCC).
+        Handles both single accounts and manager accounts (MCC). Both lookups
+        are sent at once; the manager (client accounts) result wins when it
+        has rows. Results are cached for ACCOUNT_LIST_TTL (one hour) per login
+        customer and credentials.
 
         Returns:
             List of dicts with customer_id, account_name, currency, timezone
@@ -338,27 +761,26 @@ class GoogleAdsService:
                 logger.error("No login_customer_id set, cannot list accounts")
                 return []
 
-            login_customer_id_clean = str(self.login_customer_id).replace("-", "")
-            logger.info(f"Using login_customer_id: {login_customer_id_clean}")
+            login_customer_id_clean = self._login_customer_id_clean
+            logger.info("Using login_customer_id: %s", login_customer_id_clean)
 
-            accounts = []
+            cache_key = (login_customer_id_clean, self.refresh_token)
+            cached = _accessible_accounts_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+            # Strategy 1 (Manager/MCC client accounts) and strategy 2 (own
+            # account) are independent queries: run them concurrently
+            client_future = _fanout.submit(
+                self._search_all, login_customer_id_clean, _CLIENT_ACCOUNTS_QUERY
+            )
+            own_future = _fanout.submit(
+                self._search_all, login_customer_id_clean, _OWN_ACCOUNT_QUERY
+            )
 
-            # Strategy 1: Try to get client accounts (for Manager/MCC accounts)
+            accounts = []
             try:
-                logger.info("Attempting to list client accounts (Manager account mode)")
-                client_query = """
-                    SELECT
-                        customer_client.id,
-                        customer_client.descriptive_name,
-                        customer_client.currency_code,
-                        customer_client.time_zone
-                    FROM customer_client
-                    WHERE customer_client.manager = FALSE
-                """
-
-                results = self._call_search_stream(login_customer_id_clean, client_query)
-
-                for row in results:
+                for row in client_future.result():
                     customer_client = row.get("customerClient", {})
                     customer_id = str(customer_client.get("id", ""))
                     accounts.append({
@@ -367,54 +789,40 @@ class GoogleAdsService:
                         "currency": customer_client.get("currencyCode", ""),
                         "timezone": customer_client.get("timeZone", "")
                     })
-
-                if accounts:
-                    logger.info(f"Found {len(accounts)} client accounts via Manager account")
-                    return accounts
-                else:
-                    logger.info("No client accounts found, trying single account mode")
-
-            except Exception as e:
-                logger.warning(f"Failed to list client accounts: {e}")
-
-            # Strategy 2: Get own account info (for single advertising accounts)
-            try:
-                logger.info("Attempting to get own account info (single account mode)")
-                own_account_query = """
-                    SELECT
-                        customer.id,
-                        customer.descriptive_name,
-                        customer.currency_code,
-                        customer.time_zone
-                    FROM customer
-                """
-
-                results = self._call_search_stream(login_customer_id_clean, own_account_query)
-
-                for row in results:
-                    customer = row.get("customer", {})
-                    customer_id = str(customer.get("id", ""))
-                    accounts.append({
-                        "customer_id": customer_id,
-                        "account_name": customer.get("descriptiveName") or f"Account {customer_id}",
-                        "currency": customer.get("currencyCode", ""),
-                        "timezone": customer.get("timeZone", "")
-                    })
-
                 if accounts:
-                    logger.info(f"Found own account: {accounts[0]['account_name']}")
-                    return accounts
+                    logger.info("Found %s client accounts via Manager account", len(accounts))
                 else:
-                    logger.warning("No own account found either")
-
+                    logger.info("No client accounts found, using single account mode")
             except Exception as e:
-                logger.warning(f"Failed to get own account info: {e}")
+                logger.warning("Failed to list client accounts: %s", e)
+
+            if not accounts:
+                try:
+                    for row in own_future.result():
+                        customer = row.get("customer", {})
+                        customer_id = str(customer.get("id", ""))
+                        accounts.append({
+                            "customer_id": customer_id,
+                            "account_name": customer.get("descriptiveName") or f"Account {customer_id}",
+                            "currency": customer.get("currencyCode", ""),
+                            "timezone": customer.get("timeZone", "")
+                        })
+                    if accounts:
+                        logger.info("Found own account: %s", accounts[0]['account_name'])
+                    else:
+                        logger.warning("No own account found either")
+                except Exception as e:
+                    logger.warning("Failed to get own account info: %s", e)
+
+            if not accounts:
+                logger.warning("No accessible accounts found for login_customer_id: %s", login_customer_id_clean)
+                return []
 
-            logger.warning(f"No accessible accounts found for login_customer_id: {login_customer_id_clean}")
-            return []
+            _accessible_accounts_cache[cache_key] = tuple(accounts)
+            return accounts
 
         except Exception as e:
-            logger.error(f"Failed to list accessible accounts: {e}", exc_info=True)
+            logger.error("Failed to list accessible accounts: %s", e, exc_info=True)
             return []
 
     def list_campaigns(self, customer_id: str) -> List[Dict]:
@@ -426,20 +834,15 @@ class GoogleAdsService:
         Returns:
             List of dicts with id, name, status (only ENABLED and PAUSED campaigns)
         """
-        logger.info(f"Listing campaigns for customer {customer_id}")
+        logger.info("Listing campaigns for customer %s", customer_id)
 
-        try:
-            # GAQL query to fetch campaign details
-            query = """
-                SELECT
-                    campaign.id,
-                    campaign.name,
-                    campaign.status
-                FROM campaign
-                WHERE campaign.status IN ('ENABLED', 'PAUSED')
-            """
+        cache_key = (_clean_id(customer_id), self._login_customer_id_clean, self.refresh_token)
+        cached = _campaigns_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
 
-            results = self._call_search_stream(customer_id, query)
+        try:
+            results = self._call_search_stream(customer_id, _CAMPAIGNS_QUERY)
 
             campaigns = []
             for row in results:
@@ -450,11 +853,12 @@ class GoogleAdsService:
                     "status": campaign.get("status", "UNKNOWN")
                 })
 
-            logger.info(f"Found {len(campaigns)} campaigns")
+            logger.info("Found %s campaigns", len(campaigns))
+            _campaigns_cache[cache_key] = tuple(campaigns)
             return campaigns
 
         except Exception as e:
-            logger.error(f"Failed to list campaigns: {e}", exc_info=True)
+            logger.error("Failed to list campaigns: %s", e, exc_info=True)
             raise
 
     def generate_keyword_ideas(
@@ -475,9 +879,16 @@ class GoogleAdsService:
             limit: Max number of results to return
 
         Returns:
-            List of keyword idea dicts with metrics
+            List of keyword idea dicts with metrics (cached for KEYWORD_IDEAS_TTL)
         """
-        customer_id_clean = customer_id.replace("-", "")
+        customer_id_clean = _clean_id(customer_id)
+        # Seed order and case don't change Planner results
+        seeds_key = tuple(sorted({seed.strip().casefold() for seed in seed_keywords}))
+        cache_key = (seeds_key, language_id, geo_target_id, limit)
+        cached = _ideas_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         endpoint = f"{self.BASE_URL}/customers/{customer_id_clean}:generateKeywordIdeas"
         headers = self._build_headers()
 
@@ -490,14 +901,14 @@ class GoogleAdsService:
             "pageSize": limit
         }
 
-        logger.info(f"Generating keyword ideas for: {seed_keywords}")
+        logger.info("Generating keyword ideas for: %s", seed_keywords)
         try:
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
+            response = _http.post(endpoint, headers=headers, data=orjson.dumps(payload), timeout=30)
             if response.status_code != 200:
-                logger.error(f"Keyword Planner API error ({response.status_code}): {response.text}")
+                logger.error("Keyword Planner API error (%s): %s", response.status_code, response.text)
                 return []
 
-            results = response.json().get("results", [])
+            results = orjson.loads(response.content).get("results", [])
             ideas = []
             for row in results:
                 m = row.get("keywordIdeaMetrics", {})
@@ -511,11 +922,13 @@ class GoogleAdsService:
                     "low_bid_krw": low_bid,
                     "high_bid_krw": high_bid,
                 })
-            logger.info(f"Returned {len(ideas)} keyword ideas")
+            logger.info("Returned %s keyword ideas", len(ideas))
+            if ideas:
+                _ideas_cache[cache_key] = tuple(ideas)
             return ideas
 
         except Exception as e:
-            logger.error(f"generate_keyword_ideas error: {e}", exc_info=True)
+            logger.error("generate_keyword_ideas error: %s", e, exc_info=True)
             return []
 
     def add_negative_keyword(
@@ -536,42 +949,92 @@ class GoogleAdsService:
         Returns:
             True if successful, False otherwise
         """
-        logger.info(f"Adding negative keyword: {keyword_text} to campaign {campaign_id}")
+        return self.add_negative_keywords(
+            customer_id, [(campaign_id, keyword_text, match_type)]
+        )[0]
 
-        try:
-            customer_id_clean = customer_id.replace("-", "")
-
-            # Build campaign resource name
-            campaign_resource = f"customers/{customer_id_clean}/campaigns/{campaign_id}"
-
-            # Build criterion operation
-            operation = {
-                "create": {
-                    "campaign": campaign_resource,
-                    "negative": True,
-                    "keyword": {
-                        "text": keyword_text,
-                        "matchType": match_type.upper()
-                    }
+    def add_negative_keywords(
+        self,
+        customer_id: str,
+        items: List[Tuple[str, str, str]]
+    ) -> List[bool]:
+        """Add several negative keywords with as few campaignCriteria:mutate calls as possible.
+
+        Operations are sent MUTATE_MAX_OPERATIONS at a time with
+        partialFailure enabled, so one rejected keyword does not roll back
+        the rest of its request.
+
+        Args:
+            customer_id: Google Ads customer ID
+            items: List of (campaign_id, keyword_text, match_type) tuples
+
+        Returns:
+            List of success flags aligned with items
+        """
+        if not items:
+            return []
+
+        logger.info("Adding %s negative keyword(s) for customer %s", len(items), customer_id)
+
+        customer_id_clean = _clean_id(customer_id)
+        outcome: List[bool] = []
+        # Sequential on purpose: parallel mutates on one customer trip
+        # CONCURRENT_MODIFICATION errors
+        for start in range(0, len(items), MUTATE_MAX_OPERATIONS):
+            outcome += self._mutate_negative_keywords(
+                customer_id_clean, items[start:start + MUTATE_MAX_OPERATIONS]
+            )
+
+        logger.info("Added %s/%s negative keyword(s)", sum(outcome), len(items))
+        return outcome
+
+    @staticmethod
+    def _build_negative_criterion_op(
+        customer_id_clean: str,
+        campaign_id: str,
+        keyword_text: str,
+        match_type: str
+    ) -> Dict:
+        """Build one campaign criterion create operation for a negative keyword."""
+        return {
+            "create": {
+                "campaign": f"customers/{customer_id_clean}/campaigns/{campaign_id}",
+                "negative": True,
+                "keyword": {
+                    "text": keyword_text,
+                    "matchType": match_type.upper()
                 }
             }
+        }
+
+    def _mutate_negative_keywords(
+        self,
+        customer_id_clean: str,
+        items: List[Tuple[str, str, str]]
+    ) -> List[bool]:
+        """Send one campaignCriteria:mutate request and return per-item success flags."""
+        try:
+            build_op = self._build_negative_criterion_op
+            operations = [build_op(customer_id_clean, *item) for item in items]
 
             # Call mutate API
             endpoint = f"{self.BASE_URL}/customers/{customer_id_clean}/campaignCriteria:mutate"
             headers = self._build_headers()
-            payload = {"operations": [operation]}
+            payload = {"operations": operations, "partialFailure": True}
 
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
+            response = _mutate_http.post(endpoint, headers=headers, data=orjson.dumps(payload), timeout=30)
 
-            if response.status_code == 200:
-                result = response.json()
-                resource_name = result.get("results", [{}])[0].get("resourceName", "")
-                logger.info(f"Successfully added negative keyword. Resource: {resource_name}")
-                return True
-            else:
-                logger.error(f"Failed to add negative keyword ({response.status_code}): {response.text}")
-                return False
+            if response.status_code != 200:
+                logger.error("Failed to add negative keywords (%s): %s", response.status_code, response.text)
+                return [False] * len(items)
+
+            # Failed operations come back as empty result entries
+            results = orjson.loads(response.content).get("results", [])
+            return [
+                bool(i < len(results) and results[i].get("resourceName"))
+                for i in range(len(items))
+            ]
 
         except Exception as e:
-            logger.error(f"Failed to add negative keyword '{keyword_text}': {e}")
-            return False
+            logger.error("Failed to add negative keywords: %s", e)
+            return [False] * len(items)
@@ -1,8 +1,18 @@
 """Intent recognition service using Gemini AI."""
 
+import copy
+import hashlib
 import json
 import logging
-from typing import Dict, List, Optional
+import re
+from datetime import date
+from typing import Dict, List, Literal, Optional
+
+from cachetools import TTLCache
+import httpx
+from google.genai import errors as genai_errors
+from google.genai import types
+from pydantic import BaseModel
 
 from app.services.gemini_service import GeminiService
 
@@ -16,6 +26,222 @@ KEYWORD_SUGGESTION = "keyword_suggestion"
 QUERY_GSC_DATA = "query_gsc_data"
 GENERAL_CHAT = "general_chat"
 
+# Classification instructions; parse_intent appends the conversation
+# context and the current message after this fixed prefix
+_INTENT_PROMPT_PREFIX = """당신은 SEM-Agent의 의도 분류기입니다. 사용자의 메시지를 분석하여 의도를 파악하고 엔티티를 추출하세요.
+
+SEM-Agent 기능:
+1. generate_report: 광고 성과 리포트 생성 (비용, 전환, ROAS 등)
+2. change_schedule: 리포트 발송 일정 변경
+3. answer_question: 구글 애즈 캠페인 관련 질문 답변 (비용, 클릭, 전환 등)
+4. keyword_suggestion: 키워드 추천 및 최적화
+5. query_gsc_data: 구글 서치 콘솔 데이터 조회 (검색어, 페이지 성과, 노출, 클릭, CTR, 순위)
+6. general_chat: 일반 대화
+
+다음 JSON 형식으로 응답하세요:
+{
+  "intent": "의도 타입 (generate_report|change_schedule|answer_question|keyword_suggestion|query_gsc_data|general_chat)",
+  "entities": {
+    "time_period": "yesterday|last_week|this_week|last_month|this_month|last_7_days|last_30_days",
+    "start_date": "YYYY-MM-DD",
+    "end_date": "YYYY-MM-DD",
+    "metrics": ["clicks", "impressions", "cost", "conversions"],
+    "campaign_names": ["캠페인 이름"],
+    "frequency": "daily|weekly|monthly|disabled",
+    "day": "monday|tuesday|wednesday|thursday|friday|saturday|sunday",
+    "time": "HH:MM",
+    "keywords": ["시드 키워드 리스트"],
+    "gsc_data_type": "queries|pages|overview",
+    "target_url": "특정 페이지 URL (선택)",
+    "limit": 5
+  },
+  "confidence": 0.95
+}
+
+query_gsc_data 사용 기준:
+- "검색어", "서치 콘솔", "오가닉", "자연 검색", "인기 검색어", "검색 순위" 언급 시
+- "페이지 성과", "콘텐츠 클릭", "어떤 글이 많이 읽혀", "인기 페이지" 언급 시
+- gsc_data_type: queries(검색어), pages(페이지/콘텐츠), overview(전체 지표)
+
+규칙:
+- intent는 반드시 5가지 중 하나여야 함
+- 관련 없는 엔티티는 생략
+- confidence는 0.0~1.0 사이
+- "어제", "지난주", "이번달" 같은 기간은 time_period로, 특정 날짜가 언급되면 start_date/end_date로 표시
+- JSON만 출력, 설명 불필요
+"""
+
+
+class IntentEntities(BaseModel):
+    """Entities Gemini may extract, named as ActionRouter's handlers read them.
+
+    Unset fields are dropped from the result.
+    """
+
+    time_period: Optional[Literal[
+        "yesterday", "last_week", "this_week", "last_month", "this_month", "last_7_days", "last_30_days"
+    ]] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    metrics: Optional[List[str]] = None
+    campaign_names: Optional[List[str]] = None
+    frequency: Optional[Literal["daily", "weekly", "monthly", "disabled"]] = None
+    day: Optional[Literal["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]] = None
+    time: Optional[str] = None
+    keywords: Optional[List[str]] = None
+    gsc_data_type: Optional[Literal["queries", "pages", "overview"]] = None
+    target_url: Optional[str] = None
+    limit: Optional[int] = None
+
+
+class IntentSchema(BaseModel):
+    """Response schema for Gemini's structured output mode."""
+
+    intent: Literal[
+        "generate_report",
+        "change_schedule",
+        "answer_question",
+        "keyword_suggestion",
+        "query_gsc_data",
+        "general_chat",
+    ]
+    entities: IntentEntities = IntentEntities()
+    confidence: float
+
+
+# Gemini returns JSON matching IntentSchema, parsed by the SDK
+_INTENT_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=IntentSchema,
+)
+_INTENT_BATCH_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    # builtin list: the SDK's schema transformer rejects typing.List
+    response_schema=list[IntentSchema],
+)
+
+# Appended to _INTENT_PROMPT_PREFIX by parse_intents_batch, followed by the
+# numbered messages
+_INTENT_BATCH_INSTRUCTION = """
+아래 메시지 {count}개를 각각 독립적으로 분류하여, 같은 순서로 {count}개의 객체를 담은 JSON 배열로 응답하세요.
+
+메시지 목록:
+"""
+
+_VALID_INTENTS = frozenset({
+    GENERATE_REPORT,
+    CHANGE_SCHEDULE,
+    ANSWER_QUESTION,
+    KEYWORD_SUGGESTION,
+    QUERY_GSC_DATA,
+    GENERAL_CHAT
+})
+
+# Conversation turns included in the classification prompt
+INTENT_HISTORY_TURNS = 5
+
+# Speaker labels for the history block; anything not from the user is
+# shown as the assistant
+_ROLE_LABELS = {"user": "사용자"}
+_ASSISTANT_LABEL = "어시스턴트"
+
+
+def _history_context(conversation_history: List[Dict]) -> str:
+    """Render the last INTENT_HISTORY_TURNS messages as the prompt's history block."""
+    return "\n대화 이력:\n" + "".join(
+        f"{_ROLE_LABELS.get(msg.get('role'), _ASSISTANT_LABEL)}: {msg.get('content', '')}\n"
+        for msg in conversation_history[-INTENT_HISTORY_TURNS:]
+    )
+
+
+# Successful classifications keyed by _intent_key. The key carries today's
+# date because relative phrases ("어제", "지난주") resolve to dates.
+_intent_cache: TTLCache = TTLCache(maxsize=10_000, ttl=86_400)
+
+
+# Lexical signals per intent for the rule-based prefilter. A message is
+# classified without Gemini only when exactly one intent matches, no
+# question cue is present, and that intent's entities can be read off the
+# message (see _RULE_ENTITIES). Report requests need an explicit generate
+# verb: "리포트" alone also appears in schedule changes and questions.
+_INTENT_SIGNALS = {
+    GENERATE_REPORT: re.compile(r"(?:리포트|보고서).*(?:보여|만들어|뽑아|생성해|작성해)", re.DOTALL),
+    QUERY_GSC_DATA: re.compile(
+        r"서치\s*콘솔|search\s*console|gsc|오가닉|자연\s*검색|인기\s*검색어|검색\s*순위|인기\s*(?:페이지|콘텐츠|글)",
+        re.IGNORECASE
+    ),
+    KEYWORD_SUGGESTION: re.compile(r"키워드\s*(?:추천|아이디어|발굴)"),
+    CHANGE_SCHEDULE: re.compile(
+        r"일정|스케줄|스케쥴|발송|요일|시간|시각|매일|매주|매월|바꿔|바꾸|변경|그만|중단|해지|받고\s*싶지"
+    ),
+}
+# Questions about a report or metric are answer_question, never a rule match
+_QUESTION_RE = re.compile(r"\?|얼마|몇|왜|어땠|어때|였어|였나|인가요?")
+_GSC_PAGES_RE = re.compile(r"페이지|콘텐츠|게시글|게시물|인기\s*글")
+_GSC_QUERIES_RE = re.compile(r"검색어|키워드|쿼리")
+_LIMIT_RE = re.compile(r"top\s*(\d{1,2})|(\d{1,2})\s*(?:개|위)", re.IGNORECASE)
+
+
+def _gsc_entities(message: str) -> Dict:
+    if _GSC_PAGES_RE.search(message):
+        entities = {"gsc_data_type": "pages"}
+    elif _GSC_QUERIES_RE.search(message):
+        entities = {"gsc_data_type": "queries"}
+    else:
+        entities = {"gsc_data_type": "overview"}
+    match = _LIMIT_RE.search(message)
+    if match:
+        entities["limit"] = int(match[1] or match[2])
+    return entities
+
+
+# Intents the prefilter may answer, with their entity extractor. Report
+# generation takes no entities; keyword seeds and schedules need Gemini.
+_RULE_ENTITIES = {
+    GENERATE_REPORT: lambda message: {},
+    QUERY_GSC_DATA: _gsc_entities,
+}
+
+# Confidence reported for prefilter matches
+RULE_CONFIDENCE = 0.9
+
+
+def _rule_based_intent(message: str) -> Optional[Dict]:
+    """Classify unambiguous messages by keyword match; None means ask Gemini."""
+    if _QUESTION_RE.search(message):
+        return None
+    matched = [intent for intent, pattern in _INTENT_SIGNALS.items() if pattern.search(message)]
+    if len(matched) != 1 or matched[0] not in _RULE_ENTITIES:
+        return None
+    intent = matched[0]
+    return {"intent": intent, "entities": _RULE_ENTITIES[intent](message), "confidence": RULE_CONFIDENCE}
+
+
+def _normalize_intent(result: Dict) -> Dict:
+    """Fill in or repair fields of a raw classification in place."""
+    if result.get("intent") not in _VALID_INTENTS:
+        logger.warning("Invalid intent: %s, defaulting to general_chat", result.get("intent"))
+        result["intent"] = GENERAL_CHAT
+
+    # Ensure entities dict exists
+    if "entities" not in result:
+        result["entities"] = {}
+
+    # Ensure confidence is valid
+    if "confidence" not in result or not 0 <= result["confidence"] <= 1:
+        result["confidence"] = 0.5
+    return result
+
+
+def _intent_key(message: str, conversation_history: Optional[List[Dict]]) -> bytes:
+    digest = hashlib.blake2b(date.today().isoformat().encode(), digest_size=16)
+    digest.update(b"\x1f")
+    digest.update(message.strip().lower().encode())
+    for msg in (conversation_history or [])[-INTENT_HISTORY_TURNS:]:
+        digest.update(b"\x1e")
+        digest.update(f"{msg.get('role')}\x1f{msg.get('content', '')}".encode())
+    return digest.digest()
+
 
 class IntentService:
     """Service for natural language intent recognition."""
@@ -31,131 +257,179 @@ class IntentService:
     def parse_intent(
         self,
         message: str,
-        conversation_history: Optional[List[Dict]] = None
+        conversation_history: Optional[List[Dict]] = None,
+        bypass_cache: bool = False
     ) -> Dict:
         """Parse user message to extract intent and entities.
 
+        Standalone messages (no history) with an unambiguous keyword signal
+        are classified locally.
+        Gemini classifications are cached per message, recent history and
+        day; callers get their own copy of the result.
+
         Args:
             message: User's natural language message
             conversation_history: Optional list of previous messages for context
                 Format: [{"role": "user/assistant", "content": "..."}, ...]
+            bypass_cache: Always ask Gemini, ignoring any cached result
 
         Returns:
             Dict with structure:
             {
                 "intent": str,  # One of the intent constants
                 "entities": {
-                    "date_range": {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"},
-                    "metrics": ["cost", "conversions", "roas"],
+                    "time_period": "last_week",  # or start_date/end_date
+                    "start_date": "YYYY-MM-DD",
+                    "end_date": "YYYY-MM-DD",
+                    "metrics": ["cost", "conversions"],
                     "campaign_names": ["캠페인1", "캠페인2"],
-                    "schedule_time": "HH:MM",
-                    "schedule_frequency": "daily|weekly|monthly"
+                    "frequency": "daily|weekly|monthly|disabled",
+                    "day": "monday",
+                    "time": "HH:MM"
                 },
                 "confidence": float  # 0.0 to 1.0
             }
         """
-        try:
-            # Build context from conversation history
-            context = ""
-            if conversation_history:
-                context = "\n대화 이력:\n"
-                for msg in conversation_history[-5:]:  # Last 5 messages
-                    role = "사용자" if msg.get("role") == "user" else "어시스턴트"
-                    context += f"{role}: {msg.get('content', '')}\n"
-
-            # System prompt explaining SEM-Agent capabilities
-            system_prompt = f"""당신은 SEM-Agent의 의도 분류기입니다. 사용자의 메시지를 분석하여 의도를 파악하고 엔티티를 추출하세요.
-
-SEM-Agent 기능:
-1. generate_report: 광고 성과 리포트 생성 (비용, 전환, ROAS 등)
-2. change_schedule: 리포트 발송 일정 변경
-3. answer_question: 구글 애즈 캠페인 관련 질문 답변 (비용, 클릭, 전환 등)
-4. keyword_suggestion: 키워드 추천 및 최적화
-5. query_gsc_data: 구글 서치 콘솔 데이터 조회 (검색어, 페이지 성과, 노출, 클릭, CTR, 순위)
-6. general_chat: 일반 대화
-
-{context}
-
-현재 메시지: {message}
-
-다음 JSON 형식으로 응답하세요:
-{{
-  "intent": "의도 타입 (generate_report|change_schedule|answer_question|keyword_suggestion|query_gsc_data|general_chat)",
-  "entities": {{
-    "date_range": {{"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}},
-    "metrics": ["비용", "전환", "ROAS 등"],
-    "campaign_names": ["캠페인 이름"],
-    "schedule_time": "HH:MM",
-    "schedule_frequency": "daily|weekly|monthly",
-    "keywords": ["시드 키워드 리스트"],
-    "gsc_data_type": "queries|pages|overview",
-    "target_url": "특정 페이지 URL (선택)",
-    "limit": 5
-  }},
-  "confidence": 0.95
-}}
+        # Follow-ups depend on earlier turns, which the rules can't see
+        result = None if conversation_history else _rule_based_intent(message)
+        if result is not None:
+            logger.info("Parsed intent by rule: %s", result["intent"])
+            return result
 
-query_gsc_data 사용 기준:
-- "검색어", "서치 콘솔", "오가닉", "자연 검색", "인기 검색어", "검색 순위" 언급 시
-- "페이지 성과", "콘텐츠 클릭", "어떤 글이 많이 읽혀", "인기 페이지" 언급 시
-- gsc_data_type: queries(검색어), pages(페이지/콘텐츠), overview(전체 지표)
+        cache_key = _intent_key(message, conversation_history)
+        if not bypass_cache:
+            cached = _intent_cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
 
-규칙:
-- intent는 반드시 5가지 중 하나여야 함
-- 관련 없는 엔티티는 생략
-- confidence는 0.0~1.0 사이
-- 날짜는 "어제", "지난주", "이번달" 등을 해석하여 구체적 날짜로 변환
-- JSON만 출력, 설명 불필요"""
-
-            # Generate intent classification
-            response = self.gemini_service.model.generate_content(system_prompt)
-            response_text = response.text.strip()
-
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            # Parse JSON response
-            result = json.loads(response_text)
-
-            # Validate and normalize
-            valid_intents = {
-                GENERATE_REPORT,
-                CHANGE_SCHEDULE,
-                ANSWER_QUESTION,
-                KEYWORD_SUGGESTION,
-                QUERY_GSC_DATA,
-                GENERAL_CHAT
-            }
+        try:
+            # Build context from conversation history
+            context = _history_context(conversation_history) if conversation_history else ""
 
-            if result.get("intent") not in valid_intents:
-                logger.warning(f"Invalid intent: {result.get('intent')}, defaulting to general_chat")
-                result["intent"] = GENERAL_CHAT
+            # Static instructions first, per-call context and message last,
+            # so every request shares the same prompt prefix
+            system_prompt = "".join((_INTENT_PROMPT_PREFIX, context, "\n현재 메시지: ", message))
 
-            # Ensure entities dict exists
-            if "entities" not in result:
-                result["entities"] = {}
+            # Generate intent classification as structured output
+            response = self.gemini_service.client.models.generate_content(
+                model=self.gemini_service.model_name,
+                contents=system_prompt,
+                config=_INTENT_CONFIG
+            )
+            parsed = response.parsed
+            if isinstance(parsed, IntentSchema):
+                result = parsed.model_dump(exclude_none=True)
+            else:
+                # Reply didn't validate against the schema; read the raw JSON
+                # and let the checks below normalize it
+                result = json.loads(response.text)
 
-            # Ensure confidence is valid
-            if "confidence" not in result or not 0 <= result["confidence"] <= 1:
-                result["confidence"] = 0.5
+            # Validate and normalize (safety net for the raw JSON path)
+            _normalize_intent(result)
 
-            logger.info(f"Parsed intent: {result['intent']} with confidence {result['confidence']}")
+            logger.info("Parsed intent: %s with confidence %s", result["intent"], result["confidence"])
+            _intent_cache[cache_key] = copy.deepcopy(result)
             return result
 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Gemini response as JSON: {e}")
+            logger.error("Failed to parse Gemini response as JSON: %s", e)
             return {
                 "intent": GENERAL_CHAT,
                 "entities": {},
                 "confidence": 0.0
             }
         except Exception as e:
-            logger.error(f"Intent parsing error: {e}")
+            logger.error("Intent parsing error: %s", e)
             return {
                 "intent": GENERAL_CHAT,
                 "entities": {},
                 "confidence": 0.0
             }
+
+    def parse_intents_batch(self, messages: List[str]) -> List[Dict]:
+        """Classify several standalone messages with a single Gemini call.
+
+        Rule-matched and cached messages are answered locally; the rest are
+        sent together and the results cached as parse_intent would (no
+        history). If the batch reply is unusable or has the wrong length,
+        the remaining messages go through parse_intent one by one.
+
+        Args:
+            messages: User messages, classified without conversation history
+
+        Returns:
+            One result per message, in order, shaped like parse_intent's
+        """
+        results: List[Optional[Dict]] = [None] * len(messages)
+        # cache key -> positions of that message, so duplicates are sent once
+        pending: Dict[bytes, List[int]] = {}
+        for i, message in enumerate(messages):
+            result = _rule_based_intent(message)
+            if result is not None:
+                results[i] = result
+                continue
+            cache_key = _intent_key(message, None)
+            cached = _intent_cache.get(cache_key)
+            if cached is not None:
+                results[i] = copy.deepcopy(cached)
+            else:
+                pending.setdefault(cache_key, []).append(i)
+
+        if not pending:
+            return results
+
+        batch = [messages[positions[0]] for positions in pending.values()]
+        classified = self._classify_batch(batch)
+        if classified is None:
+            for positions in pending.values():
+                for i in positions:
+                    results[i] = self.parse_intent(messages[i])
+            return results
+
+        for (cache_key, positions), result in zip(pending.items(), classified):
+            _intent_cache[cache_key] = copy.deepcopy(result)
+            for i in positions:
+                results[i] = copy.deepcopy(result)
+        return results
+
+    def _classify_batch(self, messages: List[str]) -> Optional[List[Dict]]:
+        """Ask Gemini for one classification per message; None if unusable."""
+        numbered = "".join(f"{n}. {message}\n" for n, message in enumerate(messages, 1))
+        prompt = "".join((
+            _INTENT_PROMPT_PREFIX,
+            _INTENT_BATCH_INSTRUCTION.format(count=len(messages)),
+            numbered
+        ))
+        try:
+            response = self.gemini_service.client.models.generate_content(
+                model=self.gemini_service.model_name,
+                contents=prompt,
+                config=_INTENT_BATCH_CONFIG
+            )
+            parsed = response.parsed
+            if not isinstance(parsed, list):
+                if not response.text:
+                    # Blocked or empty candidate
+                    logger.warning("Batch intent reply is empty, classifying one by one")
+                    return None
+                parsed = json.loads(response.text)
+        except (genai_errors.APIError, httpx.HTTPError, json.JSONDecodeError) as e:
+            # Request or reply failures only; configuration errors propagate
+            logger.error("Batch intent parsing error: %s", e)
+            return None
+
+        if not isinstance(parsed, list) or len(parsed) != len(messages):
+            logger.warning(
+                "Batch intent reply has %s results for %s messages, classifying one by one",
+                len(parsed) if isinstance(parsed, list) else "no", len(messages)
+            )
+            return None
+        results = []
+        for item in parsed:
+            if isinstance(item, IntentSchema):
+                item = item.model_dump(exclude_none=True)
+            elif not isinstance(item, dict):
+                logger.warning("Batch intent reply has a non-object result, classifying one by one")
+                return None
+            results.append(_normalize_intent(item))
+        return results
@@ -2,11 +2,13 @@
 
 from datetime import datetime, timedelta
 from typing import List, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, joinedload
 import logging
 
-from ..models.keyword import KeywordCandidate, ApprovalRequest, KeywordStatus, ApprovalAction
+from ..models.keyword import KeywordCandidate, ApprovalRequest, KeywordStatus, ApprovalAction, SMALLINT_MAX
 from ..models.google_ads import PerformanceThreshold, GoogleAdsAccount
+from . import tenant_cache
 
 logger = logging.getLogger(__name__)
 
@@ -44,16 +46,29 @@ class KeywordService:
         google_ads_account = self.db.query(GoogleAdsAccount).filter_by(tenant_id=tenant_id).first()
         customer_id = google_ads_account.customer_id if google_ads_account else None
 
+        # Thresholds are pushed into the GAQL query; the check below stays
+        # as a guard on what the API returns
         search_terms = self.google_ads.get_search_terms(
             customer_id=customer_id,
             date_from=start_date,
-            date_to=end_date
+            date_to=end_date,
+            min_cost=min_cost,
+            min_clicks=min_clicks,
+            without_conversions=True
         )
 
         logger.info(f"Retrieved {len(search_terms)} search terms from Google Ads")
 
-        # 4. Filter inefficient keywords and save to database
+        # 4. Filter inefficient keywords. Existing candidates are loaded in one
+        # query and new rows are inserted together at commit time.
+        existing = set(
+            self.db.query(KeywordCandidate.search_term, KeywordCandidate.campaign_id)
+            .filter_by(tenant_id=tenant_id)
+            .all()
+        )
+        new_rows = []
         detected_keywords = []
+        detected_at = datetime.utcnow()
 
         for term in search_terms:
             # Check inefficiency criteria
@@ -61,38 +76,35 @@ class KeywordService:
                 term['clicks'] >= min_clicks and
                 term['conversions'] == 0):
 
-                # 5. Check if keyword already exists
-                exists = self.db.query(KeywordCandidate).filter_by(
-                    tenant_id=tenant_id,
-                    search_term=term['search_term'],
-                    campaign_id=term['campaign_id']
-                ).first()
-
-                if not exists:
-                    # Create new KeywordCandidate record
-                    candidate = KeywordCandidate(
-                        tenant_id=tenant_id,
-                        campaign_id=term['campaign_id'],
-                        campaign_name=term['campaign_name'],
-                        search_term=term['search_term'],
-                        cost=term['cost'],
-                        clicks=term['clicks'],
-                        conversions=0,
-                        detected_at=datetime.utcnow(),
-                        status=KeywordStatus.PENDING
-                    )
-                    self.db.add(candidate)
-
-                    detected_keywords.append({
-                        "search_term": term['search_term'],
-                        "campaign_id": term['campaign_id'],
-                        "campaign_name": term['campaign_name'],
-                        "cost": term['cost'],
-                        "clicks": term['clicks'],
-                        "conversions": 0
-                    })
-
-                    logger.info(f"Detected inefficient keyword: {term['search_term']} (cost: {term['cost']}, clicks: {term['clicks']})")
+                # 5. Skip keywords that already exist (or repeat within this batch)
+                key = (term['search_term'], term['campaign_id'])
+                if key in existing:
+                    continue
+                existing.add(key)
+
+                new_rows.append({
+                    "tenant_id": tenant_id,
+                    "campaign_id": term['campaign_id'],
+                    "campaign_name": term['campaign_name'],
+                    "search_term": term['search_term'],
+                    "cost": term['cost'],
+                    # One oversized value would abort the whole batched insert
+                    "clicks": min(term['clicks'], SMALLINT_MAX),
+                    "conversions": 0,
+                    "detected_at": detected_at,
+                    "status": KeywordStatus.PENDING
+                })
+
+                detected_keywords.append({
+                    "search_term": term['search_term'],
+                    "campaign_id": term['campaign_id'],
+                    "campaign_name": term['campaign_name'],
+                    "cost": term['cost'],
+                    "clicks": term['clicks'],
+                    "conversions": 0
+                })
+
+                logger.info(f"Detected inefficient keyword: {term['search_term']} (cost: {term['cost']}, clicks: {term['clicks']})")
 
         # 6. Filter out recently ignored keywords (within 24 hours)
         if detected_keywords:
@@ -123,6 +135,7 @@ class KeywordService:
 
         # 7. Commit to database
         if detected_keywords:
+            self.db.execute(insert(KeywordCandidate), new_rows)
             self.db.commit()
             logger.info(f"Saved {len(detected_keywords)} new keyword candidates")
         else:
@@ -150,8 +163,8 @@ class KeywordService:
                     campaign_name=keyword_data['campaign_name'],
                     search_term=keyword_data['search_term'],
                     cost=keyword_data['cost'],
-                    clicks=keyword_data['clicks'],
-                    conversions=keyword_data.get('conversions', 0),
+                    clicks=min(keyword_data['clicks'], SMALLINT_MAX),
+                    conversions=min(keyword_data.get('conversions', 0), SMALLINT_MAX),
                     detected_at=datetime.utcnow(),
                     status=KeywordStatus.PENDING
                 )
@@ -194,7 +207,9 @@ class KeywordService:
 
         try:
             # 1. Query ApprovalRequest and related KeywordCandidate
-            approval = self.db.query(ApprovalRequest).filter_by(
+            approval = self.db.query(ApprovalRequest).options(
+                joinedload(ApprovalRequest.keyword_candidate)
+            ).filter_by(
                 id=approval_request_id
             ).first()
 
@@ -221,9 +236,8 @@ class KeywordService:
 
             # 5. Call Google Ads API to add negative keyword
             try:
-                # Get customer_id from GoogleAdsAccount
-                google_ads_account = self.db.query(GoogleAdsAccount).filter_by(tenant_id=keyword.tenant_id).first()
-                customer_id = google_ads_account.customer_id if google_ads_account else None
+                # Per-tenant cached customer_id; approvals arrive in bursts
+                customer_id = tenant_cache.get_customer_id(self.db, keyword.tenant_id)
 
                 self.google_ads.add_negative_keyword(
                     customer_id=customer_id,
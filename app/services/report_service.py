@@ -70,14 +70,13 @@ class ReportService:
 
             # Fetch 4 weeks of metrics for trend analysis (oldest first)
             week_periods = self.get_n_week_periods(4)
+            weekly_metrics = self.google_ads.get_performance_metrics_many(
+                customer_id=account.customer_id,
+                periods=week_periods,
+                campaign_ids=selected_campaign_ids
+            )
             trend_data = []
-            for w_start, w_end in week_periods:
-                w_metrics = self.google_ads.get_performance_metrics(
-                    customer_id=account.customer_id,
-                    date_from=w_start,
-                    date_to=w_end,
-                    campaign_ids=selected_campaign_ids
-                )
+            for (w_start, w_end), w_metrics in zip(week_periods, weekly_metrics):
                 if w_metrics and w_metrics.get("status") != "error":
                     trend_data.append({
                         "period": f"{w_start.strftime('%m/%d')}~{w_end.strftime('%m/%d')}",
@@ -1,11 +1,15 @@
 """Google Search Console service."""
 
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from typing import Dict, List
 from datetime import date
+import httplib2
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -20,20 +24,36 @@ class SearchConsoleService:
         self.client_secret = client_secret
         self.refresh_token = refresh_token
         self._service = None
+        self._build_lock = threading.Lock()
 
     def _get_service(self):
-        """Build and return authenticated GSC service."""
+        """
+        Build and return authenticated GSC service.
+
+        httplib2 connections are not thread-safe, so every request gets its own
+        AuthorizedHttp; the service can then be used from several threads at once.
+        """
         if self._service is None:
-            credentials = Credentials(
-                token=None,
-                refresh_token=self.refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                scopes=GSC_SCOPES
-            )
-            credentials.refresh(Request())
-            self._service = build("searchconsole", "v1", credentials=credentials)
+            with self._build_lock:
+                if self._service is None:
+                    credentials = Credentials(
+                        token=None,
+                        refresh_token=self.refresh_token,
+                        token_uri="https://oauth2.googleapis.com/token",
+                        client_id=self.client_id,
+                        client_secret=self.client_secret,
+                        scopes=GSC_SCOPES
+                    )
+                    credentials.refresh(Request())
+
+                    def build_request(http, *args, **kwargs):
+                        return HttpRequest(AuthorizedHttp(credentials, http=httplib2.Http()), *args, **kwargs)
+
+                    self._service = build(
+                        "searchconsole", "v1",
+                        http=AuthorizedHttp(credentials, http=httplib2.Http()),
+                        requestBuilder=build_request
+                    )
         return self._service
 
     def list_sites(self) -> List[Dict]:
@@ -0,0 +1,99 @@
+"""
+Semantic Response Cache
+
+Caches Gemini completions keyed on a normalized fingerprint of the prompt,
+so repeated or trivially re-phrased requests (case, punctuation, spacing)
+reuse an earlier answer instead of making another LLM call.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import TTLCache
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Fold case/width, drop punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _NON_WORD_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(normalize_text(text).split())
+
+
+def select_context_turns(
+    history: List[Dict[str, str]],
+    message: str,
+    top_k: int = 3,
+    decay: float = 0.5
+) -> List[Dict[str, str]]:
+    """
+    Pick the history turns most relevant to message.
+
+    Each turn is weighted by its token overlap (Jaccard) with the message
+    times a recency kernel exp(-decay * age), so recent and on-topic turns
+    win. The top_k turns are returned in their original order, giving a
+    shorter prompt and a cache key that ignores unrelated older chatter.
+
+    Args:
+        history: Conversation turns ({"role", "content"}), oldest first
+        message: Newest user message
+        top_k: Maximum number of turns to keep
+        decay: Recency decay per turn of age
+
+    Returns:
+        Selected turns, oldest first
+    """
+    if len(history) <= top_k:
+        return list(history)
+
+    query = _tokens(message)
+    last = len(history) - 1
+    scored = []
+    for index, turn in enumerate(history):
+        turn_tokens = _tokens(turn.get("content", ""))
+        union = query | turn_tokens
+        overlap = len(query & turn_tokens) / len(union) if union else 0.0
+        # Small floor keeps pure-recency ordering when nothing overlaps
+        weight = (overlap + 0.1) * math.exp(-decay * (last - index))
+        scored.append((weight, index))
+
+    keep = sorted(index for _, index in sorted(scored, reverse=True)[:top_k])
+    return [history[index] for index in keep]
+
+
+class SemanticCache:
+    """TTL-bounded map from prompt fingerprint to generated response."""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def fingerprint(namespace: str, parts: Iterable[str]) -> bytes:
+        """Build a compact 16-byte cache key from a namespace and the prompt's variable parts."""
+        digest = hashlib.blake2b(namespace.encode(), digest_size=16)
+        for part in parts:
+            digest.update(b"\x1f")
+            digest.update(normalize_text(part).encode())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        return self._entries.get(key)
+
+    def set(self, key: bytes, response: str) -> None:
+        self._entries[key] = response
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Process-wide cache shared by all ActionRouter instances
+response_cache = SemanticCache()
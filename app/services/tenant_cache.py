@@ -0,0 +1,263 @@
+"""
+Tenant Account Cache
+
+In-process TTL cache of per-tenant account lookups that are read on every
+chat turn but change only when an account is connected or deactivated.
+Entries are invalidated by ORM events on the underlying rows.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.executor import run_io
+from app.services import google_ads_service
+from app.models.google_ads import GoogleAdsAccount, SearchConsoleAccount
+
+if TYPE_CHECKING:
+    from app.services.search_console_service import SearchConsoleService
+
+logger = logging.getLogger(__name__)
+
+
+class GscAccount(NamedTuple):
+    """Cached Search Console connection (refresh_token stays encrypted)."""
+    site_url: str
+    refresh_token: Optional[str]
+
+
+# tenant_id -> active Google Ads customer_id
+_customer_ids: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# tenant_id -> active Search Console site
+_gsc_accounts: TTLCache = TTLCache(maxsize=5_000, ttl=180)
+
+# tenant_id -> (encrypted refresh_token, SearchConsoleService); kept below the
+# one-hour OAuth access-token lifetime so a cached client never outlives it
+GSC_CLIENT_TTL = 25 * 60
+_gsc_clients: TTLCache = TTLCache(maxsize=1_000, ttl=GSC_CLIENT_TTL)
+
+
+def cached_customer_id(tenant_id: int) -> Optional[str]:
+    """Return the cached customer_id without touching the database."""
+    return _customer_ids.get(tenant_id)
+
+
+def get_customer_id(db: Session, tenant_id: int) -> Optional[str]:
+    """
+    Return the tenant's active Google Ads customer_id, or None if not connected.
+
+    Args:
+        db: Database session used on a cache miss
+        tenant_id: Tenant ID
+
+    Returns:
+        Customer ID string or None
+    """
+    customer_id = _customer_ids.get(tenant_id)
+    if customer_id is not None:
+        return customer_id
+
+    # Core select of one column: no ORM entity hydration or identity map
+    customer_id = db.execute(
+        select(GoogleAdsAccount.customer_id)
+        .where(GoogleAdsAccount.tenant_id == tenant_id, GoogleAdsAccount.is_active)
+        .limit(1)
+    ).scalar()
+    if customer_id is None:
+        return None
+
+    _customer_ids[tenant_id] = customer_id
+    return customer_id
+
+
+def get_gsc_account(db: Session, tenant_id: int) -> Optional[GscAccount]:
+    """
+    Return the tenant's active Search Console site and encrypted refresh token.
+
+    Args:
+        db: Database session used on a cache miss
+        tenant_id: Tenant ID
+
+    Returns:
+        GscAccount or None if Search Console is not connected
+    """
+    account = _gsc_accounts.get(tenant_id)
+    if account is not None:
+        return account
+
+    row = db.execute(
+        select(SearchConsoleAccount.site_url, SearchConsoleAccount.refresh_token)
+        .where(SearchConsoleAccount.tenant_id == tenant_id, SearchConsoleAccount.is_active)
+        .limit(1)
+    ).first()
+    if not row:
+        return None
+
+    account = GscAccount(site_url=row.site_url, refresh_token=row.refresh_token)
+    _gsc_accounts[tenant_id] = account
+    return account
+
+
+def cached_gsc_account(tenant_id: int) -> Optional[GscAccount]:
+    """Return the cached Search Console account without touching the database."""
+    return _gsc_accounts.get(tenant_id)
+
+
+def get_gsc_client(tenant_id: int, account: GscAccount) -> "SearchConsoleService":
+    """
+    Return a SearchConsoleService for the tenant, building it on a cache miss.
+
+    The refresh token is decrypted only when the client is (re)built. Entries
+    are keyed on the encrypted token as well, so a rotated token is never
+    served a client built from the old one.
+
+    Args:
+        tenant_id: Tenant ID
+        account: The tenant's Search Console account
+
+    Returns:
+        SearchConsoleService instance
+    """
+    entry = _gsc_clients.get(tenant_id)
+    if entry is not None and entry[0] == account.refresh_token:
+        return entry[1]
+
+    from app.config import settings
+    from app.core.security import decrypt_token
+    from app.services.search_console_service import SearchConsoleService
+
+    service = SearchConsoleService(
+        client_id=settings.google_client_id,
+        client_secret=settings.google_client_secret,
+        refresh_token=decrypt_token(account.refresh_token)
+    )
+    _gsc_clients[tenant_id] = (account.refresh_token, service)
+    return service
+
+
+def load_customer_ids(db: Session, tenant_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Resolve active customer_ids for many tenants with one IN query.
+
+    Args:
+        db: Database session
+        tenant_ids: Tenant IDs to resolve
+
+    Returns:
+        Mapping of tenant_id -> customer_id for tenants with an active account
+    """
+    rows: List[Tuple[int, str]] = db.execute(
+        select(GoogleAdsAccount.tenant_id, GoogleAdsAccount.customer_id)
+        .where(GoogleAdsAccount.tenant_id.in_(list(tenant_ids)), GoogleAdsAccount.is_active)
+    ).all()
+    found: Dict[int, str] = {}
+    for tenant_id, customer_id in rows:
+        found.setdefault(tenant_id, customer_id)
+    _customer_ids.update(found)
+    return found
+
+
+class CustomerIdLoader:
+    """
+    Batches concurrent cache-miss lookups into one query.
+
+    Lookups arriving within `window` seconds (or until `max_batch_size`
+    distinct tenants are pending) are resolved together by
+    load_customer_ids in a worker thread. The batch uses its own session:
+    callers' request-scoped sessions may be closed (or in use on another
+    thread) while the query runs.
+    """
+
+    def __init__(self, window: float = 0.005, max_batch_size: int = 100):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def load(self, tenant_id: int) -> Optional[str]:
+        customer_id = _customer_ids.get(tenant_id)
+        if customer_id is not None:
+            return customer_id
+
+        future = self._pending.get(tenant_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[tenant_id] = loop.create_future()
+            if self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+            if len(self._pending) >= self.max_batch_size:
+                self._timer.cancel()
+                self._dispatch()
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        batch = self._pending
+        self._pending, self._timer = {}, None
+        asyncio.get_running_loop().create_task(self._resolve(batch))
+
+    @staticmethod
+    def _query(tenant_ids: List[int]) -> Dict[int, str]:
+        db = SessionLocal()
+        try:
+            return load_customer_ids(db, tenant_ids)
+        finally:
+            db.close()
+
+    async def _resolve(self, batch: Dict[int, asyncio.Future]) -> None:
+        try:
+            found = await run_io(self._query, list(batch))
+        except Exception as e:
+            logger.error("Batched customer_id lookup failed: %s", e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved for callers that went away
+            return
+        for tenant_id, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(tenant_id))
+
+
+# Process-wide loader shared by all ActionRouter instances
+customer_id_loader = CustomerIdLoader()
+
+
+def invalidate_customer_id(tenant_id: int) -> None:
+    """Drop the cached customer_id for a tenant."""
+    _customer_ids.pop(tenant_id, None)
+
+
+def invalidate_gsc_account(tenant_id: int) -> None:
+    """Drop the cached Search Console account and client for a tenant."""
+    _gsc_accounts.pop(tenant_id, None)
+    _gsc_clients.pop(tenant_id, None)
+
+
+def clear() -> None:
+    """Drop all cached entries."""
+    _customer_ids.clear()
+    _gsc_accounts.clear()
+    _gsc_clients.clear()
+
+
+def _on_google_ads_account_change(mapper, connection, target: GoogleAdsAccount) -> None:
+    logger.debug("GoogleAdsAccount changed for tenant %s, invalidating cache", target.tenant_id)
+    invalidate_customer_id(target.tenant_id)
+    if target.customer_id:
+        google_ads_service.invalidate_customer(target.customer_id)
+
+
+def _on_search_console_account_change(mapper, connection, target: SearchConsoleAccount) -> None:
+    logger.debug("SearchConsoleAccount changed for tenant %s, invalidating cache", target.tenant_id)
+    invalidate_gsc_account(target.tenant_id)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(GoogleAdsAccount, _event_name, _on_google_ads_account_change)
+    event.listen(SearchConsoleAccount, _event_name, _on_search_console_account_change)
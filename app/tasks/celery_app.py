@@ -44,4 +44,8 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.maintenance_tasks.refresh_expired_tokens",
         "schedule": crontab(minute="*/15"),  # Every 15 minutes
     },
+    "ensure-history-partitions": {
+        "task": "app.tasks.maintenance_tasks.ensure_history_partitions",
+        "schedule": crontab(minute="0", hour="3"),  # Daily at 03:00
+    },
 }
@@ -4,7 +4,8 @@ from celery import shared_task
 from datetime import datetime, timedelta
 import logging
 
-from ..core.database import SessionLocal
+from ..core.database import SessionLocal, engine
+from ..core.partitions import ensure_month_partitions
 from ..models.oauth import OAuthToken, OAuthProvider
 from ..core.security import TokenEncryption
 from ..config import settings
@@ -71,3 +72,14 @@ def refresh_expired_tokens():
         db.rollback()
     finally:
         db.close()
+
+
+@shared_task(name="app.tasks.maintenance_tasks.ensure_history_partitions")
+def ensure_history_partitions():
+    """Create next month's partitions for the monthly-partitioned history tables."""
+    try:
+        with engine.begin() as conn:
+            created = ensure_month_partitions(conn, datetime.utcnow().date(), months_ahead=1)
+        logger.info(f"History partitions ensured: {', '.join(created) or 'none (not partitioned)'}")
+    except Exception as e:
+        logger.error(f"Error in ensure_history_partitions: {e}")
@@ -0,0 +1,75 @@
+"""Compact keyword_candidates numeric columns
+
+Revision ID: b7c4e2f9a013
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7c4e2f9a013'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+# SmallInteger range; rows outside it would make the ALTER fail midway
+SMALLINT_MIN, SMALLINT_MAX = -32768, 32767
+
+
+def upgrade() -> None:
+    oversized = op.get_bind().execute(
+        sa.text(
+            "SELECT count(*) FROM keyword_candidates "
+            "WHERE clicks NOT BETWEEN :lo AND :hi OR conversions NOT BETWEEN :lo AND :hi"
+        ),
+        {"lo": SMALLINT_MIN, "hi": SMALLINT_MAX},
+    ).scalar()
+    if oversized:
+        raise RuntimeError(
+            f"{oversized} keyword_candidates rows have clicks or conversions outside "
+            f"the smallint range ({SMALLINT_MIN}..{SMALLINT_MAX}); cap or remove them "
+            "before running this migration"
+        )
+
+    with op.batch_alter_table('keyword_candidates') as batch_op:
+        batch_op.alter_column(
+            'cost',
+            existing_type=sa.Float(),
+            type_=sa.Numeric(12, 2),
+            postgresql_using='cost::numeric(12,2)'
+        )
+        batch_op.alter_column(
+            'clicks',
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            postgresql_using='clicks::smallint'
+        )
+        batch_op.alter_column(
+            'conversions',
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            postgresql_using='conversions::smallint'
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('keyword_candidates') as batch_op:
+        batch_op.alter_column(
+            'conversions',
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer()
+        )
+        batch_op.alter_column(
+            'clicks',
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer()
+        )
+        batch_op.alter_column(
+            'cost',
+            existing_type=sa.Numeric(12, 2),
+            type_=sa.Float(),
+            postgresql_using='cost::double precision'
+        )
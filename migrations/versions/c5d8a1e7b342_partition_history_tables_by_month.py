@@ -0,0 +1,139 @@
+"""Partition report_history and conversation_messages by month on created_at
+
+Revision ID: c5d8a1e7b342
+Revises: b7c4e2f9a013
+Create Date: 2026-10-16 11:00:00.000000
+
+PostgreSQL only: each table is rebuilt as a RANGE (created_at) partitioned
+parent with one partition per month, covering existing rows up to next month.
+Later months are created by the maintenance_tasks.ensure_history_partitions
+beat job. A partitioned table's primary key must contain the partition key,
+so the key becomes (id, created_at); ids still come from the same sequence.
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c5d8a1e7b342'
+down_revision = 'b7c4e2f9a013'
+branch_labels = None
+depends_on = None
+
+
+# table -> (foreign key clause, [(index name, columns)])
+PARTITIONED_TABLES = {
+    'report_history': (
+        '(tenant_id) REFERENCES tenants (id)',
+        [('ix_report_history_tenant_id', ['tenant_id'])],
+    ),
+    'conversation_messages': (
+        '(conversation_id) REFERENCES conversations (id)',
+        [
+            ('ix_conversation_messages_conversation_id', ['conversation_id']),
+            ('idx_messages_conversation_created', ['conversation_id', 'created_at']),
+        ],
+    ),
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_conversation_tables() -> None:
+    """Conversation tables were only ever created by create_all; bring them under Alembic."""
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+
+    if 'conversations' not in existing:
+        op.create_table('conversations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('thread_ts', sa.String(length=50), nullable=False),
+        sa.Column('channel_id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_conversations_tenant_id', 'conversations', ['tenant_id'], unique=False)
+        op.create_index('ix_conversations_thread_ts', 'conversations', ['thread_ts'], unique=True)
+        op.create_index('idx_conversations_tenant_thread', 'conversations', ['tenant_id', 'thread_ts'], unique=False)
+
+    if 'conversation_messages' not in existing:
+        op.create_table('conversation_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('message_text', sa.Text(), nullable=False),
+        sa.Column('intent', sa.String(length=100), nullable=True),
+        sa.Column('entities', sa.JSON(), nullable=True),
+        sa.Column('bot_response', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Copy table into a fresh (partitioned or plain) table of the same name."""
+    conn = op.get_bind()
+    foreign_key, indexes = PARTITIONED_TABLES[table]
+    old = f'{table}_old'
+
+    sequence = conn.execute(sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    for name, _ in indexes:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    if partitioned:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)')
+
+        oldest = conn.execute(sa.text(f'SELECT min(created_at) FROM {old}')).scalar()
+        today = datetime.utcnow().date()
+        start = _add_months(min(oldest.date(), today) if oldest else today, 0)
+        last = _add_months(today, 1)
+        while start <= last:
+            end = _add_months(start, 1)
+            op.execute(
+                f"CREATE TABLE {table}_y{start.year:04d}m{start.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+
+    op.execute(f'ALTER TABLE {table} ADD FOREIGN KEY {foreign_key}')
+    # Indexes declared on the parent are created on every partition automatically
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=False)
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old} CASCADE')
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _create_conversation_tables()
+    for table in PARTITIONED_TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in PARTITIONED_TABLES:
+        _rebuild(table, partitioned=False)
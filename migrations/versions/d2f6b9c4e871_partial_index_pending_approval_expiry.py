@@ -0,0 +1,32 @@
+"""Replace approval_requests.expires_at index with a pending-only partial index
+
+Revision ID: d2f6b9c4e871
+Revises: c5d8a1e7b342
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b9c4e871'
+down_revision = 'c5d8a1e7b342'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_approval_requests_expires_at', table_name='approval_requests')
+    op.create_index(
+        'idx_approval_requests_pending_expiry',
+        'approval_requests',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text('action IS NULL'),
+        sqlite_where=sa.text('action IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_approval_requests_pending_expiry', table_name='approval_requests')
+    op.create_index('ix_approval_requests_expires_at', 'approval_requests', ['expires_at'], unique=False)
@@ -0,0 +1,30 @@
+"""Add partial index on active google_ads_accounts per tenant
+
+Revision ID: e8a3c6d1f254
+Revises: d2f6b9c4e871
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e8a3c6d1f254'
+down_revision = 'd2f6b9c4e871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_gads_tenant_active',
+        'google_ads_accounts',
+        ['tenant_id'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_gads_tenant_active', table_name='google_ads_accounts')
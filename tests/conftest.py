@@ -34,6 +34,27 @@ engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": Fal
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Reset module-level caches so tests don't leak state into each other."""
+    from app.services import tenant_cache
+    from app.services.action_router import _campaign_metrics_cache, _tenant_limiters
+    from app.services.gemini_service import _clients, _completion_cache, _model_limiters
+    from app.services.google_ads_service import (
+        _accessible_accounts_cache, _campaigns_cache, _ideas_cache, _token_cache
+    )
+    from app.services.intent_service import _intent_cache
+    from app.services.semantic_cache import response_cache
+    caches = (response_cache, tenant_cache, _campaign_metrics_cache, _tenant_limiters, _model_limiters, _clients,
+              _completion_cache, _token_cache,
+              _accessible_accounts_cache, _campaigns_cache, _ideas_cache, _intent_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create test database session."""
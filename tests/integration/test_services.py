@@ -1,11 +1,16 @@
 """Integration tests for services."""
 
+import asyncio
+import time
+
+import orjson
+import pytest
 from unittest.mock import Mock, patch
-from datetime import date
+from datetime import date, datetime
 
 from app.services.slack_service import SlackService
 from app.services.gemini_service import GeminiService, RateLimiter
-from app.services.google_ads_service import GoogleAdsService
+from app.services.google_ads_service import SEARCH_TERM_FIELDS, GoogleAdsService
 
 
 class TestSlackService:
@@ -80,6 +85,18 @@ class TestGeminiService:
             assert service.model_name == "gemini-2.0-flash"
             assert service.rate_limiter is not None
 
+    def test_gemini_client_shared_per_api_key(self):
+        """Services built per request reuse one genai client per API key."""
+        with patch("google.genai.Client") as mock_client_cls:
+            mock_client_cls.side_effect = lambda api_key: Mock(name=api_key)
+            first = GeminiService(api_key="key_a")
+            second = GeminiService(api_key="key_a", model_name="gemini-2.0-flash")
+            other = GeminiService(api_key="key_b")
+
+        assert first.client is second.client
+        assert other.client is not first.client
+        assert mock_client_cls.call_count == 2
+
     def test_generate_report_insight(self):
         """Test generating report insight."""
         with patch("google.genai.Client") as mock_client_cls:
@@ -131,7 +148,7 @@ class TestGoogleAdsService:
         assert service.client_id == "test_client_id"
         assert service.login_customer_id == "1234567890"
 
-    @patch('app.services.google_ads_service.requests.post')
+    @patch('app.services.google_ads_service._http.post')
     def test_get_access_token(self, mock_post):
         """Test access token refresh."""
         # Mock token response
@@ -155,6 +172,54 @@ class TestGoogleAdsService:
         assert token == "test_access_token"
         assert mock_post.called
 
+    @patch('app.services.google_ads_service._http.post')
+    def test_access_token_shared_across_instances(self, mock_post):
+        """Test a second service with the same credentials reuses the token."""
+        mock_post.return_value.json.return_value = {"access_token": "shared", "expires_in": 3600}
+        kwargs = dict(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt"
+        )
+
+        assert GoogleAdsService(**kwargs)._get_access_token() == "shared"
+        assert GoogleAdsService(**kwargs)._get_access_token() == "shared"
+        assert mock_post.call_count == 1
+
+        other = GoogleAdsService(**{**kwargs, "refresh_token": "rt2"})
+        other._get_access_token()
+        assert mock_post.call_count == 2
+
+    @patch('app.services.google_ads_service._http.post')
+    def test_search_stream_parses_rows_across_chunks(self, mock_post):
+        """Test searchStream rows are streamed out of every response chunk."""
+        import io
+        body = b'[{"results": [{"campaign": {"id": "1"}}, {"campaign": {"id": "2"}}]},' \
+               b' {"results": [{"metrics": {"conversions": 1.5}}], "requestId": "r"}]'
+        response = mock_post.return_value.__enter__.return_value
+        response.status_code = 200
+        response.raw = io.BytesIO(body)
+
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt"
+        )
+        with patch.object(service, "_get_access_token", return_value="token"):
+            rows = list(service._call_search_stream("123-456-7890", "SELECT campaign.id FROM campaign"))
+
+        assert rows == [{"campaign": {"id": "1"}}, {"campaign": {"id": "2"}}, {"metrics": {"conversions": 1.5}}]
+        assert mock_post.call_args.kwargs["stream"] is True
+
+    def test_http_sessions_retry_policy(self):
+        """Reads retry throttling and 5xx; mutates only retry 429. Both honour Retry-After."""
+        from app.services.google_ads_service import _http, _mutate_http
+
+        read_retry = _http.get_adapter(GoogleAdsService.BASE_URL).max_retries
+        mutate_retry = _mutate_http.get_adapter(GoogleAdsService.BASE_URL).max_retries
+
+        assert read_retry.is_retry("POST", 429, has_retry_after=True)
+        assert read_retry.is_retry("POST", 503)
+        assert mutate_retry.is_retry("POST", 429, has_retry_after=True)
+        assert not mutate_retry.is_retry("POST", 500)
+        assert read_retry.respect_retry_after_header and mutate_retry.respect_retry_after_header
+
     @patch.object(GoogleAdsService, '_call_search_stream')
     def test_get_performance_metrics(self, mock_search):
         """Test get_performance_metrics returns expected structure."""
@@ -190,6 +255,155 @@ class TestGoogleAdsService:
         assert metrics["clicks"] == 10
         assert metrics["impressions"] == 100
 
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_get_performance_metrics_sparse_rows(self, mock_search):
+        """Rows with omitted (zero) metrics or no metrics key aggregate cleanly."""
+        mock_search.return_value = [
+            {"metrics": {"costMicros": "2000000", "clicks": "4"}},
+            {"metrics": {"impressions": "50"}},
+            {"campaign": {"id": "1"}},
+        ]
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        metrics = service.get_performance_metrics(
+            "1234567890", date(2024, 1, 1), date(2024, 1, 7), campaign_ids=["1"]
+        )
+
+        assert metrics["cost"] == 2.0
+        assert metrics["clicks"] == 4
+        assert metrics["impressions"] == 50
+        assert metrics["conversions"] == 0.0
+        assert metrics["cpa"] == 0.0
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_get_performance_metrics_fractional_conversions_exact(self, mock_search):
+        """Fractional conversions sum exactly instead of accumulating float error."""
+        mock_search.return_value = [{"metrics": {"conversions": 0.1, "conversionsValue": 0.57}}] * 10
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        metrics = service.get_performance_metrics(
+            "1234567890", date(2024, 1, 1), date(2024, 1, 7), campaign_ids=["1"]
+        )
+
+        assert metrics["conversions"] == 1.0
+        assert metrics["conversion_value"] == 5.7
+
+    @pytest.mark.asyncio
+    async def test_get_campaign_metrics_does_not_block_event_loop(self):
+        """Concurrent get_campaign_metrics calls overlap their blocking fetches."""
+        def slow_metrics(customer_id, date_from, date_to):
+            time.sleep(0.2)
+            return {"impressions": 200, "clicks": 10}
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        with patch.object(service, "get_performance_metrics", side_effect=slow_metrics):
+            started = time.monotonic()
+            results = await asyncio.gather(*(
+                service.get_campaign_metrics("1234567890", date(2024, 1, 1), date(2024, 1, 7))
+                for _ in range(3)
+            ))
+            elapsed = time.monotonic() - started
+
+        assert all(r["ctr"] == 5.0 for r in results)
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_get_performance_metrics_batch_runs_periods_concurrently(self):
+        """Batch fetch returns per-period results in order and overlaps the calls."""
+        def slow_metrics(customer_id, date_from, date_to, campaign_ids=None):
+            time.sleep(0.2)
+            return {"clicks": date_from.day}
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+        periods = [(date(2024, 1, d), date(2024, 1, d + 6)) for d in (1, 8, 15)]
+
+        with patch.object(service, "get_performance_metrics", side_effect=slow_metrics):
+            started = time.monotonic()
+            results = await service.get_performance_metrics_batch("1234567890", periods)
+            elapsed = time.monotonic() - started
+            sync_results = service.get_performance_metrics_many("1234567890", periods)
+
+        assert [r["clicks"] for r in results] == [1, 8, 15]
+        assert sync_results == results
+        assert elapsed < 0.5
+
+    def test_get_metrics_for_customers_fans_out(self):
+        """Per-account fetches overlap and one failing account does not sink the rest."""
+        def slow_metrics(customer_id, date_from, date_to):
+            time.sleep(0.2)
+            if customer_id == "bad":
+                raise RuntimeError("PERMISSION_DENIED")
+            return {"clicks": len(customer_id)}
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        with patch.object(service, "get_performance_metrics", side_effect=slow_metrics):
+            started = time.monotonic()
+            results = service.get_metrics_for_customers(["1", "22", "bad", "333"], date(2024, 1, 1), date(2024, 1, 7))
+            elapsed = time.monotonic() - started
+
+        assert results["1"] == {"clicks": 1}
+        assert results["333"] == {"clicks": 3}
+        assert results["bad"]["status"] == "error"
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_gather_metrics_keeps_event_loop_free(self):
+        """gather_metrics fans out off the loop while other coroutines keep running."""
+        def slow_metrics(customer_id, date_from, date_to):
+            time.sleep(0.2)
+            return {"clicks": 1}
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        with patch.object(service, "get_performance_metrics", side_effect=slow_metrics):
+            task = asyncio.create_task(ticker())
+            results = await service.gather_metrics(["1", "2", "3"], date(2024, 1, 1), date(2024, 1, 7))
+            task.cancel()
+
+        assert set(results) == {"1", "2", "3"}
+        assert ticks >= 5
+
     @patch.object(GoogleAdsService, '_call_search_stream')
     def test_get_search_terms(self, mock_search):
         """Test get_search_terms returns expected structure."""
@@ -224,6 +438,135 @@ class TestGoogleAdsService:
         assert terms[0]["search_term"] == "test keyword"
         assert terms[0]["cost"] == 0.5
 
+        # Tuple rows follow SEARCH_TERM_FIELDS
+        [row] = service.get_search_terms(
+            customer_id="1234567890",
+            date_from=date(2024, 1, 1),
+            date_to=date(2024, 1, 7),
+            return_dicts=False
+        )
+        assert dict(zip(SEARCH_TERM_FIELDS, row)) == terms[0]
+
+    def test_headers_reused_until_token_changes(self):
+        """Test headers are built once per access token."""
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret",
+            refresh_token="rt", login_customer_id="123-456-7890"
+        )
+        with patch.object(service, "_get_access_token", return_value="t1") as mock_token:
+            first = service._build_headers()
+            assert service._build_headers() is first
+            assert first["login-customer-id"] == "1234567890"
+
+            mock_token.return_value = "t2"
+            assert service._build_headers()["Authorization"] == "Bearer t2"
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_performance_metrics_aggregated_by_api(self, mock_search):
+        """Test account totals come from FROM customer; campaign filters use FROM campaign."""
+        mock_search.return_value = []
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt"
+        )
+
+        service.get_performance_metrics("1234567890", date(2024, 1, 1), date(2024, 1, 31))
+        query = mock_search.call_args[0][1]
+        assert "FROM customer" in query
+        assert query.count("segments.date") == 1  # filtered on, never selected
+
+        service.get_performance_metrics("1234567890", date(2024, 1, 1), date(2024, 1, 31), campaign_ids=["11", "22"])
+        query = mock_search.call_args[0][1]
+        assert "FROM campaign" in query and "campaign.id IN (11, 22)" in query
+
+        # datetimes (as passed by the chat date-range parser) format as plain dates
+        service.get_performance_metrics("1234567890", datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59))
+        query = mock_search.call_args[0][1]
+        assert "BETWEEN '2024-01-01' AND '2024-01-07'" in query
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_performance_metrics_chunks_long_campaign_lists(self, mock_search):
+        """Test >50 campaign IDs are split into several IN filters and summed."""
+        mock_search.side_effect = lambda customer_id, query: iter([
+            {"metrics": {"clicks": str(len(query.split("IN (")[1].split(")")[0].split(",")))}}
+        ])
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt"
+        )
+        campaign_ids = [str(i) for i in range(120)]
+
+        metrics = service.get_performance_metrics("1234567890", date(2024, 1, 1), date(2024, 1, 31), campaign_ids)
+        queries = [c.args[1] for c in mock_search.call_args_list]
+        assert len(queries) == 3
+        assert all(q.count("campaign.id IN") == 1 for q in queries)
+        assert metrics["clicks"] == 120
+
+        # Same result when already running on the fan-out pool
+        mock_search.reset_mock()
+        [nested] = service.get_performance_metrics_many(
+            "1234567890", [(date(2024, 1, 1), date(2024, 1, 31))], campaign_ids
+        )
+        assert nested == metrics
+        assert mock_search.call_count == 3
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_ids_are_normalized_and_validated(self, mock_search):
+        """Test customer IDs are reduced to digits and bad campaign IDs never reach GAQL."""
+        mock_search.return_value = iter([])
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt",
+            login_customer_id="111-222-3333",
+        )
+        assert service._login_customer_id_clean == "1112223333"
+
+        with pytest.raises(ValueError, match="Invalid campaign ID"):
+            service.get_performance_metrics(
+                "123-456-7890", date(2024, 1, 1), date(2024, 1, 31), ["11", "1) OR (1=1"]
+            )
+        mock_search.assert_not_called()
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_search_terms_filters_pushed_into_gaql(self, mock_search):
+        """Test search-term thresholds and top-N are expressed in the query."""
+        mock_search.return_value = []
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret", refresh_token="rt"
+        )
+
+        service.get_search_terms("1234567890", date(2024, 1, 1), date(2024, 1, 7))
+        query = mock_search.call_args[0][1]
+        assert "metrics.clicks" not in query.split("WHERE")[1]
+        assert "LIMIT" not in query
+
+        service.get_search_terms(
+            "1234567890", date(2024, 1, 1), date(2024, 1, 7),
+            min_cost=10000, min_clicks=5, without_conversions=True, limit=50
+        )
+        query = mock_search.call_args[0][1]
+        assert "metrics.cost_micros >= 10000000000" in query
+        assert "metrics.clicks >= 5" in query
+        assert "metrics.conversions = 0" in query
+        assert query.rstrip().endswith("ORDER BY metrics.cost_micros DESC\nLIMIT 50")
+
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_list_accessible_accounts_falls_back_to_own_account(self, mock_search):
+        """Test single-account fallback and caching of the account list."""
+        def search(customer_id, query):
+            if "FROM customer_client" in query:
+                return []
+            return [{"customer": {"id": "555", "descriptiveName": "Solo", "currencyCode": "KRW", "timeZone": "Asia/Seoul"}}]
+        mock_search.side_effect = search
+
+        service = GoogleAdsService(
+            developer_token="dev", client_id="cid", client_secret="secret",
+            refresh_token="rt", login_customer_id="123-456-7890"
+        )
+        accounts = service.list_accessible_accounts()
+
+        assert accounts == [{"customer_id": "555", "account_name": "Solo", "currency": "KRW", "timezone": "Asia/Seoul"}]
+        assert mock_search.call_count == 2
+        assert service.list_accessible_accounts() == accounts
+        assert mock_search.call_count == 2
+
     @patch.object(GoogleAdsService, '_call_search_stream')
     def test_list_campaigns(self, mock_search):
         """Test list_campaigns returns expected structure."""
@@ -253,7 +596,27 @@ class TestGoogleAdsService:
         assert campaigns[0]["name"] == "Test Campaign"
         assert campaigns[0]["status"] == "ENABLED"
 
-    @patch('app.services.google_ads_service.requests.post')
+    @patch.object(GoogleAdsService, '_call_search_stream')
+    def test_list_campaigns_cached_across_instances(self, mock_search):
+        """Repeated campaign listings for the same account reuse one API call."""
+        mock_search.return_value = [{"campaign": {"id": "1", "name": "A", "status": "PAUSED"}}]
+
+        def make_service(refresh_token="test_refresh_token"):
+            return GoogleAdsService(
+                developer_token="test_dev_token",
+                client_id="test_client_id",
+                client_secret="test_client_secret",
+                refresh_token=refresh_token
+            )
+
+        first = make_service().list_campaigns("123-456-7890")
+        second = make_service().list_campaigns("1234567890")
+        make_service("other_refresh_token").list_campaigns("1234567890")
+
+        assert first == second
+        assert mock_search.call_count == 2
+
+    @patch('app.services.google_ads_service._mutate_http.post')
     @patch.object(GoogleAdsService, '_get_access_token')
     def test_add_negative_keyword(self, mock_token, mock_post):
         """Test add_negative_keyword returns success."""
@@ -263,11 +626,11 @@ class TestGoogleAdsService:
         # Mock mutate response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "results": [{
                 "resourceName": "customers/1234567890/campaignCriteria/12345~67890"
             }]
-        }
+        })
         mock_post.return_value = mock_response
 
         service = GoogleAdsService(
@@ -286,3 +649,279 @@ class TestGoogleAdsService:
 
         assert result is True
         assert mock_post.called
+
+    @patch('app.services.google_ads_service._mutate_http.post')
+    @patch.object(GoogleAdsService, '_get_access_token')
+    def test_add_negative_keywords_single_request(self, mock_token, mock_post):
+        """Batch negation sends one mutate call and reports per-keyword results."""
+        mock_token.return_value = "test_access_token"
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({
+            "results": [
+                {"resourceName": "customers/1234567890/campaignCriteria/1~1"},
+                {},
+                {"resourceName": "customers/1234567890/campaignCriteria/2~3"},
+            ]
+        })
+        mock_post.return_value = mock_response
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        result = service.add_negative_keywords("123-456-7890", [
+            ("1", "free", "EXACT"),
+            ("1", "cheap", "phrase"),
+            ("2", "used", "BROAD"),
+        ])
+
+        assert result == [True, False, True]
+        assert mock_post.call_count == 1
+        payload = orjson.loads(mock_post.call_args.kwargs["data"])
+        assert payload["partialFailure"] is True
+        assert [op["create"]["keyword"]["matchType"] for op in payload["operations"]] == [
+            "EXACT", "PHRASE", "BROAD"
+        ]
+
+    @patch('app.services.google_ads_service.MUTATE_MAX_OPERATIONS', 2)
+    @patch('app.services.google_ads_service._mutate_http.post')
+    @patch.object(GoogleAdsService, '_get_access_token')
+    def test_add_negative_keywords_chunks_large_batches(self, mock_token, mock_post):
+        """Batches above the per-request operation cap are split, results stay aligned."""
+        mock_token.return_value = "test_access_token"
+
+        def respond(endpoint, headers, data, timeout):
+            ops = orjson.loads(data)["operations"]
+            response = Mock(status_code=200)
+            response.content = orjson.dumps({"results": [
+                {} if op["create"]["keyword"]["text"] == "bad" else {"resourceName": "r"} for op in ops
+            ]})
+            return response
+        mock_post.side_effect = respond
+
+        service = GoogleAdsService(
+            developer_token="test_dev_token",
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            refresh_token="test_refresh_token"
+        )
+
+        result = service.add_negative_keywords("1234567890", [
+            ("1", "a", "EXACT"), ("1", "bad", "EXACT"), ("1", "c", "EXACT"),
+            ("2", "d", "EXACT"), ("2", "e", "EXACT"),
+        ])
+
+        assert result == [True, False, True, True, True]
+        assert mock_post.call_count == 3
+
+
+class TestTenantCache:
+    """Test per-tenant account lookup cache."""
+
+    def _add_account(self, db):
+        from app.models import Tenant, GoogleAdsAccount
+        tenant = Tenant(workspace_id="T_CACHE", workspace_name="Cache Team", is_active=True)
+        db.add(tenant)
+        db.commit()
+        account = GoogleAdsAccount(
+            tenant_id=tenant.id, customer_id="1112223333",
+            account_name="Main", is_active=True
+        )
+        db.add(account)
+        db.commit()
+        return tenant, account
+
+    def test_customer_id_is_cached(self, db):
+        """Test second lookup does not hit the database."""
+        from app.services import tenant_cache
+        tenant, _ = self._add_account(db)
+
+        assert tenant_cache.get_customer_id(db, tenant.id) == "1112223333"
+        with patch.object(db, "execute") as mock_execute:
+            assert tenant_cache.get_customer_id(db, tenant.id) == "1112223333"
+            mock_execute.assert_not_called()
+
+    def test_deactivation_invalidates_cache(self, db):
+        """Test updating the account row drops the cached customer_id."""
+        from app.services import tenant_cache
+        tenant, account = self._add_account(db)
+
+        assert tenant_cache.get_customer_id(db, tenant.id) == "1112223333"
+        account.is_active = False
+        db.commit()
+
+        assert tenant_cache.get_customer_id(db, tenant.id) is None
+
+    def test_account_change_drops_cached_campaign_list(self, db):
+        """Test updating the account row also drops that customer's campaign list."""
+        from app.services.google_ads_service import _campaigns_cache
+        _, account = self._add_account(db)
+        _campaigns_cache[("1112223333", None, "rt")] = ({"id": "1"},)
+        _campaigns_cache[("9998887777", None, "rt")] = ({"id": "2"},)
+
+        account.account_name = "Renamed"
+        db.commit()
+
+        assert ("1112223333", None, "rt") not in _campaigns_cache
+        assert ("9998887777", None, "rt") in _campaigns_cache
+
+    def test_load_customer_ids_batches_tenants(self, db):
+        """Test several tenants resolve in one query, skipping inactive accounts."""
+        from app.models import Tenant, GoogleAdsAccount
+        from app.services import tenant_cache
+        tenants = [Tenant(workspace_id=f"T_B{i}", workspace_name=f"B{i}", is_active=True) for i in range(3)]
+        db.add_all(tenants)
+        db.commit()
+        db.add_all([
+            GoogleAdsAccount(tenant_id=tenants[0].id, customer_id="100", account_name="a", is_active=True),
+            GoogleAdsAccount(tenant_id=tenants[1].id, customer_id="200", account_name="b", is_active=False),
+            GoogleAdsAccount(tenant_id=tenants[2].id, customer_id="300", account_name="c", is_active=True),
+        ])
+        db.commit()
+
+        found = tenant_cache.load_customer_ids(db, [t.id for t in tenants])
+
+        assert found == {tenants[0].id: "100", tenants[2].id: "300"}
+        assert tenant_cache.cached_customer_id(tenants[2].id) == "300"
+
+    def test_gsc_account_cached_until_reconnect(self, db):
+        """Test GSC site is cached and refreshed when the row changes."""
+        from app.models import Tenant
+        from app.models.google_ads import SearchConsoleAccount
+        from app.services import tenant_cache
+        tenant = Tenant(workspace_id="T_GSC", workspace_name="GSC", is_active=True)
+        db.add(tenant)
+        db.commit()
+        account = SearchConsoleAccount(
+            tenant_id=tenant.id, site_url="https://a.example", refresh_token="enc", is_active=True
+        )
+        db.add(account)
+        db.commit()
+
+        assert tenant_cache.get_gsc_account(db, tenant.id).site_url == "https://a.example"
+        account.site_url = "https://b.example"
+        db.commit()
+
+        assert tenant_cache.cached_gsc_account(tenant.id) is None
+        assert tenant_cache.get_gsc_account(db, tenant.id) == ("https://b.example", "enc")
+
+
+class TestConversationService:
+    """Test conversation persistence."""
+
+    def test_save_message_touches_conversation_without_select(self, db):
+        """Test save_message bumps updated_at with a plain UPDATE."""
+        from datetime import datetime, timedelta
+        from app.models import Tenant
+        from app.models.conversation import Conversation
+        from app.services.conversation_service import ConversationService
+        tenant = Tenant(workspace_id="T_CONV", workspace_name="Conv", is_active=True)
+        db.add(tenant)
+        db.commit()
+        stale = datetime.utcnow() - timedelta(days=1)
+        conversation = Conversation(
+            tenant_id=tenant.id, user_id="U1", channel_id="C1",
+            thread_ts="1700000000.000100", updated_at=stale
+        )
+        db.add(conversation)
+        db.commit()
+
+        service = ConversationService(db, redis_client=Mock())
+        with patch.object(db, "query") as mock_query:
+            message = service.save_message(conversation.id, "U1", "안녕", bot_response="hi")
+            mock_query.assert_not_called()
+
+        assert message.message_text == "안녕"
+        db.refresh(conversation)
+        assert conversation.updated_at > stale
+
+    def test_history_returns_latest_turns_oldest_first(self, db):
+        """Test history keeps the newest messages in chronological order."""
+        from datetime import datetime, timedelta
+        from app.models import Tenant
+        from app.models.conversation import Conversation, ConversationMessage
+        from app.services.conversation_service import ConversationService
+        tenant = Tenant(workspace_id="T_HIST", workspace_name="Hist", is_active=True)
+        db.add(tenant)
+        db.commit()
+        conversation = Conversation(tenant_id=tenant.id, user_id="U1", channel_id="C1", thread_ts="1700000000.000200")
+        db.add(conversation)
+        db.commit()
+        base = datetime(2024, 1, 1)
+        db.add_all([
+            ConversationMessage(
+                conversation_id=conversation.id, user_id="U1", message_text=f"q{i}",
+                bot_response=f"a{i}" if i != 2 else None, created_at=base + timedelta(minutes=i)
+            )
+            for i in range(4)
+        ])
+        db.commit()
+
+        history = ConversationService(db, redis_client=Mock()).get_conversation_history(conversation.id, limit=2)
+
+        assert history == [
+            {"role": "user", "content": "q2"},
+            {"role": "user", "content": "q3"},
+            {"role": "assistant", "content": "a3"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cached_history_skips_database_and_tracks_new_messages(self, db):
+        """Test Redis-backed history is backfilled once and appended on save."""
+        from unittest.mock import AsyncMock
+        from app.services.conversation_service import ConversationService
+        store = {}
+
+        def append_capped(key, ttl, value, max_len):
+            if key in store:
+                store[key] = (store[key] + [value])[-max_len:]
+
+        redis = Mock()
+        redis.lrange = AsyncMock(side_effect=lambda key, start, end: list(store.get(key, [])))
+        redis.replace_list = AsyncMock(side_effect=lambda key, ttl, values: store.__setitem__(key, list(values)))
+        redis.append_capped = AsyncMock(side_effect=append_capped)
+        service = ConversationService(db, redis)
+
+        with patch.object(service, "_latest_messages", return_value=[("q0", "a0")]) as mock_load:
+            assert await service.get_cached_history(42, limit=5) == [
+                {"role": "user", "content": "q0"},
+                {"role": "assistant", "content": "a0"},
+            ]
+            await service.append_to_cached_history(42, "q1", None)
+            history = await service.get_cached_history(42, limit=5)
+            mock_load.assert_called_once()
+
+        assert history[-1] == {"role": "user", "content": "q1"}
+
+    @pytest.mark.asyncio
+    async def test_cached_history_falls_back_when_redis_is_down(self, db):
+        """Test a Redis error does not break history loading."""
+        from unittest.mock import AsyncMock
+        from app.services.conversation_service import ConversationService
+        redis = Mock()
+        redis.lrange = AsyncMock(side_effect=ConnectionError("redis down"))
+        service = ConversationService(db, redis)
+
+        with patch.object(service, "_latest_messages", return_value=[("q0", None)]):
+            assert await service.get_cached_history(7) == [{"role": "user", "content": "q0"}]
+
+    @pytest.mark.asyncio
+    async def test_cached_history_append_is_one_transaction(self):
+        """Test appends push, trim and refresh TTL in a single pipeline."""
+        from unittest.mock import MagicMock
+        from app.core.redis_client import RedisClient
+        client = RedisClient.__new__(RedisClient)
+        client._client = MagicMock()
+        pipe = client._client.pipeline.return_value.__enter__.return_value
+
+        await client.append_capped("conversation_history:1", 3600, b'["q1",null]', 10)
+
+        pipe.rpushx.assert_called_once_with("conversation_history:1", b'["q1",null]')
+        pipe.ltrim.assert_called_once_with("conversation_history:1", -10, -1)
+        pipe.expire.assert_called_once_with("conversation_history:1", 3600)
+        pipe.execute.assert_called_once()
+        client._client.get.assert_not_called()
@@ -98,6 +98,23 @@ class TestReportSchedule:
         assert schedule.day_of_week == 0
         assert schedule.timezone == "Asia/Seoul"
 
+    def test_upsert_creates_then_updates(self, db_session):
+        """Test upsert inserts a schedule once and updates it afterwards."""
+        tenant = Tenant(workspace_id="T12345", workspace_name="Test")
+        db_session.add(tenant)
+        db_session.commit()
+
+        from datetime import time
+        ReportSchedule.upsert(db_session, tenant.id, ReportFrequency.WEEKLY, 0, time(9, 0))
+        ReportSchedule.upsert(db_session, tenant.id, ReportFrequency.DAILY, 4, time(18, 30))
+
+        schedules = db_session.query(ReportSchedule).filter_by(tenant_id=tenant.id).all()
+        assert len(schedules) == 1
+        assert schedules[0].frequency == ReportFrequency.DAILY
+        assert schedules[0].day_of_week == 4
+        assert schedules[0].time_of_day == time(18, 30)
+        assert schedules[0].timezone == "Asia/Seoul"
+
 
 class TestKeywordCandidate:
     """Test KeywordCandidate model."""
@@ -179,3 +196,31 @@ class TestGoogleAdsAccount:
         assert account.customer_id == "1234567890"
         assert account.currency == "KRW"
         assert account.is_active is True
+
+
+class TestHistoryPartitions:
+    """Test monthly partition helpers."""
+
+    def test_add_months_rolls_over_year(self):
+        """Test month arithmetic across a year boundary."""
+        from datetime import date
+        from app.core.partitions import add_months
+
+        assert add_months(date(2024, 11, 17), 1) == date(2024, 12, 1)
+        assert add_months(date(2024, 12, 31), 1) == date(2025, 1, 1)
+
+    def test_partition_name(self):
+        """Test partition naming scheme."""
+        from datetime import date
+        from app.core.partitions import partition_name
+
+        assert partition_name("report_history", date(2024, 11, 1)) == "report_history_y2024m11"
+
+    def test_ensure_partitions_skips_non_postgres(self):
+        """Test partition maintenance is a no-op on SQLite."""
+        from datetime import date
+        from app.core.partitions import ensure_month_partitions
+
+        engine = create_engine("sqlite:///:memory:")
+        with engine.begin() as conn:
+            assert ensure_month_partitions(conn, date(2024, 11, 17)) == []
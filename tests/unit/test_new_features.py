@@ -1,6 +1,7 @@
 """Unit tests for new features: GSC, Keyword Planner, Intent, ActionRouter."""
 
 import pytest
+import orjson
 from unittest.mock import Mock, MagicMock, patch, AsyncMock
 from datetime import date
 
@@ -157,10 +158,17 @@ class TestIntentServiceGSC:
 
     def _mock_response(self, mock_gemini, intent: str, entities: dict = None):
         import json
+        from pydantic import ValidationError
+        from app.services.intent_service import IntentSchema
         payload = {"intent": intent, "entities": entities or {}, "confidence": 0.95}
         mock_resp = Mock()
         mock_resp.text = json.dumps(payload)
-        mock_gemini.model.generate_content.return_value = mock_resp
+        try:
+            mock_resp.parsed = IntentSchema.model_validate(payload)
+        except ValidationError:
+            # SDK는 스키마 검증 실패 시 parsed를 None으로 둠
+            mock_resp.parsed = None
+        mock_gemini.client.models.generate_content.return_value = mock_resp
 
     def test_gsc_query_intent_recognized(self):
         """'인기 검색어 알려줘' → query_gsc_data intent."""
@@ -198,13 +206,222 @@ class TestIntentServiceGSC:
     def test_json_parse_error_falls_back(self):
         """Gemini가 JSON이 아닌 응답 → general_chat 폴백."""
         svc, mock_gemini = self._make_service()
-        mock_resp = Mock()
+        mock_resp = Mock(parsed=None)
         mock_resp.text = "이건 JSON이 아닙니다"
-        mock_gemini.model.generate_content.return_value = mock_resp
+        mock_gemini.client.models.generate_content.return_value = mock_resp
         result = svc.parse_intent("뭔가 질문")
         assert result["intent"] == "general_chat"
         assert result["confidence"] == 0.0
 
+    def test_structured_output_requested_and_parsed(self):
+        """JSON 스키마 모드로 요청하고, 설정되지 않은 엔티티는 결과에서 제외."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "answer_question",
+                            {"start_date": "2024-01-01", "end_date": "2024-01-07"})
+        result = svc.parse_intent("1월 첫 주 비용 얼마야?")
+        assert result == {
+            "intent": "answer_question",
+            "entities": {"start_date": "2024-01-01", "end_date": "2024-01-07"},
+            "confidence": 0.95,
+        }
+        config = mock_gemini.client.models.generate_content.call_args.kwargs["config"]
+        assert config.response_mime_type == "application/json"
+        assert config.response_schema.__name__ == "IntentSchema"
+
+    def test_prompt_includes_last_five_history_turns(self):
+        """대화 이력은 최근 5개만, 역할 라벨과 함께 프롬프트 끝부분에 포함."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "answer_question")
+        history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"} for i in range(7)]
+        svc.parse_intent("그건 얼마야?", history)
+        prompt = mock_gemini.client.models.generate_content.call_args.kwargs["contents"]
+        assert "m1\n" not in prompt
+        assert prompt.endswith(
+            "\n대화 이력:\n사용자: m2\n어시스턴트: m3\n사용자: m4\n어시스턴트: m5\n사용자: m6\n"
+            "\n현재 메시지: 그건 얼마야?"
+        )
+
+    def test_repeated_message_served_from_cache(self):
+        """같은 메시지·이력은 캐시에서 반환하고 호출자 변경이 캐시에 새지 않음."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "answer_question")
+        first = svc.parse_intent("지난주 비용 얼마야 ")
+        first["entities"]["original_message"] = "변경"
+        second = svc.parse_intent("지난주 비용 얼마야")
+        assert mock_gemini.client.models.generate_content.call_count == 1
+        assert second["intent"] == "answer_question"
+        assert "original_message" not in second["entities"]
+
+    def test_cache_keyed_on_history_and_bypassable(self):
+        """이력이 다르거나 bypass_cache=True면 Gemini를 다시 호출."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "answer_question")
+        svc.parse_intent("그건 얼마야?")
+        svc.parse_intent("그건 얼마야?", [{"role": "user", "content": "어제 비용"}])
+        svc.parse_intent("그건 얼마야?", bypass_cache=True)
+        assert mock_gemini.client.models.generate_content.call_count == 3
+
+    def test_fallback_result_not_cached(self):
+        """파싱 실패 폴백은 캐시하지 않음."""
+        svc, mock_gemini = self._make_service()
+        mock_gemini.client.models.generate_content.return_value = Mock(text="JSON 아님", parsed=None)
+        svc.parse_intent("뭔가 질문")
+        svc.parse_intent("뭔가 질문")
+        assert mock_gemini.client.models.generate_content.call_count == 2
+
+    def test_rule_prefilter_skips_gemini(self):
+        """명확한 키워드 신호는 Gemini 호출 없이 분류."""
+        svc, mock_gemini = self._make_service()
+        report = svc.parse_intent("리포트 보여줘")
+        gsc = svc.parse_intent("서치 콘솔 인기 페이지 Top 3")
+        assert report == {"intent": "generate_report", "entities": {}, "confidence": 0.9}
+        assert gsc["intent"] == "query_gsc_data"
+        assert gsc["entities"] == {"gsc_data_type": "pages", "limit": 3}
+        mock_gemini.client.models.generate_content.assert_not_called()
+
+    @pytest.mark.parametrize("message", [
+        "리포트 발송 요일을 금요일로 바꿔줘",
+        "리포트 받는 시간 오후 3시로 바꿔줘",
+        "지난주 리포트에서 비용이 얼마였어?",
+        "리포트 그만 받고 싶어",
+    ])
+    def test_rule_prefilter_does_not_misroute_report_mentions(self, message):
+        """'리포트'가 들어가도 생성 요청이 아니면 Gemini로 넘김."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "change_schedule")
+        result = svc.parse_intent(message)
+        assert result["intent"] == "change_schedule"
+        mock_gemini.client.models.generate_content.assert_called_once()
+
+    def test_rule_prefilter_skipped_with_history(self):
+        """대화 이력이 있으면 후속 메시지로 보고 Gemini로 분류."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "answer_question")
+        result = svc.parse_intent("리포트 보여줘", [{"role": "user", "content": "어제 비용"}])
+        assert result["intent"] == "answer_question"
+        mock_gemini.client.models.generate_content.assert_called_once()
+
+    def test_rule_prefilter_defers_ambiguous_messages(self):
+        """여러 의도가 겹치거나 엔티티가 필요한 의도는 Gemini로 넘김."""
+        svc, mock_gemini = self._make_service()
+        self._mock_response(mock_gemini, "change_schedule", {"frequency": "daily"})
+        result = svc.parse_intent("리포트 일정을 매일 9시로 바꿔줘")
+        assert result["intent"] == "change_schedule"
+        svc.parse_intent("러닝화 키워드 추천해줘")
+        assert mock_gemini.client.models.generate_content.call_count == 2
+
+
+    def test_batch_classifies_misses_in_one_call(self):
+        """규칙·캐시로 처리되지 않은 메시지만 한 번의 호출로 분류하고 순서 유지."""
+        from app.services.intent_service import IntentSchema
+        svc, mock_gemini = self._make_service()
+        mock_gemini.client.models.generate_content.return_value = Mock(parsed=[
+            IntentSchema(intent="answer_question", confidence=0.8),
+            IntentSchema(intent="general_chat", confidence=0.7),
+        ])
+        results = svc.parse_intents_batch(["어제 비용 얼마야?", "리포트 보여줘", "안녕", "어제 비용 얼마야?"])
+        assert [r["intent"] for r in results] == [
+            "answer_question", "generate_report", "general_chat", "answer_question"
+        ]
+        assert mock_gemini.client.models.generate_content.call_count == 1
+        prompt = mock_gemini.client.models.generate_content.call_args.kwargs["contents"]
+        assert prompt.endswith("1. 어제 비용 얼마야?\n2. 안녕\n")
+
+        # 배치 결과는 parse_intent와 캐시를 공유
+        assert svc.parse_intent("안녕")["intent"] == "general_chat"
+        assert mock_gemini.client.models.generate_content.call_count == 1
+
+    def test_response_schemas_accepted_by_sdk(self):
+        """실제 SDK 스키마 변환기로 단건·배치 응답 스키마를 변환 (모킹 없음)."""
+        from google.genai import _transformers
+        from app.services.intent_service import _INTENT_CONFIG, _INTENT_BATCH_CONFIG
+        single = _transformers.t_schema(None, _INTENT_CONFIG.response_schema)
+        batch = _transformers.t_schema(None, _INTENT_BATCH_CONFIG.response_schema)
+        assert single.type == "OBJECT"
+        assert batch.type == "ARRAY"
+        assert "intent" in batch.items.properties
+
+    def test_batch_empty_reply_falls_back_per_message(self):
+        """차단·빈 응답(text=None)이면 메시지별 parse_intent로 폴백."""
+        from app.services.intent_service import IntentSchema
+        svc, mock_gemini = self._make_service()
+        mock_gemini.client.models.generate_content.side_effect = [
+            Mock(parsed=None, text=None),
+            Mock(parsed=IntentSchema(intent="answer_question", confidence=0.9)),
+        ]
+        results = svc.parse_intents_batch(["어제 비용 얼마야?"])
+        assert results[0]["intent"] == "answer_question"
+        assert mock_gemini.client.models.generate_content.call_count == 2
+
+    def test_batch_schema_error_is_not_swallowed(self):
+        """설정 오류는 메시지별 폴백으로 숨기지 않고 그대로 전파."""
+        svc, mock_gemini = self._make_service()
+        mock_gemini.client.models.generate_content.side_effect = ValueError("Unsupported schema type")
+        with pytest.raises(ValueError):
+            svc.parse_intents_batch(["어제 비용 얼마야?"])
+        assert mock_gemini.client.models.generate_content.call_count == 1
+
+    def test_batch_length_mismatch_falls_back_per_message(self):
+        """배치 응답 개수가 맞지 않으면 메시지별 parse_intent로 폴백."""
+        from app.services.intent_service import IntentSchema
+        svc, mock_gemini = self._make_service()
+        single = Mock(parsed=IntentSchema(intent="answer_question", confidence=0.9))
+        mock_gemini.client.models.generate_content.side_effect = [
+            Mock(parsed=[IntentSchema(intent="general_chat", confidence=0.7)]),
+            single,
+            single,
+        ]
+        results = svc.parse_intents_batch(["어제 비용 얼마야?", "전환 몇 건이야?"])
+        assert [r["intent"] for r in results] == ["answer_question", "answer_question"]
+        assert mock_gemini.client.models.generate_content.call_count == 3
+
+
+class TestIntentToRouterRoundTrip:
+    """구조화 출력 엔티티가 ActionRouter 핸들러까지 그대로 전달되는지 확인."""
+
+    def _parse(self, intent: str, entities: dict, message: str) -> dict:
+        from app.services.intent_service import IntentService, IntentSchema
+        gemini = Mock()
+        gemini.client.models.generate_content.return_value = Mock(
+            parsed=IntentSchema.model_validate({"intent": intent, "entities": entities, "confidence": 0.9})
+        )
+        return IntentService(gemini_service=gemini).parse_intent(message)
+
+    @pytest.mark.asyncio
+    async def test_schedule_entities_reach_handler(self):
+        from datetime import time
+        from app.models.report import ReportFrequency
+        from app.services.action_router import ActionRouter
+        parsed = self._parse(
+            "change_schedule", {"frequency": "daily", "day": "friday", "time": "15:00"}, "매일 오후 3시로 바꿔줘"
+        )
+        router = ActionRouter(Mock(), Mock(), Mock(), Mock(), Mock())
+        with patch("app.services.action_router.ReportSchedule.upsert") as upsert:
+            result = await router.route_action(parsed["intent"], parsed["entities"], tenant_id=1)
+
+        assert "daily" in result and "15:00" in result
+        upsert.assert_called_once_with(router.db, 1, ReportFrequency.DAILY, 4, time(15, 0))
+
+    @pytest.mark.asyncio
+    async def test_date_entities_reach_handler(self):
+        from datetime import datetime
+        from app.services.action_router import ActionRouter
+        parsed = self._parse(
+            "answer_question", {"start_date": "2024-01-01", "end_date": "2024-01-07"}, "1월 첫 주 비용 얼마야"
+        )
+        google_ads = Mock()
+        google_ads.get_campaign_metrics = AsyncMock(return_value={"clicks": 10})
+        gemini = Mock()
+        gemini.generate_text = AsyncMock(return_value="클릭 10회입니다.")
+        session = Mock()
+        session.execute.return_value.all.return_value = [(1, "1234567890")]
+        router = ActionRouter(Mock(), Mock(), Mock(), google_ads, gemini)
+        with patch("app.services.tenant_cache.SessionLocal", return_value=session):
+            await router.route_action(parsed["intent"], parsed["entities"], 1, [])
+
+        _, kwargs = google_ads.get_campaign_metrics.call_args
+        assert (kwargs["date_from"], kwargs["date_to"]) == (datetime(2024, 1, 1), datetime(2024, 1, 7))
+
 
 # ─────────────────────────────────────────
 # GoogleAdsService - generate_keyword_ideas
@@ -234,7 +451,7 @@ class TestKeywordPlannerAPI:
         self._mock_token(svc)
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.json.return_value = {
+        mock_resp.content = orjson.dumps({
             "results": [
                 {"text": "러닝화 추천", "keywordIdeaMetrics": {
                     "avgMonthlySearches": "10000",
@@ -251,8 +468,8 @@ class TestKeywordPlannerAPI:
                     "highTopOfPageBidMicros": "900000000"
                 }},
             ]
-        }
-        with patch("requests.post", return_value=mock_resp):
+        })
+        with patch("app.services.google_ads_service._http.post", return_value=mock_resp):
             ideas = svc.generate_keyword_ideas("1234567890", ["러닝화"])
         assert len(ideas) == 2
         assert ideas[0]["keyword"] == "러닝화 추천"
@@ -260,6 +477,22 @@ class TestKeywordPlannerAPI:
         assert ideas[0]["low_bid_krw"] == 800
         assert ideas[0]["high_bid_krw"] == 1200
 
+    def test_generate_keyword_ideas_cached(self):
+        """동일 시드 집합 재요청은 계정과 무관하게 캐시에서 반환하고 API를 다시 호출하지 않음."""
+        svc = self._make_service()
+        self._mock_token(svc)
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = orjson.dumps({
+            "results": [{"text": "러닝화", "keywordIdeaMetrics": {"competition": "LOW"}}]
+        })
+        with patch("app.services.google_ads_service._http.post", return_value=mock_resp) as mock_post:
+            first = svc.generate_keyword_ideas("1234567890", ["러닝화", "Nike"])
+            # Another tenant's account with the same seed set shares the entry
+            second = svc.generate_keyword_ideas("222-222-2222", ["nike", "러닝화 "])
+        assert first == second
+        assert mock_post.call_count == 1
+
     def test_generate_keyword_ideas_api_error_returns_empty(self):
         """API 오류 시 빈 리스트 반환."""
         svc = self._make_service()
@@ -267,7 +500,7 @@ class TestKeywordPlannerAPI:
         mock_resp = MagicMock()
         mock_resp.status_code = 403
         mock_resp.text = "Permission denied"
-        with patch("requests.post", return_value=mock_resp):
+        with patch("app.services.google_ads_service._http.post", return_value=mock_resp):
             ideas = svc.generate_keyword_ideas("1234567890", ["테스트"])
         assert ideas == []
 
@@ -275,7 +508,7 @@ class TestKeywordPlannerAPI:
         """네트워크 오류 시 빈 리스트 반환."""
         svc = self._make_service()
         self._mock_token(svc)
-        with patch("requests.post", side_effect=Exception("timeout")):
+        with patch("app.services.google_ads_service._http.post", side_effect=Exception("timeout")):
             ideas = svc.generate_keyword_ideas("1234567890", ["테스트"])
         assert ideas == []
 
@@ -285,7 +518,7 @@ class TestKeywordPlannerAPI:
         self._mock_token(svc)
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.json.return_value = {
+        mock_resp.content = orjson.dumps({
             "results": [
                 {"text": "테스트 키워드", "keywordIdeaMetrics": {
                     "avgMonthlySearches": "1000",
@@ -295,8 +528,8 @@ class TestKeywordPlannerAPI:
                     "highTopOfPageBidMicros": "1000000000"  # 1000원
                 }}
             ]
-        }
-        with patch("requests.post", return_value=mock_resp):
+        })
+        with patch("app.services.google_ads_service._http.post", return_value=mock_resp):
             ideas = svc.generate_keyword_ideas("1234567890", ["테스트"])
         assert ideas[0]["low_bid_krw"] == 500
         assert ideas[0]["high_bid_krw"] == 1000
@@ -330,7 +563,7 @@ class TestActionRouterGSC:
     async def test_gsc_not_connected_returns_error_message(self):
         """GSC 미연동 시 안내 메시지 반환."""
         router, mock_db, _ = self._make_router()
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.execute.return_value.first.return_value = None
 
         result = await router._handle_query_gsc_data(
             {"gsc_data_type": "queries"}, tenant_id=1
@@ -347,7 +580,7 @@ class TestActionRouterGSC:
         mock_account = Mock(spec=SearchConsoleAccount)
         mock_account.site_url = "https://example.com"
         mock_account.refresh_token = "encrypted_rt"
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_account
+        mock_db.execute.return_value.first.return_value = mock_account
 
         mock_queries = [
             {"query": "파이썬 강의", "clicks": 100, "impressions": 1500, "ctr": 6.7, "position": 3.2}
@@ -375,7 +608,7 @@ class TestActionRouterGSC:
         mock_account = Mock(spec=SearchConsoleAccount)
         mock_account.site_url = "https://example.com"
         mock_account.refresh_token = "encrypted_rt"
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_account
+        mock_db.execute.return_value.first.return_value = mock_account
 
         mock_pages = [
             {"path": "/blog/python", "url": "https://example.com/blog/python",
@@ -394,3 +627,569 @@ class TestActionRouterGSC:
 
         assert "/blog/python" in result
         assert "200클릭" in result or "200" in result
+
+
+    @pytest.mark.asyncio
+    async def test_gsc_overview_includes_top_queries_and_pages(self):
+        """overview 타입: 전체 지표와 인기 검색어/페이지를 함께 요약."""
+        from app.models.google_ads import SearchConsoleAccount
+        router, mock_db, mock_gemini = self._make_router()
+        mock_gemini.generate_text = AsyncMock(return_value="요약")
+
+        mock_account = Mock(spec=SearchConsoleAccount)
+        mock_account.site_url = "https://example.com"
+        mock_account.refresh_token = "encrypted_rt"
+        mock_db.execute.return_value.first.return_value = mock_account
+
+        with patch("app.core.security.decrypt_token", return_value="raw_rt"), \
+             patch("app.services.search_console_service.SearchConsoleService") as mock_svc_cls:
+            mock_svc = mock_svc_cls.return_value
+            mock_svc.get_search_analytics.return_value = {"clicks": 500, "impressions": 9000, "ctr": 5.6, "position": 7.2}
+            mock_svc.get_top_queries.return_value = [{"query": "파이썬 강의", "clicks": 100}]
+            mock_svc.get_top_pages.return_value = [{"path": "/blog/python", "clicks": 80}]
+
+            result = await router._handle_query_gsc_data({"gsc_data_type": "overview"}, tenant_id=1)
+
+        assert result == "요약"
+        prompt = mock_gemini.generate_text.call_args[0][0]
+        assert "클릭: 500회" in prompt
+        assert "파이썬 강의(100클릭)" in prompt
+        assert "/blog/python(80클릭)" in prompt
+
+    @pytest.mark.asyncio
+    async def test_gsc_client_reused_until_token_rotates(self):
+        """같은 테넌트는 SearchConsoleService를 재사용하고, 토큰 교체 시 재생성."""
+        from app.models.google_ads import SearchConsoleAccount
+        router, mock_db, _ = self._make_router()
+
+        mock_account = Mock(spec=SearchConsoleAccount)
+        mock_account.site_url = "https://example.com"
+        mock_account.refresh_token = "encrypted_rt"
+        mock_db.execute.return_value.first.return_value = mock_account
+
+        with patch("app.core.security.decrypt_token", return_value="raw_rt") as mock_decrypt, \
+             patch("app.services.search_console_service.SearchConsoleService") as mock_svc_cls:
+            mock_svc_cls.return_value.get_top_queries.return_value = []
+            entities = {"gsc_data_type": "queries", "limit": 5}
+
+            await router._handle_query_gsc_data(entities, tenant_id=1)
+            await router._handle_query_gsc_data(entities, tenant_id=1)
+            assert mock_svc_cls.call_count == 1
+            assert mock_decrypt.call_count == 1
+
+            from app.services import tenant_cache
+            tenant_cache.invalidate_gsc_account(1)
+            mock_account.refresh_token = "rotated_rt"
+            await router._handle_query_gsc_data(entities, tenant_id=1)
+            assert mock_svc_cls.call_count == 2
+
+
+# ─────────────────────────────────────────
+# ActionRouter - route_action dispatch
+# ─────────────────────────────────────────
+
+class TestActionRouterDispatch:
+    """route_action의 intent → handler 디스패치 테스트."""
+
+    def _make_router(self):
+        from app.services.action_router import ActionRouter
+        return ActionRouter(
+            db=Mock(),
+            report_service=Mock(),
+            keyword_service=Mock(),
+            google_ads_service=Mock(),
+            gemini_service=Mock()
+        )
+
+    @pytest.mark.asyncio
+    async def test_unknown_intent_returns_help_text(self):
+        """알 수 없는 intent는 도움말 반환."""
+        router = self._make_router()
+        result = await router.route_action("unknown_intent", {}, tenant_id=1)
+        assert "Generate a report" in result
+
+    @pytest.mark.asyncio
+    async def test_history_passed_only_to_history_aware_handlers(self):
+        """대화 이력은 general_chat 등 이력 기반 handler에만 전달."""
+        router = self._make_router()
+        history = [{"role": "user", "content": "안녕"}]
+        chat = AsyncMock(return_value="chat")
+        schedule = AsyncMock(return_value="schedule")
+        router._handlers["general_chat"] = chat
+        router._handlers["change_schedule"] = schedule
+
+        assert await router.route_action("general_chat", {}, 1, history) == "chat"
+        chat.assert_awaited_once_with({}, 1, history)
+
+        assert await router.route_action("change_schedule", {}, 1, history) == "schedule"
+        schedule.assert_awaited_once_with({}, 1)
+
+    @pytest.mark.asyncio
+    async def test_tenant_rate_limit_short_circuits_handler(self):
+        """테넌트별 한도를 넘으면 handler 호출 없이 안내 문구 반환."""
+        from app.services import action_router as ar
+        from app.services.gemini_service import RATE_LIMITED_MESSAGE
+        router = self._make_router()
+        chat = AsyncMock(return_value="chat")
+        router._handlers["general_chat"] = chat
+
+        with patch.object(ar, "TENANT_REQUESTS_PER_MINUTE", 2):
+            results = [await router.route_action("general_chat", {}, 7, []) for _ in range(3)]
+            other_tenant = await router.route_action("general_chat", {}, 8, [])
+
+        assert results == ["chat", "chat", RATE_LIMITED_MESSAGE]
+        assert other_tenant == "chat"
+        assert chat.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_change_schedule_rejects_unknown_frequency(self):
+        """지원하지 않는 주기는 DB 접근 없이 거절."""
+        router = self._make_router()
+        result = await router.route_action(
+            "change_schedule", {"frequency": "hourly"}, tenant_id=1
+        )
+        assert "hourly" in result
+        router.db.execute.assert_not_called()
+
+
+# ─────────────────────────────────────────
+# ActionRouter - Gemini 응답 캐시
+# ─────────────────────────────────────────
+
+class TestActionRouterResponseCache:
+    """general_chat 응답 캐시 테스트."""
+
+    def _make_router(self, reply):
+        from app.services.action_router import ActionRouter
+        gemini = Mock()
+        gemini.generate_text = AsyncMock(return_value=reply)
+        return ActionRouter(
+            db=Mock(),
+            report_service=Mock(),
+            keyword_service=Mock(),
+            google_ads_service=Mock(),
+            gemini_service=gemini
+        )
+
+    @pytest.mark.asyncio
+    async def test_rephrased_message_hits_cache(self):
+        """대소문자/구두점만 다른 메시지는 Gemini를 다시 호출하지 않음."""
+        router = self._make_router("hello!")
+        first = await router.route_action("general_chat", {"original_message": "Hi there"}, 1, [])
+        second = await router.route_action("general_chat", {"original_message": "hi   there?!"}, 1, [])
+
+        assert first == second == "hello!"
+        router.gemini_service.generate_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_history_misses_cache(self):
+        """이력이 다르면 별도 응답 생성."""
+        router = self._make_router("reply")
+        await router.route_action("general_chat", {"original_message": "why?"}, 1, [])
+        await router.route_action(
+            "general_chat", {"original_message": "why?"}, 1,
+            [{"role": "user", "content": "CPC가 올랐어"}]
+        )
+        assert router.gemini_service.generate_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_history_turns_are_trimmed_in_prompt(self):
+        """이력 턴은 코드 블록 제거 후 280자로 잘라 프롬프트에 포함."""
+        router = self._make_router("reply")
+        history = [{"role": "user", "content": "로그 봐줘 ```" + "trace\n" * 50 + "``` " + "y" * 400}]
+        await router.route_action("general_chat", {"original_message": "어때?"}, 1, history)
+
+        prompt = router.gemini_service.generate_text.call_args[0][0]
+        assert "trace" not in prompt
+        assert "user: 로그 봐줘 [code] " in prompt
+        assert "y" * 280 not in prompt and "…" in prompt
+
+    @pytest.mark.asyncio
+    async def test_fallback_message_not_cached(self):
+        """레이트 리밋 안내 문구는 캐시하지 않음."""
+        from app.services.gemini_service import RATE_LIMITED_MESSAGE
+        router = self._make_router(RATE_LIMITED_MESSAGE)
+        await router.route_action("general_chat", {"original_message": "hi"}, 1, [])
+        await router.route_action("general_chat", {"original_message": "hi"}, 1, [])
+        assert router.gemini_service.generate_text.await_count == 2
+
+    def test_select_context_turns_prefers_relevant_recent_turns(self):
+        """메시지와 겹치는 최근 턴을 우선 선택하고 원래 순서를 유지."""
+        from app.services.semantic_cache import select_context_turns
+        history = [
+            {"role": "user", "content": "CPC budget question"},
+            {"role": "assistant", "content": "weather is nice"},
+            {"role": "user", "content": "lunch menu"},
+            {"role": "assistant", "content": "CPC went up 10%"},
+            {"role": "user", "content": "thanks"},
+        ]
+        turns = select_context_turns(history, "why did CPC go up?", top_k=2)
+
+        assert [t["content"] for t in turns] == ["CPC went up 10%", "thanks"]
+
+    def test_select_context_turns_keeps_short_history(self):
+        """턴 수가 top_k 이하이면 그대로 반환."""
+        from app.services.semantic_cache import select_context_turns
+        history = [{"role": "user", "content": "hi"}]
+        assert select_context_turns(history, "hello", top_k=3) == history
+
+
+# ─────────────────────────────────────────
+# ActionRouter - 기간 파싱
+# ─────────────────────────────────────────
+
+class TestDateRangeFor:
+    """_date_range_for 기간 계산 테스트."""
+
+    def test_known_periods(self):
+        from datetime import date, datetime
+        from app.services.action_router import _date_range_for
+        today = date(2024, 11, 14)  # Thursday
+
+        assert _date_range_for("yesterday", today) == (datetime(2024, 11, 13), datetime(2024, 11, 13))
+        assert _date_range_for("last_week", today) == (datetime(2024, 11, 7), datetime(2024, 11, 13))
+        assert _date_range_for("this_week", today) == (datetime(2024, 11, 11), datetime(2024, 11, 14))
+        assert _date_range_for("this_month", today) == (datetime(2024, 11, 1), datetime(2024, 11, 14))
+
+    def test_unknown_period_defaults_to_last_week(self):
+        from app.services.action_router import ActionRouter, _date_range_for
+        from datetime import date
+        router = ActionRouter(Mock(), Mock(), Mock(), Mock(), Mock())
+        assert router._parse_date_range({"time_period": "someday"}) == \
+            _date_range_for("last_week", date.today())
+
+
+# ─────────────────────────────────────────
+# ActionRouter - answer_question
+# ─────────────────────────────────────────
+
+class TestActionRouterAnswerQuestion:
+    """answer_question의 계정 조회 테스트."""
+
+    @pytest.fixture(autouse=True)
+    def loader_session(self):
+        """customer_id 배치 로더가 여는 전용 세션."""
+        session = Mock()
+        session.execute.return_value.all.return_value = [(1, "1234567890")]
+        with patch("app.services.tenant_cache.SessionLocal", return_value=session):
+            self.loader_session = session
+            yield session
+
+    def _make_router(self):
+        from app.services.action_router import ActionRouter
+        google_ads = Mock()
+        google_ads.get_campaign_metrics = AsyncMock(return_value={"clicks": 10})
+        gemini = Mock()
+        gemini.generate_text = AsyncMock(return_value="클릭 10회입니다.")
+        return ActionRouter(Mock(), Mock(), Mock(), google_ads, gemini)
+
+    @pytest.mark.asyncio
+    async def test_account_lookup_cached_across_turns(self):
+        """두 번째 질문부터는 DB 조회 없이 캐시된 customer_id 사용."""
+        router = self._make_router()
+        for _ in range(2):
+            result = await router.route_action("answer_question", {"time_period": "yesterday"}, 1, [])
+            assert result == "클릭 10회입니다."
+
+        assert self.loader_session.execute.call_count == 1
+        self.loader_session.close.assert_called_once()
+        router.db.execute.assert_not_called()
+        _, kwargs = router.google_ads_service.get_campaign_metrics.call_args
+        assert kwargs["customer_id"] == "1234567890"
+
+    @pytest.mark.asyncio
+    async def test_prompt_has_json_data_and_trimmed_history(self):
+        """프롬프트에 JSON 데이터와 최근 3턴(200자 제한) 이력만 포함."""
+        router = self._make_router()
+        history = [{"role": "user", "content": f"turn{i} " + "x" * 300} for i in range(5)]
+        await router.route_action("answer_question", {"time_period": "yesterday"}, 1, history)
+
+        prompt = router.gemini_service.generate_text.call_args[0][0]
+        assert 'Data: {"clicks":10}' in prompt
+        assert "turn1" not in prompt and "turn2" in prompt and "turn4" in prompt
+        assert "x" * 201 not in prompt
+
+    @pytest.mark.asyncio
+    async def test_explicit_string_dates_from_llm(self):
+        """LLM이 준 ISO 문자열 날짜도 datetime으로 변환해 조회."""
+        from datetime import datetime
+        router = self._make_router()
+        entities = {"start_date": "2024-01-01", "end_date": "2024-01-07"}
+        result = await router.route_action("answer_question", entities, 1, [])
+
+        assert result == "클릭 10회입니다."
+        _, kwargs = router.google_ads_service.get_campaign_metrics.call_args
+        assert kwargs["date_from"] == datetime(2024, 1, 1)
+        assert kwargs["date_to"] == datetime(2024, 1, 7)
+        prompt = router.gemini_service.generate_text.call_args[0][0]
+        assert "2024-01-01" in prompt and "2024-01-07" in prompt
+
+    @pytest.mark.asyncio
+    async def test_string_dates_share_metrics_cache_entry(self):
+        """같은 날짜면 문자열/기간 표현과 무관하게 캐시 항목을 공유."""
+        from datetime import date, datetime, timedelta
+        from app.services.action_router import _metrics_ttu
+        router = self._make_router()
+        yesterday = date.today() - timedelta(days=1)
+        await router.route_action("answer_question", {"time_period": "yesterday"}, 1, [])
+        await router.route_action(
+            "answer_question", {"start_date": yesterday.isoformat(), "end_date": f"{yesterday}T00:00:00"}, 1, []
+        )
+        assert router.google_ads_service.get_campaign_metrics.await_count == 1
+        # Past ranges are final and cached longer than ranges including today
+        today = datetime.combine(date.today(), datetime.min.time())
+        assert _metrics_ttu(("c", today, today - timedelta(days=1), ()), None, 0) == 3600
+        assert _metrics_ttu(("c", today, today, ()), None, 0) == 60
+
+    @pytest.mark.asyncio
+    async def test_invalid_explicit_dates_fall_back_to_period(self):
+        """파싱할 수 없는 날짜는 time_period로 대체."""
+        router = self._make_router()
+        entities = {"start_date": "지난주", "end_date": "어제", "time_period": "yesterday"}
+        assert await router.route_action("answer_question", entities, 1, []) == "클릭 10회입니다."
+
+    @pytest.mark.asyncio
+    async def test_data_answers_use_cacheable_temperature(self):
+        """데이터 답변은 낮은 temperature로 생성해 완성 캐시가 적용됨."""
+        from app.services.gemini_service import CACHEABLE_TEMPERATURE
+        router = self._make_router()
+        await router.route_action("answer_question", {"time_period": "yesterday"}, 1, [])
+        temperature = router.gemini_service.generate_text.call_args.kwargs["temperature"]
+        assert temperature <= CACHEABLE_TEMPERATURE
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_reuses_metrics(self):
+        """같은 기간·지표 질문은 Google Ads를 다시 호출하지 않음."""
+        router = self._make_router()
+        entities = {"time_period": "last_week", "metrics": ["cost", "clicks"]}
+        await router.route_action("answer_question", entities, 1, [])
+        await router.route_action("answer_question", {**entities, "metrics": ["clicks", "cost"]}, 1, [])
+        await router.route_action("answer_question", {**entities, "time_period": "yesterday"}, 1, [])
+
+        assert router.google_ads_service.get_campaign_metrics.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_questions_share_one_upstream_call(self):
+        """동시에 들어온 같은 질문은 Google Ads 호출 하나를 공유."""
+        import asyncio
+        router = self._make_router()
+
+        async def slow_metrics(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"clicks": 10}
+
+        router.google_ads_service.get_campaign_metrics = AsyncMock(side_effect=slow_metrics)
+        entities = {"time_period": "last_week"}
+        results = await asyncio.gather(*[
+            router.route_action("answer_question", entities, 1, []) for _ in range(3)
+        ])
+
+        assert results == ["클릭 10회입니다."] * 3
+        assert router.google_ads_service.get_campaign_metrics.await_count == 1
+        # Cold account lookups were batched into one query as well
+        assert self.loader_session.execute.call_count == 1
+
+
+class TestActionRouterKeywordSuggestion:
+    """keyword_suggestion의 Keyword Planner 결과 포맷 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_planner_ideas_formatted(self):
+        """Keyword Planner 결과를 포맷하고, 캐시는 GoogleAdsService에 맡김."""
+        from app.services.action_router import ActionRouter
+        google_ads = Mock()
+        google_ads.generate_keyword_ideas.return_value = [{
+            "keyword": "러닝화 추천", "avg_monthly_searches": 1000, "competition": "HIGH",
+            "low_bid_krw": 500, "high_bid_krw": 1500,
+        }]
+        session = Mock()
+        session.execute.return_value.all.return_value = [(1, "1234567890"), (2, "2222222222")]
+        router = ActionRouter(Mock(), Mock(), Mock(), google_ads, Mock())
+
+        with patch("app.services.tenant_cache.SessionLocal", return_value=session):
+            first = await router._handle_keyword_suggestion({"keywords": ["러닝화", "Nike"]}, tenant_id=1)
+            second = await router._handle_keyword_suggestion({"keywords": ["nike", "러닝화"]}, tenant_id=2)
+
+        assert first.splitlines()[2:] == second.splitlines()[2:]
+        assert "`러닝화 추천` — 월 검색 1000 · 경쟁도 높음 · 입찰가 ₩500~1,500" in first
+        assert google_ads.generate_keyword_ideas.call_count == 2
+
+
+class TestActionRouterGenerateReport:
+    """generate_report 요약 포맷 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_report_summary_format(self):
+        from app.services.action_router import ActionRouter
+        report_service = Mock()
+        report_service.generate_weekly_report.return_value = {
+            "status": "success",
+            "period": "2024-11-04 ~ 2024-11-10",
+            "metrics": {"cost": 1234.5, "impressions": 10000, "clicks": 250, "conversions": 7, "roas": 3.456},
+        }
+        router = ActionRouter(Mock(), report_service, Mock(), Mock(), Mock())
+        result = await router.route_action("generate_report", {}, tenant_id=1)
+
+        assert result.startswith("*Weekly Report Summary* (2024-11-04 ~ 2024-11-10)")
+        assert "*Total Spend:* $1,234.50" in result
+        assert "*Impressions:* 10,000" in result
+        assert "*ROAS:* 3.46" in result
+
+
+class TestActionRouterStreaming:
+    """Gemini 스트리밍 응답 전달 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_general_chat_streams_partials(self):
+        """on_partial이 있으면 스트리밍으로 생성하고 최종 전체 텍스트 반환."""
+        from app.services import action_router as ar
+
+        async def fake_stream(prompt, temperature=0.7):
+            for chunk in ("안녕", "하세요", "!"):
+                yield chunk
+
+        gemini = Mock()
+        gemini.generate_text = AsyncMock()
+        gemini.generate_text_stream = fake_stream
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        router = ar.ActionRouter(Mock(), Mock(), Mock(), Mock(), gemini, on_partial=on_partial)
+        with patch.object(ar, "STREAM_UPDATE_INTERVAL", 0):
+            result = await router.route_action("general_chat", {"original_message": "hi"}, 1, [])
+
+        assert result == "안녕하세요!"
+        assert partials == ["안녕", "안녕하세요", "안녕하세요!"]
+        gemini.generate_text.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    async def test_low_temperature_stream_uses_completion_cache(self):
+        """스트리밍 경로도 낮은 temperature 답변은 완성 캐시를 채우고 재사용."""
+        from app.services import action_router as ar
+        from app.services.gemini_service import GeminiService, FACTUAL_TEMPERATURE
+
+        def stream(**kwargs):
+            async def chunks():
+                for text in ("클릭 ", "10회"):
+                    yield Mock(text=text)
+            return chunks()
+
+        with patch("google.genai.Client") as mock_client_cls:
+            stream_call = mock_client_cls.return_value.aio.models.generate_content_stream = AsyncMock(
+                side_effect=stream
+            )
+            gemini = GeminiService(api_key="test-key", model_name="gemini-2.0-flash")
+
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        router = ar.ActionRouter(Mock(), Mock(), Mock(), Mock(), gemini, on_partial=on_partial)
+        with patch.object(ar, "STREAM_UPDATE_INTERVAL", 0):
+            first = await router._generate("prompt", temperature=FACTUAL_TEMPERATURE)
+            partials.clear()
+            second = await router._generate("prompt", temperature=FACTUAL_TEMPERATURE)
+            await router._generate("prompt")
+
+        assert first == second == "클릭 10회"
+        assert partials[0] == "클릭 10회"
+        # Cached answer emitted whole; the default temperature bypasses the cache
+        assert stream_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_after_partial_output_not_cached(self):
+        """스트림이 중간에 실패하면 잘린 답변 대신 오류 메시지를 반환하고 캐시하지 않음."""
+        from app.services import action_router as ar
+        from app.services.gemini_service import GeminiService, GENERATION_ERROR_MESSAGE
+
+        async def broken_stream():
+            yield Mock(text="부분 응답")
+            raise RuntimeError("connection reset")
+
+        with patch("google.genai.Client") as mock_client_cls:
+            mock_client_cls.return_value.aio.models.generate_content_stream = AsyncMock(
+                return_value=broken_stream()
+            )
+            gemini = GeminiService(api_key="test-key", model_name="gemini-2.0-flash")
+
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        router = ar.ActionRouter(Mock(), Mock(), Mock(), Mock(), gemini, on_partial=on_partial)
+        with patch.object(ar, "STREAM_UPDATE_INTERVAL", 0):
+            result = await router._cached_generate(b"stream-key", "prompt")
+
+        assert partials == ["부분 응답"]
+        assert result == GENERATION_ERROR_MESSAGE
+        assert ar.response_cache.get(b"stream-key") is None
+
+
+class TestActionRouterChangeSchedule:
+    """change_schedule 입력 파싱 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_time_rejected_without_db(self):
+        from app.services.action_router import ActionRouter
+        router = ActionRouter(Mock(), Mock(), Mock(), Mock(), Mock())
+        for bad in ("9am", "25:00", "10:75"):
+            result = await router.route_action("change_schedule", {"frequency": "daily", "time": bad}, 1)
+            assert bad in result
+        router.db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_valid_time_upserts_schedule(self):
+        from datetime import time
+        from app.services.action_router import ActionRouter
+        from app.models.report import ReportFrequency
+        router = ActionRouter(Mock(), Mock(), Mock(), Mock(), Mock())
+        with patch("app.services.action_router.ReportSchedule.upsert") as mock_upsert:
+            result = await router.route_action(
+                "change_schedule", {"frequency": "daily", "day": "Friday", "time": "7:30"}, 1
+            )
+        assert "updated" in result
+        mock_upsert.assert_called_once_with(router.db, 1, ReportFrequency.DAILY, 4, time(7, 30))
+
+
+class TestOrjsonFormatter:
+    """JSON 로그 포맷터 테스트."""
+
+    def test_merges_extra_fields(self):
+        import json
+        import logging
+        from app.core.log_formatter import OrjsonFormatter
+
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "intent=%s", ("general_chat",), None)
+        record.extra_fields = {"intent": "general_chat", "tenant_id": 1}
+        payload = json.loads(OrjsonFormatter().format(record))
+
+        assert payload["msg"] == "intent=general_chat"
+        assert payload["level"] == "INFO"
+        assert payload["intent"] == "general_chat"
+        assert payload["tenant_id"] == 1
+
+
+class TestRunIo:
+    """공유 I/O 스레드풀 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_shared_pool_with_context(self):
+        import contextvars
+        import threading
+        from app.core.executor import run_io
+
+        request_id = contextvars.ContextVar("request_id")
+        request_id.set("req-1")
+
+        def blocking(suffix):
+            return threading.current_thread().name, request_id.get() + suffix
+
+        thread_name, value = await run_io(blocking, "-a")
+
+        assert thread_name.startswith("sem-io")
+        assert value == "req-1-a"
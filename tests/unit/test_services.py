@@ -1,5 +1,6 @@
 """Unit tests for service modules."""
 
+import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import date, timedelta
 
@@ -51,6 +52,57 @@ class TestKeywordService:
         result = service.detect_inefficient_keywords(tenant_id=tenant.id)
         assert isinstance(result, list)
 
+    def test_detect_inefficient_keywords_skips_existing_and_repeats(self, db):
+        """Test existing and repeated search terms are not inserted twice."""
+        from app.models.tenant import Tenant
+        from app.models.keyword import KeywordCandidate
+
+        tenant = Tenant(workspace_id="T123", workspace_name="Test")
+        db.add(tenant)
+        db.commit()
+        db.refresh(tenant)
+        db.add(KeywordCandidate(
+            tenant_id=tenant.id, campaign_id="1", campaign_name="C", search_term="old",
+            cost=20000, clicks=10
+        ))
+        db.commit()
+
+        def term(search_term):
+            return {"search_term": search_term, "campaign_id": "1", "campaign_name": "C",
+                    "cost": 20000.0, "clicks": 10, "conversions": 0.0}
+
+        mock_google_ads = Mock()
+        mock_google_ads.get_search_terms.return_value = [term("old"), term("new"), term("new"), term("other")]
+        service = KeywordService(db=db, google_ads_service=mock_google_ads, slack_service=Mock())
+
+        result = service.detect_inefficient_keywords(tenant_id=tenant.id)
+
+        assert [kw["search_term"] for kw in result] == ["new", "other"]
+        stored = db.query(KeywordCandidate.search_term).filter_by(tenant_id=tenant.id).all()
+        assert sorted(row[0] for row in stored) == ["new", "old", "other"]
+
+    def test_detect_inefficient_keywords_caps_clicks_to_column_range(self, db):
+        """Test click counts beyond SmallInteger are stored capped."""
+        from app.models.tenant import Tenant
+        from app.models.keyword import KeywordCandidate, SMALLINT_MAX
+
+        tenant = Tenant(workspace_id="T123", workspace_name="Test")
+        db.add(tenant)
+        db.commit()
+        db.refresh(tenant)
+
+        mock_google_ads = Mock()
+        mock_google_ads.get_search_terms.return_value = [{
+            "search_term": "busy", "campaign_id": "1", "campaign_name": "C",
+            "cost": 20000.0, "clicks": 50_000, "conversions": 0.0
+        }]
+        service = KeywordService(db=db, google_ads_service=mock_google_ads, slack_service=Mock())
+
+        service.detect_inefficient_keywords(tenant_id=tenant.id)
+
+        stored = db.query(KeywordCandidate).filter_by(tenant_id=tenant.id).one()
+        assert stored.clicks == SMALLINT_MAX
+
     def test_create_approval_request_returns_int(self, db):
         """Test create_approval_request returns an integer."""
         from app.models.tenant import Tenant
@@ -132,6 +184,41 @@ class TestKeywordService:
         result = service.approve_keyword(approval_request_id=approval.id, slack_user_id="U12345")
         assert isinstance(result, bool)
 
+    def test_approve_keyword_uses_tenant_customer_id(self, db):
+        """Test approve_keyword sends the tenant's active Google Ads customer_id."""
+        from app.models.tenant import Tenant
+        from app.models.google_ads import GoogleAdsAccount
+        from app.models.keyword import KeywordCandidate, ApprovalRequest, KeywordStatus
+        from datetime import datetime
+
+        tenant = Tenant(workspace_id="T123", workspace_name="Test")
+        db.add(tenant)
+        db.commit()
+        db.refresh(tenant)
+        db.add(GoogleAdsAccount(tenant_id=tenant.id, customer_id="1234567890", account_name="a"))
+        keyword = KeywordCandidate(
+            tenant_id=tenant.id, campaign_id="C001", campaign_name="Test", search_term="test",
+            cost=10000, clicks=10, status=KeywordStatus.PENDING
+        )
+        db.add(keyword)
+        db.commit()
+        approval = ApprovalRequest(
+            keyword_candidate_id=keyword.id,
+            slack_message_ts="123.456",
+            expires_at=datetime.utcnow() + timedelta(hours=24)
+        )
+        db.add(approval)
+        db.commit()
+
+        mock_google_ads = Mock()
+        service = KeywordService(db=db, google_ads_service=mock_google_ads, slack_service=Mock())
+
+        assert service.approve_keyword(approval_request_id=approval.id, slack_user_id="U12345") is True
+        mock_google_ads.add_negative_keyword.assert_called_once_with(
+            customer_id="1234567890", campaign_id="C001", keyword_text="test"
+        )
+        assert keyword.status == KeywordStatus.APPROVED
+
 
 class TestReportService:
     """Test ReportService."""
@@ -238,8 +325,41 @@ class TestRateLimiter:
     def test_allows_after_window_expires(self):
         import time
         limiter = RateLimiter(max_requests=1, time_window=1)
-        limiter.requests.append(time.time() - 2)  # expired request
-        assert limiter.can_proceed() is True
+        limiter.add_request()
+        with patch("app.services.gemini_service.time.monotonic", return_value=time.monotonic() + 2):
+            assert limiter.can_proceed() is True
+
+    def test_try_acquire_spends_token_atomically(self):
+        limiter = RateLimiter(max_requests=2, time_window=60)
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+
+    def test_tokens_refill_at_window_rate(self):
+        import time
+        limiter = RateLimiter(max_requests=60, time_window=60)
+        for _ in range(60):
+            assert limiter.try_acquire()
+        with patch("app.services.gemini_service.time.monotonic", return_value=time.monotonic() + 1.5):
+            assert limiter.try_acquire() is True
+            assert limiter.try_acquire() is False
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_next_token(self):
+        import time
+        limiter = RateLimiter(max_requests=20, time_window=1)
+        for _ in range(20):
+            limiter.try_acquire()
+        started = time.monotonic()
+        assert await limiter.acquire() is True
+        assert time.monotonic() - started >= 0.03
+        assert limiter.can_proceed() is False
+
+    @pytest.mark.asyncio
+    async def test_acquire_gives_up_past_max_wait(self):
+        limiter = RateLimiter(max_requests=1, time_window=60)
+        limiter.add_request()
+        assert await limiter.acquire(max_wait=1) is False
 
 
 class TestGeminiService:
@@ -348,6 +468,39 @@ class TestGeminiService:
             assert "ROAS" in prompt_content  # 금지 규칙으로 언급되어야 함
             assert "절대 언급하지 말 것" in prompt_content
 
+    def test_generate_report_insight_reuses_cached_completion(self):
+        """같은 프롬프트는 TTL 내에서 Gemini를 다시 호출하지 않음."""
+        with patch("google.genai.Client") as mock_client_cls:
+            service, mock_client = self._make_service(mock_client_cls)
+
+            mock_response = MagicMock()
+            mock_response.text = "캐시된 응답"
+            mock_client.models.generate_content.return_value = mock_response
+
+            metrics = {"cost": 1000000, "impressions": 10000, "clicks": 500, "conversions": 10, "cpc": 2000, "cpa": 100000}
+            assert service.generate_report_insight(metrics=metrics) == "캐시된 응답"
+            assert service.generate_report_insight(metrics=metrics) == "캐시된 응답"
+            mock_client.models.generate_content.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_generate_text_caches_only_low_temperature(self):
+        with patch("google.genai.Client") as mock_client_cls:
+            service, mock_client = self._make_service(mock_client_cls)
+
+            mock_response = MagicMock()
+            mock_response.text = "응답"
+            mock_client.models.generate_content.return_value = mock_response
+
+            await service.generate_text("질문")
+            await service.generate_text("질문")
+            assert mock_client.models.generate_content.call_count == 2
+
+            await service.generate_text("질문", temperature=0.2)
+            await service.generate_text("질문", temperature=0.2)
+            assert mock_client.models.generate_content.call_count == 3
+            config = mock_client.models.generate_content.call_args.kwargs["config"]
+            assert config.temperature == 0.2
+
 
 class TestSlackService:
     """Test SlackService Block Kit message builders."""